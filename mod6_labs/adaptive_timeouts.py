@@ -0,0 +1,135 @@
+"""Per-endpoint HTTP timeouts derived from recent latencies.
+
+A fixed timeout has to fit the slowest healthy endpoint, so a request
+that will never be answered holds its caller for the full 10 seconds.
+Instead each endpoint ("openweather.current", "open-meteo.forecast",
+...) keeps a window of recent latencies, and its timeout is the p99
+times a safety factor, clamped between a floor and Config.TIMEOUT:
+
+- a request far slower than anything seen recently is abandoned after a
+  few times the p99 rather than after 10 seconds;
+- a request that did time out is recorded at the time it took, so if an
+  endpoint becomes slow but keeps answering, its p99 and with it the
+  timeout grow until those requests get through again.
+
+The connect timeout comes from the same kind of window over TCP + TLS
+connect times, taken from httpcore's trace events.
+
+The timeouts are applied by an httpx request hook (on_request), so the
+providers keep passing their usual timeout; the hook only ever lowers
+it, and the action's deadline still caps both.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from config import Config
+from metrics import LatencyTracker
+
+# Endpoint of the provider call running in this task
+_endpoint: contextvars.ContextVar = contextvars.ContextVar("weather_endpoint", default=None)
+
+
+class AdaptiveTimeouts:
+    """Rolling latency percentiles and the timeouts derived from them, per endpoint."""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = Config.ADAPTIVE_TIMEOUTS if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._read: Dict[str, LatencyTracker] = {}
+        self._connect: Dict[str, LatencyTracker] = {}
+
+    def _tracker(self, trackers: Dict[str, LatencyTracker], endpoint: str) -> LatencyTracker:
+        with self._lock:
+            tracker = trackers.get(endpoint)
+            if tracker is None:
+                tracker = trackers[endpoint] = LatencyTracker(Config.TIMEOUT_WINDOW)
+            return tracker
+
+    def record(self, endpoint: str, seconds: float):
+        """Add the duration of one call (answered, failed or timed out)."""
+        self._tracker(self._read, endpoint).record(seconds)
+
+    def record_connect(self, endpoint: str, seconds: float):
+        """Add the time one new connection took to set up (TCP and TLS)."""
+        self._tracker(self._connect, endpoint).record(seconds)
+
+    @staticmethod
+    def _derive(tracker: Optional[LatencyTracker], floor: float) -> Optional[float]:
+        if tracker is None or len(tracker) < Config.TIMEOUT_MIN_SAMPLES:
+            return None
+        p99 = tracker.percentile(Config.TIMEOUT_PERCENTILE)
+        return min(max(p99 * Config.TIMEOUT_FACTOR, floor), Config.TIMEOUT)
+
+    def timeouts(self, endpoint: str) -> Tuple[float, float]:
+        """
+        Current timeouts of an endpoint.
+
+        Returns:
+            (connect, read) in seconds; Config.TIMEOUT for either until
+            enough samples have been seen (or when adaptive timeouts are off)
+        """
+        if not self.enabled:
+            return Config.TIMEOUT, Config.TIMEOUT
+        read = self._derive(self._read.get(endpoint), Config.TIMEOUT_MIN)
+        connect = self._derive(self._connect.get(endpoint), Config.CONNECT_TIMEOUT_MIN)
+        return connect or read or Config.TIMEOUT, read or Config.TIMEOUT
+
+    @contextmanager
+    def endpoint(self, name: str):
+        """Mark the HTTP requests made inside the block as calls to `name`."""
+        token = _endpoint.set(name)
+        try:
+            yield
+        finally:
+            _endpoint.reset(token)
+
+    async def on_request(self, request: httpx.Request):
+        """httpx request hook: apply the endpoint's timeouts and time new connections."""
+        endpoint = _endpoint.get()
+        if endpoint is None:
+            return
+        connect, read = self.timeouts(endpoint)
+        timeout = dict(request.extensions.get("timeout") or {})
+        timeout["connect"] = min(connect, timeout.get("connect") or connect)
+        timeout["read"] = min(read, timeout.get("read") or read)
+        request.extensions["timeout"] = timeout
+        request.extensions["trace"] = self._connect_tracer(endpoint)
+
+    def _connect_tracer(self, endpoint: str):
+        started = []
+
+        async def trace(event: str, info: dict):
+            if event == "connection.connect_tcp.started":
+                started.append(time.perf_counter())
+            elif started and event in ("connection.connect_tcp.complete",
+                                       "connection.start_tls.complete"):
+                # TLS completes after TCP; the later event overwrites the first
+                started[1:] = [time.perf_counter()]
+            elif len(started) == 2 and event.endswith("send_request_headers.started"):
+                self.record_connect(endpoint, started[1] - started[0])
+                started.clear()
+
+        return trace
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current timeouts and p99 latency per endpoint, safe to serialize."""
+        with self._lock:
+            endpoints = sorted(set(self._read) | set(self._connect))
+        result = {}
+        for endpoint in endpoints:
+            connect, read = self.timeouts(endpoint)
+            tracker = self._read.get(endpoint)
+            p99 = tracker.percentile(Config.TIMEOUT_PERCENTILE) if tracker else None
+            result[endpoint] = {
+                "connect_timeout_s": round(connect, 3),
+                "read_timeout_s": round(read, 3),
+                "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+                "samples": len(tracker) if tracker else 0,
+            }
+        return result
@@ -0,0 +1,127 @@
+"""Incremental weather alert monitoring for watchlist cities (Feature 6).
+
+Every watchlist snapshot is reduced to the inputs of the alert rules
+(temperature, feels-like, humidity, wind and condition, in metric units,
+rounded to what the rules can tell apart). The rules only run again for a
+city when that fingerprint changed since its last evaluation, so a
+refresh that brings back the same weather costs a tuple comparison.
+
+The alerts active per city are kept, so each evaluation reports which
+alerts started and which cleared instead of the full list.
+"""
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from metrics import Metrics
+from search_history import canonical_city_key
+from watchlist_index import WatchlistSnapshot
+
+# (temp °C, feels like °C, humidity %, wind m/s, condition)
+Fingerprint = Tuple[float, float, float, float, str]
+
+# Rules get the fingerprint values and return alert dicts with at least
+# "title" and "severity" (the shape of WeatherApp.create_weather_alerts)
+AlertRules = Callable[[float, float, float, float, str], Iterable[Dict]]
+
+MPH_TO_MS = 0.44704
+
+
+class AlertChange(NamedTuple):
+    """One alert starting or clearing for a city."""
+    city: str
+    title: str
+    severity: str
+    started: bool  # False when the alert cleared
+
+
+def alert_inputs(snapshot: WatchlistSnapshot) -> Optional[Fingerprint]:
+    """
+    Metric-unit inputs of the alert rules for a snapshot.
+
+    Returns:
+        The fingerprint, or None if the snapshot has no weather (not
+        fetched yet or failed)
+    """
+    if snapshot.error is not None or snapshot.temp_c is None:
+        return None
+    temp = snapshot.temp_c
+    feels_like = temp
+    if snapshot.feels_like is not None:
+        # Same offset as the temperature, in any unit
+        feels_like = temp + (snapshot.feels_like - snapshot.temp) * (
+            5 / 9 if snapshot.units == "imperial" else 1
+        )
+    wind = snapshot.wind_speed or 0
+    if snapshot.units == "imperial":
+        wind *= MPH_TO_MS
+    return (
+        round(temp, 1),
+        round(feels_like, 1),
+        round(snapshot.humidity or 0),
+        round(wind, 1),
+        snapshot.condition,
+    )
+
+
+class AlertMonitor:
+    """
+    Per-city alert state, re-evaluated only for cities whose weather changed.
+
+    The first snapshot of a city sets its baseline without reporting
+    anything, so opening the app does not announce every standing alert.
+    """
+
+    def __init__(self, rules: AlertRules, metrics: Optional[Metrics] = None):
+        self._rules = rules
+        self.metrics = metrics if metrics is not None else Metrics()
+        # city key -> (fingerprint, {alert title: severity})
+        self._state: Dict[str, Tuple[Fingerprint, Dict[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def observe(self, snapshot: WatchlistSnapshot) -> List[AlertChange]:
+        """
+        Take a city's latest snapshot into account.
+
+        Returns:
+            Alerts that started or cleared since the city's previous
+            evaluation (empty when its weather did not change)
+        """
+        fingerprint = alert_inputs(snapshot)
+        if fingerprint is None:
+            # A failed fetch says nothing about the alerts; keep the state
+            return []
+        key = canonical_city_key(snapshot.city)
+        previous = self._state.get(key)
+        if previous is not None and previous[0] == fingerprint:
+            self.metrics.incr("alert_evaluations_skipped")
+            return []
+
+        self.metrics.incr("alert_evaluations")
+        active = {alert["title"]: alert["severity"] for alert in self._rules(*fingerprint)}
+        self._state[key] = (fingerprint, active)
+        if previous is None:
+            return []
+        before = previous[1]
+        changes = [
+            AlertChange(snapshot.city, title, severity, True)
+            for title, severity in active.items() if title not in before
+        ]
+        changes.extend(
+            AlertChange(snapshot.city, title, severity, False)
+            for title, severity in before.items() if title not in active
+        )
+        if changes:
+            self.metrics.incr("alert_changes", len(changes))
+        return changes
+
+    def active(self, city: str) -> Dict[str, str]:
+        """Alerts currently active for a city, as {title: severity}."""
+        state = self._state.get(canonical_city_key(city))
+        return dict(state[1]) if state is not None else {}
+
+    def retain(self, cities: Iterable[str]):
+        """Drop the state of cities no longer watched."""
+        keep = {canonical_city_key(city) for city in cities}
+        self._state = {key: state for key, state in self._state.items() if key in keep}
@@ -0,0 +1,104 @@
+"""Anomaly checks against hour-of-day baselines vs rescanning history.
+
+Stores --days of 10-minute samples for one city: a daily temperature
+cycle with noise. The last day has a heat spike of --spike degrees C
+in its afternoon. Reports:
+
+- append time, which now includes folding the sample into its hour's
+  running mean and variance;
+- the cost of one anomaly check from the stored baseline, and of
+  computing the same mean and deviation by querying every past day at
+  that hour (what a check without baselines has to do);
+- how many of the spike's samples were flagged, and how many normal
+  samples of the last day were flagged by mistake.
+
+Usage:
+    python benchmarks/bench_anomalies.py [--days 90] [--spike 6]
+"""
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+# The app modules live one level up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from observation_store import ObservationStore, hour_of_day  # noqa: E402
+
+DAY = 24 * 3600
+
+
+def reading(rng, timestamp, spike=0.0):
+    hour = (timestamp % DAY) / 3600
+    temp = 12 + 6 * math.sin((hour - 9) / 24 * 2 * math.pi) + rng.gauss(0, 1.2) + spike
+    return (temp, temp - 1.5, 70 + rng.gauss(0, 5), 1013 + rng.gauss(0, 3), 4 + rng.gauss(0, 1))
+
+
+def rescan_baseline(store, city, timestamp, days):
+    """Mean and deviation of the temperature at this hour on every past day."""
+    hour_start = timestamp - timestamp % 3600
+    temps = []
+    for day in range(1, days + 1):
+        start = hour_start - day * DAY
+        temps.extend(store.query(city, start, start + 3599)["temp"])
+    return statistics.fmean(temps), statistics.stdev(temps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--spike", type=float, default=6.0)
+    args = parser.parse_args()
+
+    rng = random.Random(47)
+    with tempfile.TemporaryDirectory() as workdir:
+        store = ObservationStore(os.path.join(workdir, "observations.db"))
+        start = 1_700_000_000 - 1_700_000_000 % DAY
+        history = start + args.days * DAY
+        began = time.perf_counter()
+        for timestamp in range(start, history, 600):
+            store.append("London", timestamp, reading(rng, timestamp))
+        append_us = (time.perf_counter() - began) / (args.days * 144) * 1e6
+        print(f"{args.days} days of 10-minute samples: {append_us:.0f} us per append "
+              f"(baseline update included)")
+
+        probe = history + 15 * 3600
+        values = reading(rng, probe, args.spike)
+        baseline_us = min(timeit.repeat(
+            lambda: store.anomalies("London", probe, values), number=200, repeat=3
+        )) / 200 * 1e6
+        rescan_us = min(timeit.repeat(
+            lambda: rescan_baseline(store, "London", probe, args.days), number=3, repeat=3
+        )) / 3 * 1e6
+        normal = store.baseline("London", hour_of_day(probe))["temp"]
+        mean, std = rescan_baseline(store, "London", probe, args.days)
+        print(f"one check: baseline {baseline_us:.0f} us, rescanning history {rescan_us:.0f} us")
+        print(f"normal at 15:00: {normal['mean']:.2f} +/- {normal['std']:.2f} C "
+              f"(last {normal['count']} samples); full history {mean:.2f} +/- {std:.2f} C")
+
+        spiked = missed = false_alarms = checked = 0
+        for timestamp in range(history, history + DAY, 600):
+            spike = args.spike if 13 * 3600 <= timestamp % DAY < 17 * 3600 else 0.0
+            values = reading(rng, timestamp, spike)
+            flagged = any(a.field == "temp" for a in store.anomalies("London", timestamp, values))
+            if spike:
+                spiked += 1
+                missed += not flagged
+            else:
+                checked += 1
+                false_alarms += flagged
+            store.append("London", timestamp, values)
+        print(f"last day: {spiked - missed}/{spiked} spiked samples flagged, "
+              f"{false_alarms}/{checked} normal samples flagged")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Points and update payload of the hourly forecast chart at different widths.
+
+Runs offline against the sample forecast. For each chart width, reports
+the hourly points in the forecast, the points actually sent after LTTB
+downsampling, the update payload of the first render and of rendering
+the same forecast again, and the time to build the chart data with and
+without the chart cache.
+
+Usage:
+    python benchmarks/bench_chart.py [--widths 200 320 800 1600]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import timeit
+
+from probe import RenderProbePage, load_fixture
+
+import main as weather_main
+from forecast_chart import ChartCache, build_chart_data, hourly_series
+
+
+async def run(width: int) -> dict:
+    page = RenderProbePage(asyncio.get_running_loop())
+    app = weather_main.WeatherApp(page)
+    app.chart_cache = ChartCache()
+    app.forecast_chart_width = lambda: width
+    forecast = load_fixture("forecast_london.json")
+
+    page.reset_counters()
+    await app.display_forecast(forecast)
+    app.update_scheduler.flush()
+    first_bytes = page.payload_bytes
+
+    page.reset_counters()
+    await app.display_forecast(forecast)
+    app.update_scheduler.flush()
+    again_bytes = page.payload_bytes
+
+    return {
+        "hourly": len(hourly_series(forecast["list"])[0]),
+        "sent": len(app.forecast_temp_series.data_points),
+        "bars": len(app.forecast_precip_chart.bar_groups),
+        "first_bytes": first_bytes,
+        "again_bytes": again_bytes,
+        "build_us": min(timeit.repeat(
+            lambda: build_chart_data(forecast, width), number=200, repeat=5
+        )) / 200 * 1e6,
+        "cached_us": min(timeit.repeat(
+            lambda: app.chart_cache.get("London", "metric", width, forecast), number=200, repeat=5
+        )) / 200 * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widths", type=int, nargs="+", default=[200, 320, 800, 1600])
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-chart-"))
+    real_sleep = asyncio.sleep
+    weather_main.asyncio.sleep = lambda *_: real_sleep(0)
+
+    print(f"{'width':>6}{'hourly':>8}{'sent':>6}{'bars':>6}{'first B':>9}{'again B':>9}"
+          f"{'build us':>10}{'cached us':>11}")
+    for width in args.widths:
+        r = asyncio.run(run(width))
+        print(
+            f"{width:>6}{r['hourly']:>8}{r['sent']:>6}{r['bars']:>6}{r['first_bytes']:>9}"
+            f"{r['again_bytes']:>9}{r['build_us']:>10.0f}{r['cached_us']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Per-call time and allocations of the app's CPU-bound paths.
+
+Runs offline against the sample payloads in benchmarks/fixtures: weather
+alerts, forecast parsing and rendering, building and filling a watchlist
+card, and the JSON persistence of history, settings and the watchlist.
+
+Each path is compared with benchmarks/baseline_cpu.json; the script exits
+with status 1 when one is slower (or allocates more) than its baseline by
+more than the tolerance. Times are scaled by a fixed reference workload
+timed in the same run, so a slower or busier machine does not read as a
+regression; still, record a new baseline with --save-baseline after an
+intended change.
+
+Usage:
+    python benchmarks/bench_cpu.py [--tolerance 0.5] [--save-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from probe import RenderProbePage, load_fixture
+
+import main as weather_main
+from watchlist_index import WatchlistSnapshot
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline_cpu.json"
+
+# Allocation counts barely move between runs, so they get a tighter bound
+ALLOC_TOLERANCE = 0.1
+ALLOC_SLACK_BYTES = 1024
+# A path over its baseline is measured again this many times before it
+# counts as a regression (timings on shared machines are noisy)
+CONFIRM_RUNS = 2
+
+
+def reference_workload():
+    """Fixed pure-Python work used to calibrate the machine's speed."""
+    payload = json.dumps(load_fixture("forecast_london.json"))
+    total = 0
+    for item in json.loads(payload)["list"]:
+        total += len(item.get("dt_txt", "").split()[0])
+    return total
+
+
+def build_cases(loop) -> dict:
+    """Return {name: zero-argument callable} for every measured path."""
+    page = RenderProbePage(loop)
+    app = weather_main.WeatherApp(page)
+    weather = load_fixture("weather_london.json")
+    forecast = load_fixture("forecast_london.json")
+    snapshot = WatchlistSnapshot.from_payload("London", weather, "metric")
+
+    for i in range(50):
+        app.search_history.record(f"City{i:02d}")
+    app.watchlist = [f"City{i:04d}" for i in range(200)]
+
+    def forecast_render():
+        # Forget what is shown, or the unchanged-payload check skips the render
+        app.rendered_forecast = None
+        loop.run_until_complete(app.display_forecast(forecast))
+        app.update_scheduler.flush()
+
+    def watchlist_card():
+        app.fill_watchlist_slot(app.create_watchlist_slot(), "London", snapshot)
+
+    def history_save():
+        # save_history() only schedules the write; time the write itself
+        app.history_dirty = True
+        loop.run_until_complete(app.write_history())
+
+    return {
+        "alerts_calm": lambda: app.create_weather_alerts(18.0, 17.0, 55, 3.0, "Clear"),
+        "alerts_severe": lambda: app.create_weather_alerts(38.0, 42.0, 85, 16.0, "Thunderstorm"),
+        "forecast_render": forecast_render,
+        "watchlist_card": watchlist_card,
+        "history_save": history_save,
+        "history_load": app.load_history,
+        "settings_save": app.save_settings,
+        "settings_load": app.load_settings,
+        "watchlist_save": app.save_watchlist,
+        "watchlist_load": app.load_watchlist,
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    """Best per-call time over `repeat` runs and bytes allocated by one call."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    func()  # warm caches so only the call's own allocations are counted
+    peaks = []
+    for _ in range(3):  # the smallest peak; a call can also pay for a resize
+        tracemalloc.start()
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"us": best * 1e6, "alloc_bytes": min(peaks)}
+
+
+def regressions(name: str, result: dict, baseline: dict, tolerance: float) -> list:
+    """Describe how a result exceeds its baseline, if it does."""
+    problems = []
+    if result["us"] > baseline["us"] * (1 + tolerance):
+        problems.append(f"time {baseline['us']:.1f}us -> {result['us']:.1f}us")
+    alloc_limit = baseline["alloc_bytes"] * (1 + ALLOC_TOLERANCE) + ALLOC_SLACK_BYTES
+    if result["alloc_bytes"] > alloc_limit:
+        problems.append(f"alloc {baseline['alloc_bytes']}B -> {result['alloc_bytes']}B")
+    return [f"{name}: {p}" for p in problems]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown over the baseline (0.5 = 50%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-cpu-"))
+    # Skip the fade-in delay; it is waiting, not CPU
+    real_sleep = asyncio.sleep
+    weather_main.asyncio.sleep = lambda *_: real_sleep(0)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        calibration = measure(reference_workload, args.repeat)["us"]
+        cases = build_cases(loop)
+        results = {name: measure(func, args.repeat) for name, func in cases.items()}
+
+        baseline = {}
+        if args.baseline.exists() and not args.save_baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        # How much slower this machine is than the one that saved the baseline
+        speed = calibration / baseline.pop("_calibration_us", calibration)
+        print(f"machine speed vs baseline: {1 / speed:.2f}x")
+
+        print(f"{'path':<18}{'us/call':>10}{'baseline':>10}{'alloc B':>10}{'baseline':>10}")
+        failures = []
+        for name, r in results.items():
+            base = baseline.get(name)
+            if base:
+                base = dict(base, us=base["us"] * speed)
+                for _ in range(CONFIRM_RUNS):
+                    if not regressions(name, r, base, args.tolerance):
+                        break
+                    again = measure(cases[name], args.repeat)
+                    r = {key: min(r[key], again[key]) for key in r}
+                failures.extend(regressions(name, r, base, args.tolerance))
+            print(
+                f"{name:<18}{r['us']:>10.1f}"
+                f"{base['us'] if base else float('nan'):>10.1f}"
+                f"{r['alloc_bytes']:>10}{base['alloc_bytes'] if base else '-':>10}"
+            )
+    finally:
+        loop.close()
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(results, _calibration_us=calibration), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    elif failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Time to a complete current-city view: sequential requests vs the fan-out.
+
+A stand-in provider answers weather, forecast, air quality and UV after
+different fixed delays. "sequential" awaits them one after another (how
+the view loaded before); "fan-out" uses WeatherService.dashboard(). The
+fan-out is measured for cities seen before (coordinates known, all four
+requests start at once) and new cities (air quality and UV wait for the
+weather response's coordinates).
+
+Usage:
+    python benchmarks/bench_dashboard.py [--searches 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_hedging import StandInProvider
+
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+# Seconds per request
+DELAYS = {"current": 0.12, "forecast": 0.20, "air_quality": 0.10, "uv_index": 0.15}
+
+
+class FixedDelayProvider(StandInProvider):
+    """StandInProvider with a fixed delay per kind of request."""
+
+    def __init__(self):
+        super().__init__("stand-in", median=0, tail_share=0, tail=0, seed=0)
+        self._next_delay = 0.0
+
+    def _delay(self) -> float:
+        return self._next_delay
+
+    async def current(self, client, city, units):
+        self._next_delay = DELAYS["current"]
+        data = await super().current(client, city, units)
+        # A place of its own per city, so air quality and UV are not shared
+        index = int(city.lstrip("City"))
+        return dict(data, coord={"lat": -60 + index * 0.5, "lon": 10.0})
+
+    async def forecast(self, client, city, units):
+        self._next_delay = DELAYS["forecast"]
+        return await super().forecast(client, city, units)
+
+    async def air_quality(self, client, lat, lon):
+        self._next_delay = DELAYS["air_quality"]
+        return await super().air_quality(client, lat, lon)
+
+    async def uv_index(self, client, lat, lon):
+        self._next_delay = DELAYS["uv_index"]
+        return await super().uv_index(client, lat, lon)
+
+
+async def sequential(service: WeatherService, city: str) -> dict:
+    started = time.perf_counter()
+    weather = await service.get_weather(city)
+    first = time.perf_counter() - started
+    await service.get_forecast(city)
+    lat, lon = weather["coord"]["lat"], weather["coord"]["lon"]
+    await service.get_air_quality(lat, lon)
+    await service.get_uv_index(lat, lon)
+    return {"first": first, "complete": time.perf_counter() - started}
+
+
+async def fan_out(service: WeatherService, city: str) -> dict:
+    started = time.perf_counter()
+    first = None
+    async for part, result in service.dashboard(city):
+        if first is None:
+            first = time.perf_counter() - started
+    return {"first": first, "complete": time.perf_counter() - started}
+
+
+async def run(mode: str, searches: int) -> dict:
+    service = WeatherService(
+        rate_limiter=RateLimiter(rate=1e6, capacity=1e6), providers=[FixedDelayProvider()]
+    )
+    service.api_key = "stand-in"
+    if mode == "fan-out, known city":
+        # Learn every city's coordinates, then drop the cached payloads
+        for i in range(searches):
+            await service.get_weather(f"City{i}")
+        service.cache.clear()
+    measure = sequential if mode == "sequential" else fan_out
+    results = [await measure(service, f"City{i}") for i in range(searches)]
+    return {
+        key: sorted(r[key] for r in results)[len(results) // 2] * 1000
+        for key in ("first", "complete")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=20)
+    args = parser.parse_args()
+
+    print("request delays (ms): " + ", ".join(f"{k} {v * 1000:.0f}" for k, v in DELAYS.items()))
+    print(f"{'mode':<22}{'first panel ms':>16}{'complete ms':>13}")
+    for mode in ("sequential", "fan-out, new city", "fan-out, known city"):
+        r = asyncio.run(run(mode, args.searches))
+        print(f"{mode:<22}{r['first']:>16.0f}{r['complete']:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
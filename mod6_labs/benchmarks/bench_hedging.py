@@ -0,0 +1,125 @@
+"""Tail latency of WeatherService with and without hedged requests.
+
+Two local stand-in providers replace OpenWeatherMap and Open-Meteo: both
+answer from the sample payloads after a random delay with a slow tail.
+Every request uses a new city so the cache never answers. Reports p50,
+p90 and p99 latency, the hedge rate, how often the secondary won, and
+how many losing calls were cancelled.
+
+Usage:
+    python benchmarks/bench_hedging.py [--requests 400] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from probe import load_fixture
+
+from providers import WeatherProvider
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+
+class StandInProvider(WeatherProvider):
+    """Answers from sample payloads after a latency drawn from a heavy-tailed distribution."""
+
+    def __init__(self, name: str, median: float, tail_share: float, tail: float, seed: int):
+        self.name = name
+        self.median = median
+        self.tail_share = tail_share
+        self.tail = tail
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+        self._weather = load_fixture("weather_london.json")
+        self._forecast = load_fixture("forecast_london.json")
+        self._air = load_fixture("air_pollution_london.json")
+
+    def _delay(self) -> float:
+        if self.rng.random() < self.tail_share:
+            return self.tail * (1 + self.rng.random())
+        return self.median * self.rng.lognormvariate(0, 0.25)
+
+    async def _answer(self, payload: dict) -> dict:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self._delay())
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return payload
+
+    async def current(self, client, city, units):
+        return await self._answer(dict(self._weather, name=city))
+
+    async def current_by_coordinates(self, client, lat, lon, units):
+        return await self._answer(dict(self._weather))
+
+    async def forecast(self, client, city, units):
+        return await self._answer(dict(self._forecast))
+
+    async def air_quality(self, client, lat, lon):
+        return await self._answer(self._air)
+
+    async def uv_index(self, client, lat, lon):
+        return await self._answer({"uvi": 3.2, "uvi_max": 4.1})
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+async def run(hedge: bool, requests: int, concurrency: int) -> dict:
+    primary = StandInProvider("primary", median=0.08, tail_share=0.05, tail=0.8, seed=1)
+    secondary = StandInProvider("secondary", median=0.12, tail_share=0.05, tail=0.8, seed=2)
+    service = WeatherService(
+        rate_limiter=RateLimiter(rate=1e6, capacity=1e6),
+        providers=[primary, secondary] if hedge else [primary],
+    )
+    service.api_key = "stand-in"
+
+    latencies = []
+    queue = iter(range(requests))
+
+    async def client_loop():
+        for i in queue:
+            started = time.perf_counter()
+            await service.get_weather(f"City{i}")
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    await service.aclose()
+    stats = service.stats()
+    return {
+        "p50": percentile(latencies, 50) * 1000,
+        "p90": percentile(latencies, 90) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "hedge_rate": stats["hedge_rate"],
+        "hedge_win_rate": stats["hedge_win_rate"],
+        "extra_calls": (primary.calls + secondary.calls) / requests - 1,
+        "cancelled": primary.cancelled + secondary.cancelled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+          f"{'hedged':>9}{'2nd won':>9}{'extra':>8}{'cancelled':>11}")
+    for hedge in (False, True):
+        r = asyncio.run(run(hedge, args.requests, args.concurrency))
+        print(
+            f"{'hedged' if hedge else 'primary':<10}{r['p50']:>9.0f}{r['p90']:>9.0f}{r['p99']:>9.0f}"
+            f"{r['hedge_rate']:>9.1%}{r['hedge_win_rate']:>9.1%}{r['extra_calls']:>8.1%}"
+            f"{r['cancelled']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""History clicks served from the cache, with and without idle prefetch.
+
+Each visit starts with an empty cache and a full API budget (the user
+comes back after a while), leaves the app idle for --think seconds, then
+picks a city from the history dropdown: usually one of their favourites,
+chosen in proportion to frecency. With idle prefetch the weather and
+forecast of the top cities are fetched during the idle time, so the click
+usually shows its weather at once, without the spinner.
+
+Time is compressed: the idle delay is 0.5 s instead of 5 s and the budget
+refills 5x faster than the free tier (same burst of 10).
+
+Usage:
+    python benchmarks/bench_idle_prefetch.py [--visits 40] [--think 3]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from bench_hedging import StandInProvider
+from probe import RenderProbePage
+
+import main as weather_main
+from config import Config
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+# (city, searches over the past weeks): a few favourites, a long tail
+HISTORY = [("London", 30), ("Manila", 18), ("Tokyo", 12), ("Paris", 8), ("Berlin", 6),
+           ("Madrid", 4), ("Seoul", 3), ("Cairo", 2), ("Sydney", 2), ("Toronto", 1)]
+WATCHLIST = ["Lisbon"]
+
+
+async def run(idle_prefetch: bool, visits: int, think: float, latency: float) -> dict:
+    Config.IDLE_PREFETCH_CITIES = 5 if idle_prefetch else 0
+    page = RenderProbePage(asyncio.get_running_loop())
+    app = weather_main.WeatherApp(page)
+    provider = StandInProvider("stand-in", median=latency, tail_share=0, tail=0, seed=49)
+    app.weather_service = WeatherService(
+        rate_limiter=RateLimiter(rate=5, capacity=Config.RATE_LIMIT_BURST), providers=[provider]
+    )
+    app.weather_service.api_key = "stand-in"
+    now = time.time()
+    for city, searches in HISTORY:
+        for i in range(searches):
+            app.search_history.record(city, now - (i + 1) * 86400 * 10 / searches)
+    app.watchlist = list(WATCHLIST)
+
+    shown = []
+    show_city_weather = app.show_city_weather
+
+    async def record_shown(city, data):
+        shown.append(time.perf_counter())
+        await show_city_weather(city, data)
+    app.show_city_weather = record_shown
+
+    rng = random.Random(49)
+    entries = app.search_history.top(Config.HISTORY_DROPDOWN_SIZE)
+    weights = [entry.frecency() for entry in entries]
+    waits, spinners = [], 0
+    for _ in range(visits):
+        service = app.weather_service
+        service.cache.clear()
+        service.rate_limiter = RateLimiter(rate=5, capacity=Config.RATE_LIMIT_BURST)
+        app.current_city = ""
+        app.start_idle_prefetch()  # the app was just opened
+        await asyncio.sleep(think)
+
+        city = rng.choices(entries, weights)[0].name
+        started = time.perf_counter()
+        app.load_from_history(SimpleNamespace(control=SimpleNamespace(value=city)))
+        spinner = False
+        while app.view_tasks.running("current"):
+            await asyncio.sleep(0.005)
+            spinner = spinner or app.loading.visible
+        spinners += spinner
+        waits.append(shown[-1] - started)
+    app.view_tasks.cancel("idle_prefetch")
+
+    counters = app.weather_service.stats()["counters"]
+    metrics = app.metrics.snapshot()["counters"]
+    waits.sort()
+    return {
+        "from_cache": metrics.get("searches_from_cache", 0) / visits,
+        "spinners": spinners,
+        "median_ms": waits[len(waits) // 2] * 1000,
+        "p90_ms": waits[int(len(waits) * 0.9)] * 1000,
+        "upstream": provider.calls,
+        "prefetches": counters.get("prefetch_upstream_calls", 0),
+        "denied": counters.get("prefetch_denied", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visits", type=int, default=40)
+    parser.add_argument("--think", type=float, default=3.0)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-idle-prefetch-"))
+    Config.IDLE_PREFETCH_DELAY = 0.5
+    # Skip the fade-in delay; it is the same in both modes
+    real_sleep = asyncio.sleep
+    weather_main.asyncio.sleep = lambda delay, *a: real_sleep(0 if delay == 0.1 else delay, *a)
+
+    print(f"{args.visits} visits, {args.think:g} s idle before each click, "
+          f"latency {args.latency_ms:.0f} ms")
+    print(f"{'mode':<16}{'from cache':>11}{'spinner':>9}{'median ms':>11}{'p90 ms':>8}"
+          f"{'upstream':>10}{'prefetches':>12}{'denied':>8}")
+    for idle_prefetch in (False, True):
+        r = asyncio.run(run(idle_prefetch, args.visits, args.think, args.latency_ms / 1000))
+        print(
+            f"{'idle prefetch' if idle_prefetch else 'no prefetch':<16}{r['from_cache']:>11.0%}"
+            f"{r['spinners']:>9}{r['median_ms']:>11.0f}{r['p90_ms']:>8.0f}"
+            f"{r['upstream']:>10}{r['prefetches']:>12}{r['denied']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Kiosk rotation: wait at each switch, spinner and memory over many rotations.
+
+Runs the kiosk over a watchlist of --cities cities with a stand-in
+provider. Time is compressed: --interval-ms per city instead of 30 s and
+--latency-ms per request. The cache is cleared after every full cycle, as
+its entries would have expired by then in a real rotation, so every
+switch needs a fresh fetch. Reports:
+
+- how long each switch waited for its city's data (the one-ahead
+  pipeline fetched it while the previous city was on screen; only the
+  very first city has nothing ahead of it);
+- whether the loading spinner was ever visible;
+- traced Python memory and live objects after a warm-up and at the end.
+  1,000 rotations at 30 s are over 8 hours of wall-display time.
+
+Usage:
+    python benchmarks/bench_kiosk.py [--rotations 1000] [--cities 12]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from bench_hedging import StandInProvider
+from probe import RenderProbePage
+
+import main as weather_main
+from config import Config
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+
+async def run(args) -> dict:
+    page = RenderProbePage(asyncio.get_running_loop())
+    app = weather_main.WeatherApp(page)
+    provider = StandInProvider("stand-in", median=args.latency_ms / 1000,
+                               tail_share=0, tail=0, seed=50)
+    app.weather_service = WeatherService(
+        rate_limiter=RateLimiter(rate=1e6, capacity=1e6), providers=[provider]
+    )
+    app.weather_service.api_key = "stand-in"
+    app.watchlist = [f"City{i:02d}" for i in range(args.cities)]
+
+    spinner_seen = 0
+
+    async def watch_spinner():
+        nonlocal spinner_seen
+        while True:
+            spinner_seen += app.loading.visible
+            await asyncio.sleep(0.002)
+
+    def rotations():
+        return app.metrics.snapshot()["counters"].get("kiosk_rotations", 0)
+
+    async def wait_for(count):
+        while rotations() < count:
+            if rotations() and rotations() % args.cities == 0:
+                app.weather_service.cache.clear()  # entries would have expired
+            await asyncio.sleep(Config.KIOSK_INTERVAL / 4)
+
+    watcher = asyncio.ensure_future(watch_spinner())
+    app.view_tasks.start("kiosk", app.run_kiosk)
+    await wait_for(args.warmup)
+    gc.collect()
+    warm_memory, _ = tracemalloc.get_traced_memory()
+    warm_objects = len(gc.get_objects())
+    await wait_for(args.rotations)
+    gc.collect()
+    end_memory, _ = tracemalloc.get_traced_memory()
+    end_objects = len(gc.get_objects())
+    app.view_tasks.cancel("kiosk")
+    watcher.cancel()
+
+    wait = app.metrics.snapshot()["timings"]["kiosk_fetch_wait_ms"]
+    return {
+        "rotations": rotations(),
+        "wait_mean_ms": wait["mean"],
+        "wait_max_ms": wait["max"],
+        "spinner_seen": spinner_seen,
+        "upstream": provider.calls,
+        "memory": (warm_memory, end_memory),
+        "objects": (warm_objects, end_objects),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rotations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=300)
+    parser.add_argument("--cities", type=int, default=12)
+    parser.add_argument("--interval-ms", type=float, default=150)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-kiosk-"))
+    Config.KIOSK_INTERVAL = args.interval_ms / 1000
+    Config.IDLE_PREFETCH_CITIES = 0
+    # Skip the 0.1 s fade-in, which would dominate the compressed interval
+    # (every 0.1 s sleep is skipped, so --interval-ms must not be 100)
+    real_sleep = asyncio.sleep
+    weather_main.asyncio.sleep = lambda delay, *a: real_sleep(0 if delay == 0.1 else delay, *a)
+
+    tracemalloc.start()
+    r = asyncio.run(run(args))
+    (warm_memory, end_memory), (warm_objects, end_objects) = r["memory"], r["objects"]
+    print(f"{r['rotations']} rotations over {args.cities} cities, "
+          f"{args.interval_ms:g} ms per city, {args.latency_ms:g} ms per request")
+    print(f"wait at switch      mean {r['wait_mean_ms']:.2f} ms, max {r['wait_max_ms']:.2f} ms")
+    print(f"spinner visible     {r['spinner_seen']} times")
+    print(f"upstream calls      {r['upstream']}")
+    print(f"traced memory       {warm_memory / 1024:.0f} KiB after {args.warmup} rotations, "
+          f"{end_memory / 1024:.0f} KiB at the end ({(end_memory - warm_memory) / 1024:+.0f} KiB)")
+    print(f"live objects        {warm_objects} -> {end_objects} ({end_objects - warm_objects:+d})")
+
+
+if __name__ == "__main__":
+    main()
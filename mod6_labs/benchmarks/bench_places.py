@@ -0,0 +1,105 @@
+"""Nearest-city lookup speed and the cache hit rate of location weather.
+
+Loads the bundled city dataset, times k-d tree lookups against a linear
+scan, then simulates location lookups from users around a few large
+cities: IP geolocation puts each of them up to --jitter-km from the city
+centre. With raw coordinates as the cache key (4 decimals, as before)
+nearly every lookup is a miss; snapped to the nearest city, every user of
+a city shares one entry. "upstream" runs the lookups through
+WeatherService with a stand-in provider and counts the calls it makes.
+
+Usage:
+    python benchmarks/bench_places.py [--lookups 500] [--jitter-km 5]
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import timeit
+
+from bench_hedging import StandInProvider
+
+from city_index import EARTH_RADIUS_KM, CityIndex, read_cities
+from config import Config
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+
+def linear_nearest(cities, lat, lon):
+    """Nearest city by haversine distance over every city."""
+    def distance(city):
+        dlat = math.radians(city.lat - lat)
+        dlon = math.radians(city.lon - lon)
+        a = (math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat))
+             * math.cos(math.radians(city.lat)) * math.sin(dlon / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+    return min(cities, key=distance)
+
+
+def jittered(rng, city, km):
+    """A point up to `km` from a city in a random direction."""
+    distance, bearing = rng.uniform(0, km), rng.uniform(0, 2 * math.pi)
+    dlat = distance / 111.2 * math.cos(bearing)
+    dlon = distance / (111.2 * math.cos(math.radians(city.lat))) * math.sin(bearing)
+    return city.lat + dlat, city.lon + dlon
+
+
+async def upstream_calls(index, points) -> int:
+    provider = StandInProvider("stand-in", median=0, tail_share=0, tail=0, seed=0)
+    service = WeatherService(
+        rate_limiter=RateLimiter(rate=1e6, capacity=1e6), providers=[provider], places=index
+    )
+    service.api_key = "stand-in"
+    for lat, lon in points:
+        await service.get_weather_by_coordinates(lat, lon)
+    return service.stats()["counters"].get("upstream_calls", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--jitter-km", type=float, default=5)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cities = read_cities(Config.CITY_DATASET)
+    loaded = time.perf_counter()
+    index = CityIndex(cities)
+    built = time.perf_counter()
+    print(f"{len(cities)} cities: read {(loaded - started) * 1000:.0f} ms, "
+          f"k-d tree built in {(built - loaded) * 1000:.0f} ms")
+
+    rng = random.Random(44)
+    queries = [jittered(rng, city, args.jitter_km) for city in rng.sample(cities, 200)]
+    tree_us = min(timeit.repeat(
+        lambda: [index.nearest(lat, lon, Config.NEAREST_CITY_MAX_KM) for lat, lon in queries],
+        number=5, repeat=3,
+    )) / (5 * len(queries)) * 1e6
+    linear_us = min(timeit.repeat(
+        lambda: [linear_nearest(cities, lat, lon) for lat, lon in queries[:20]],
+        number=1, repeat=3,
+    )) / 20 * 1e6
+    print(f"nearest city: k-d tree {tree_us:.1f} us, linear scan {linear_us:.0f} us")
+
+    large = [city for city in cities if city.population >= 1_000_000]
+    homes = rng.sample(large, 20)
+    points = [jittered(rng, rng.choice(homes), args.jitter_km) for _ in range(args.lookups)]
+    schemes = {
+        "raw (4 decimals)": lambda lat, lon: (round(lat, 4), round(lon, 4)),
+        "rounded (2 decimals)": lambda lat, lon: (round(lat, 2), round(lon, 2)),
+        "nearest city": lambda lat, lon: index.nearest(lat, lon, Config.NEAREST_CITY_MAX_KM).city.key,
+    }
+    print(f"\n{args.lookups} lookups around {len(homes)} cities, "
+          f"up to {args.jitter_km:g} km off")
+    print(f"{'cache key':<22}{'distinct keys':>15}{'hit rate':>10}")
+    for name, key in schemes.items():
+        distinct = len({key(lat, lon) for lat, lon in points})
+        print(f"{name:<22}{distinct:>15}{1 - distinct / len(points):>10.0%}")
+    calls = asyncio.run(upstream_calls(index, points))
+    print(f"\nupstream calls through WeatherService: {calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Load test of the weather proxy: requests/sec and upstream calls saved.
+
+Starts a local fake OpenWeatherMap and `weather_proxy.py` in child
+processes, then runs --clients simulated tools against the proxy for
+--duration seconds. Each tool asks for popular cities far more often than
+rare ones (as real traffic does); one request in ten is a /batch of five
+cities. Without the proxy every city lookup would be its own upstream
+call; the report compares that with the calls the fake API actually saw.
+
+The proxy gets an API budget of --budget calls/minute, so the warm-up
+(one miss per city) is not throttled by the 60/minute free tier.
+
+Usage:
+    python benchmarks/bench_proxy.py [--clients 50] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from fake_upstream import fetch_stats, start_in_process, upstream_env
+
+UPSTREAM_PORT = 8711
+PROXY_PORT = 8712
+CITIES = [f"City{i:03d}" for i in range(100)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(CITIES))]
+
+
+def start_proxy(budget: int) -> subprocess.Popen:
+    env = dict(os.environ, **upstream_env(UPSTREAM_PORT))
+    env["WEATHER_RATE_LIMIT_PER_MINUTE"] = str(budget)
+    root = Path(__file__).resolve().parent.parent
+    proxy = subprocess.Popen(
+        [sys.executable, "weather_proxy.py", "--port", str(PROXY_PORT)],
+        cwd=root, env=env, stdout=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PROXY_PORT}/health", timeout=0.2)
+            return proxy
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proxy.kill()
+    raise RuntimeError("weather proxy did not start")
+
+
+async def tool(index: int, stop_at: float, latencies: list, counts: dict):
+    """One client tool: asks the proxy for cities until time is up."""
+    rng = random.Random(index)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{PROXY_PORT}", headers={"X-Client-Id": f"tool-{index}"},
+        timeout=30,
+    ) as client:
+        while time.monotonic() < stop_at:
+            if rng.random() < 0.1:
+                cities = rng.choices(CITIES, WEIGHTS, k=5)
+                path, params = "/batch", [("city", city) for city in cities]
+            else:
+                cities = rng.choices(CITIES, WEIGHTS)
+                path, params = "/weather", [("city", cities[0])]
+            started = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies.append(time.perf_counter() - started)
+            counts["requests"] += 1
+            counts["lookups"] += len(set(cities))
+            counts["errors"] += response.status_code != 200
+
+
+async def load(clients: int, duration: float) -> dict:
+    latencies, counts = [], {"requests": 0, "lookups": 0, "errors": 0}
+    stop_at = time.monotonic() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(tool(i, stop_at, latencies, counts) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    async with httpx.AsyncClient() as client:
+        stats = (await client.get(f"http://127.0.0.1:{PROXY_PORT}/stats")).json()
+    return dict(
+        counts,
+        rps=counts["requests"] / elapsed,
+        p50_ms=latencies[len(latencies) // 2] * 1000,
+        p99_ms=latencies[int(len(latencies) * 0.99)] * 1000,
+        service=stats["service"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--budget", type=int, default=6000, help="upstream calls per minute")
+    args = parser.parse_args()
+
+    upstream = start_in_process(UPSTREAM_PORT, args.latency_ms / 1000)
+    proxy = start_proxy(args.budget)
+    try:
+        r = asyncio.run(load(args.clients, args.duration))
+        calls = fetch_stats(UPSTREAM_PORT)["weather"]
+    finally:
+        proxy.terminate()
+        proxy.wait()
+        upstream.terminate()
+
+    service = r["service"]
+    print(f"{args.clients} tools for {args.duration:g} s, upstream latency {args.latency_ms:g} ms")
+    print(f"requests/sec        {r['rps']:.0f}  (p50 {r['p50_ms']:.1f} ms, "
+          f"p99 {r['p99_ms']:.1f} ms, {r['errors']} errors)")
+    print(f"city lookups        {r['lookups']}  (= upstream calls without the proxy)")
+    print(f"upstream calls      {calls}  ({r['lookups'] / max(calls, 1):.0f}x fewer)")
+    print(f"cache hit rate      {service['cache_hit_rate']:.1%}  "
+          f"(served from another tool's fetch: {service['cross_session_hit_rate']:.1%})")
+    print(f"single-flight joins {service['counters'].get('singleflight_joins', 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare retained-mode panel updates against rebuilding the panels.
+
+Runs offline against sample payloads and reports, per search, the update
+payload Flet would send and the render latency. "unchanged" refreshes the
+same city with the same payload, which should send (almost) nothing.
+
+Usage:
+    python benchmarks/bench_render.py [--searches 50]
+"""
+
+import argparse
+import asyncio
+import time
+
+from probe import RenderProbePage, load_fixture
+
+import main as weather_main
+
+
+async def run(searches: int, mode: str):
+    page = RenderProbePage(asyncio.get_running_loop())
+    app = weather_main.WeatherApp(page)
+    payloads = [load_fixture("weather_london.json"), load_fixture("weather_manila.json")]
+    if mode == "unchanged":
+        payloads = payloads[:1]
+    forecast = load_fixture("forecast_london.json")
+
+    # Skip the animation delay; it is not part of the render cost
+    real_sleep = asyncio.sleep
+    weather_main.asyncio.sleep = lambda *_: real_sleep(0)
+    try:
+        page.reset_counters()
+        elapsed = 0.0
+        for i in range(searches):
+            started = time.perf_counter()
+            if mode == "rebuild":
+                # What every search did before: brand new control trees
+                app.build_weather_panel()
+                app.build_alerts_panel()
+                app.build_forecast_panel()
+                app.rendered_weather = app.rendered_forecast = None
+            await app.display_weather(payloads[i % len(payloads)])
+            await app.display_forecast(forecast)
+            app.update_scheduler.flush()
+            elapsed += time.perf_counter() - started
+    finally:
+        weather_main.asyncio.sleep = real_sleep
+
+    return {
+        "bytes_per_search": page.payload_bytes / searches,
+        "updates_per_search": page.updates / searches,
+        "ms_per_search": elapsed / searches * 1000,
+        "suppressed": app.stats()["suppressed_render_rate"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {mode: asyncio.run(run(args.searches, mode))
+               for mode in ("rebuild", "retained", "unchanged")}
+    rebuilt, retained = results["rebuild"], results["retained"]
+
+    print(f"{'mode':<10}{'bytes/search':>15}{'updates/search':>17}{'ms/search':>12}"
+          f"{'suppressed':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<10}{result['bytes_per_search']:>15.0f}"
+            f"{result['updates_per_search']:>17.1f}{result['ms_per_search']:>12.2f}"
+            f"{result['suppressed']:>12.0%}"
+        )
+    reduction = 1 - retained["bytes_per_search"] / rebuilt["bytes_per_search"]
+    speedup = rebuilt["ms_per_search"] / retained["ms_per_search"]
+    print(f"\nPayload reduction: {reduction:.0%}   Render speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
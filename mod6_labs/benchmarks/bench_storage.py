@@ -0,0 +1,110 @@
+"""Size and decode cost of compressed payloads and sealed observation chunks.
+
+Payloads: the sample /weather and /forecast responses as compact JSON, as
+plain zlib, and as encode_payload() (zlib with the preset dictionary),
+plus decode time, a SqliteCache read, and a TieredCache (the default
+single-process cache) read from memory and, after a restart, from disk.
+
+Observations: a city with --days of 10-minute samples, stored with and
+without sealing, and the time to query a week and decode every chunk.
+
+Usage:
+    python benchmarks/bench_storage.py [--days 90]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import timeit
+
+from probe import load_fixture
+
+from observation_store import CHUNK_SECONDS, ObservationStore, decode_chunk
+from payload_codec import compression_stats, decode_payload, encode_payload
+from shared_store import SqliteCache, TieredCache
+from weather_cache import TTLCache
+
+
+def per_call_us(func, number: int = 2000) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def bench_payloads(workdir: str):
+    print(f"{'payload':<22}{'json B':>8}{'zlib B':>8}{'coded B':>9}{'ratio':>7}"
+          f"{'json.loads us':>15}{'decode us':>11}{'cache get us':>14}"
+          f"{'tiered us':>11}{'restart us':>12}")
+    cache = SqliteCache(os.path.join(workdir, "cache.db"), ttl=600)
+    tiered = TieredCache(TTLCache(600), SqliteCache(os.path.join(workdir, "tiered.db"), ttl=600))
+    for name in ("weather_london.json", "weather_manila.json", "forecast_london.json"):
+        value = load_fixture(name)
+        sizes = compression_stats(value)
+        text = json.dumps(value, separators=(",", ":"))
+        encoded = encode_payload(value)
+        cache.set(name, value)
+        tiered.set(name, value)
+
+        def restarted_get():
+            tiered.memory.clear()  # as after a restart: only the file has it
+            return tiered.get(name)
+        print(
+            f"{name:<22}{sizes['json']:>8}{sizes['zlib']:>8}{sizes['encoded']:>9}"
+            f"{sizes['json'] / sizes['encoded']:>6.1f}x"
+            f"{per_call_us(lambda: json.loads(text)):>15.1f}"
+            f"{per_call_us(lambda: decode_payload(encoded)):>11.1f}"
+            f"{per_call_us(lambda: cache.get(name), number=500):>14.1f}"
+            f"{per_call_us(lambda: tiered.get(name)):>11.1f}"
+            f"{per_call_us(restarted_get, number=500):>12.1f}"
+        )
+
+
+def fill_store(path: str, days: int, seal: bool) -> ObservationStore:
+    store = ObservationStore(path)
+    if not seal:
+        store._seal_before = lambda city_id, chunk_start: None
+    rng = random.Random(days)
+    start = int(time.time()) // CHUNK_SECONDS * CHUNK_SECONDS - days * CHUNK_SECONDS
+    temp, pressure = 15.0, 1013.0
+    for i in range(days * 144):
+        temp += rng.uniform(-0.3, 0.3)
+        pressure += rng.uniform(-0.5, 0.5)
+        store.append("London", start + i * 600, (
+            temp, temp - 2, float(rng.randint(60, 90)), pressure, rng.uniform(0, 8),
+        ))
+    return store
+
+
+def bench_observations(workdir: str, days: int):
+    print(f"\n{'chunks':<10}{'bytes':>10}{'bytes/sample':>14}{'week query ms':>15}"
+          f"{'decode all ms':>15}")
+    for seal in (False, True):
+        path = os.path.join(workdir, f"obs-{'sealed' if seal else 'raw'}.db")
+        store = fill_store(path, days, seal)
+        rows = store._conn.execute("SELECT data, sealed FROM chunks").fetchall()
+        size = sum(len(data) for data, _ in rows)
+        end = time.time()
+        query_ms = min(timeit.repeat(
+            lambda: store.query("London", end - 7 * CHUNK_SECONDS, end), number=20, repeat=5
+        )) / 20 * 1000
+        decode_ms = min(timeit.repeat(
+            lambda: [decode_chunk(data, sealed) for data, sealed in rows], number=5, repeat=5
+        )) / 5 * 1000
+        print(f"{'sealed' if seal else 'raw':<10}{size:>10}{size / (days * 144):>14.1f}"
+              f"{query_ms:>15.2f}{decode_ms:>15.2f}")
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-storage-")
+    bench_payloads(workdir)
+    bench_observations(workdir, args.days)
+
+
+if __name__ == "__main__":
+    main()
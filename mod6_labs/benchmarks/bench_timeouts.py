@@ -0,0 +1,115 @@
+"""Fixed vs adaptive request timeouts against a flaky local upstream.
+
+The fake OpenWeatherMap answers in ~80 ms (log-normal) but never answers
+--hopeless-share of the requests. A fixed 10 s timeout holds those
+callers for 10 s; the adaptive timeout gives up after a few times the
+recent p99. In the second phase every answer takes 2.5-3.5 s: slow but
+healthy, so after a few timeouts the adaptive timeout has to grow and
+let them through.
+
+Usage:
+    python benchmarks/bench_timeouts.py [--requests 400] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+
+from fake_upstream import FakeOpenWeather
+
+from errors import WeatherServiceError
+from providers import OpenWeatherProvider
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+PORT = 8705
+
+
+class FlakyUpstream(FakeOpenWeather):
+    """Fast answers, some never answered, or uniformly slow answers."""
+
+    def __init__(self, hopeless_share: float, seed: int = 45):
+        super().__init__()
+        self.hopeless_share = hopeless_share
+        self.slow = False
+        self.rng = random.Random(seed)
+
+    def delay(self) -> float:
+        if self.slow:
+            return self.rng.uniform(2.5, 3.5)
+        if self.rng.random() < self.hopeless_share:
+            return 3600
+        return self.rng.lognormvariate(math.log(0.08), 0.5)
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def phase(service, requests: int, concurrency: int, offset: int) -> dict:
+    cities = iter(range(offset, offset + requests))
+    ok, failed = [], []
+
+    async def client_loop():
+        for i in cities:
+            started = time.perf_counter()
+            try:
+                await service.get_weather(f"City{i}")  # a new city: no cache hits
+                ok.append(time.perf_counter() - started)
+            except WeatherServiceError:
+                failed.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return {
+        "ok": len(ok) / requests,
+        "p50_ms": percentile(ok, 0.5) * 1000 if ok else float("nan"),
+        "give_up_s": sum(failed) / len(failed) if failed else 0.0,
+        "failed": len(failed),
+    }
+
+
+async def run(adaptive: bool, args) -> list:
+    upstream = FlakyUpstream(args.hopeless_share)
+    server = await asyncio.start_server(upstream.handle, "127.0.0.1", PORT)
+    base = f"http://127.0.0.1:{PORT}/data/2.5"
+    provider = OpenWeatherProvider("benchmark", f"{base}/weather", f"{base}/forecast")
+    service = WeatherService(
+        rate_limiter=RateLimiter(rate=1e6, capacity=1e6), providers=[provider]
+    )
+    service.api_key = "benchmark"
+    service.timeouts.enabled = adaptive
+    try:
+        healthy = await phase(service, args.requests, args.concurrency, 0)
+        upstream.slow = True
+        slow = await phase(service, args.slow_requests, args.concurrency, args.requests)
+        timeouts = service.stats()["timeouts"]["openweather.current"]
+    finally:
+        await service.aclose()
+        server.close()
+    return [("healthy", healthy), ("slow", slow)], timeouts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--slow-requests", type=int, default=80)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--hopeless-share", type=float, default=0.03)
+    args = parser.parse_args()
+
+    print(f"{'timeouts':<10}{'phase':<9}{'answered':>10}{'p50 ms':>8}{'failed':>8}"
+          f"{'give up s':>11}")
+    for adaptive in (False, True):
+        phases, timeouts = asyncio.run(run(adaptive, args))
+        for name, r in phases:
+            print(f"{'adaptive' if adaptive else 'fixed':<10}{name:<9}{r['ok']:>10.1%}"
+                  f"{r['p50_ms']:>8.0f}{r['failed']:>8}{r['give_up_s']:>11.2f}")
+        print(f"{'':<10}final read timeout {timeouts['read_timeout_s']:.2f} s, "
+              f"connect {timeouts['connect_timeout_s']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
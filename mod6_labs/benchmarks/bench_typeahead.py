@@ -0,0 +1,107 @@
+"""Time from pressing Enter to weather on screen, with and without type-ahead prefetch.
+
+Simulated users type a city from their search history one key at a time,
+pause briefly, then press Enter. A stand-in provider answers every city
+after a fixed delay. With prefetch the debounced type-ahead usually has the
+city in the cache (or in flight) before Enter is pressed.
+
+Usage:
+    python benchmarks/bench_typeahead.py [--searches 40] [--latency-ms 150]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from bench_hedging import StandInProvider
+from probe import RenderProbePage
+
+import main as weather_main
+from config import Config
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+CITIES = ["London", "Lisbon", "Los Angeles", "Manila", "Madrid", "Tokyo", "Toronto",
+          "Paris", "Prague", "Berlin", "Bangkok", "Sydney", "Seoul", "Cairo"]
+
+
+async def run(prefetch: bool, searches: int, latency: float, seed: int = 7) -> dict:
+    page = RenderProbePage(asyncio.get_running_loop())
+    app = weather_main.WeatherApp(page)
+    provider = StandInProvider("stand-in", median=latency, tail_share=0, tail=0, seed=seed)
+    provider._delay = lambda: latency
+    # Each search spends four tokens (weather, forecast, air quality, UV)
+    app.weather_service = WeatherService(
+        rate_limiter=RateLimiter(rate=8, capacity=80), providers=[provider]
+    )
+    app.weather_service.api_key = "stand-in"
+    for city in CITIES:
+        app.search_history.record(city)
+    if not prefetch:
+        app.typeahead = lambda text: asyncio.sleep(0)
+    # The weather panel is what the prefetch speeds up; the forecast, air
+    # quality and UV panels of the same search fill in after it
+    shown = []
+    show_city_weather = app.show_city_weather
+
+    async def record_shown(city, data):
+        shown.append(time.perf_counter())
+        await show_city_weather(city, data)
+    app.show_city_weather = record_shown
+
+    rng = random.Random(seed)
+    waits = []
+    for i in range(searches):
+        city = rng.choice(CITIES)
+        app.weather_service.cache.clear()  # a fresh city every time
+        for n in range(1, len(city) + 1):
+            app.city_input.value = city[:n]
+            app.on_city_input_change(None)
+            await asyncio.sleep(rng.uniform(0.05, 0.12))
+        await asyncio.sleep(rng.uniform(0.2, 0.6))  # look at the suggestions
+
+        started = time.perf_counter()
+        app.view_tasks.cancel("typeahead")
+        await app.view_tasks.start("current", app.get_weather)
+        waits.append(shown[-1] - started)
+
+    stats = app.weather_service.stats()["counters"]
+    waits.sort()
+    return {
+        "median_ms": waits[len(waits) // 2] * 1000,
+        "p90_ms": waits[int(len(waits) * 0.9)] * 1000,
+        "upstream": stats.get("upstream_calls", 0),
+        "prefetches": stats.get("prefetch_upstream_calls", 0),
+        "prefetch_hits": stats.get("prefetch_hits", 0),
+        "denied": stats.get("prefetch_denied", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-typeahead-"))
+    # Skip the fade-in delay; it is the same in both modes
+    real_sleep = asyncio.sleep
+    weather_main.asyncio.sleep = lambda delay, *a: real_sleep(0 if delay == 0.1 else delay, *a)
+
+    print(f"debounce={Config.TYPEAHEAD_DEBOUNCE}s latency={args.latency_ms:.0f}ms")
+    print(f"{'mode':<12}{'median ms':>11}{'p90 ms':>9}{'upstream':>10}"
+          f"{'prefetches':>12}{'used':>6}{'denied':>8}")
+    for prefetch in (False, True):
+        r = asyncio.run(run(prefetch, args.searches, args.latency_ms / 1000))
+        print(
+            f"{'prefetch' if prefetch else 'no prefetch':<12}{r['median_ms']:>11.0f}"
+            f"{r['p90_ms']:>9.0f}{r['upstream']:>10}{r['prefetches']:>12}"
+            f"{r['prefetch_hits']:>6}{r['denied']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
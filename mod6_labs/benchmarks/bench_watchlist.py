@@ -0,0 +1,81 @@
+"""Cost of opening and paging through large watchlists.
+
+Runs offline: a stand-in provider answers every city after a short delay.
+For each watchlist size, reports the upstream calls, card controls and
+update payload of opening the watchlist, and the cost of a page flip.
+
+Usage:
+    python benchmarks/bench_watchlist.py [--sizes 20 200 1000]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from bench_hedging import StandInProvider
+from probe import RenderProbePage
+
+import main as weather_main
+from weather_cache import RateLimiter
+from weather_service import WeatherService
+
+
+async def run(size: int, flips: int) -> dict:
+    page = RenderProbePage(asyncio.get_running_loop())
+    app = weather_main.WeatherApp(page)
+    provider = StandInProvider("stand-in", median=0.02, tail_share=0, tail=0, seed=size)
+    app.weather_service = WeatherService(
+        rate_limiter=RateLimiter(rate=1e6, capacity=1e6), providers=[provider]
+    )
+    app.weather_service.api_key = "stand-in"
+    app.watchlist = [f"City{i:04d}" for i in range(size)]
+    app.watchlist_index.set_cities(app.watchlist)
+
+    page.reset_counters()
+    started = time.perf_counter()
+    await app.display_watchlist()
+    app.update_scheduler.flush()
+    open_ms = (time.perf_counter() - started) * 1000
+    open_bytes = page.payload_bytes
+    open_calls = provider.calls
+
+    page.reset_counters()
+    started = time.perf_counter()
+    for _ in range(flips):
+        app.watchlist_page += 1
+        await app.display_watchlist()
+        app.update_scheduler.flush()
+    flip_ms = (time.perf_counter() - started) * 1000 / flips
+
+    return {
+        "open_calls": open_calls,
+        "cards": len(app.watchlist_cards_column.controls),
+        "open_bytes": open_bytes,
+        "open_ms": open_ms,
+        "flip_bytes": page.payload_bytes / flips,
+        "flip_ms": flip_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 1000])
+    parser.add_argument("--flips", type=int, default=5)
+    args = parser.parse_args()
+
+    # The app keeps its data files in the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bench-watchlist-"))
+    print(f"{'cities':>7}{'open calls':>12}{'cards':>7}{'open bytes':>12}{'open ms':>9}"
+          f"{'flip bytes':>12}{'flip ms':>9}")
+    for size in args.sizes:
+        r = asyncio.run(run(size, args.flips))
+        print(
+            f"{size:>7}{r['open_calls']:>12}{r['cards']:>7}{r['open_bytes']:>12}"
+            f"{r['open_ms']:>9.0f}{r['flip_bytes']:>12.0f}{r['flip_ms']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Sessions/sec of the web app versus number of worker processes.
+
+Each worker process runs many simulated sessions concurrently: a session
+creates a WeatherApp on a probe page (no browser needed), searches a city
+and opens its forecast. All traffic goes to a local fake OpenWeatherMap.
+With --mode shared (default) workers use the SQLite shared cache and rate
+limiter from multi-worker mode; --mode isolated gives each worker its own
+in-memory cache for comparison.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1 2 4] [--duration 5]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fake_upstream import fetch_stats, start_in_process, upstream_env
+
+CITIES = [f"City{i:03d}" for i in range(60)]
+
+
+def _city_sequence(seed: int):
+    """Popular cities come up far more often, like real traffic."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(CITIES))]
+    while True:
+        yield rng.choices(CITIES, weights)[0]
+
+
+async def _run_sessions(concurrency: int, duration: float, seed: int) -> int:
+    from probe import RenderProbePage
+    import main as weather_main
+
+    loop = asyncio.get_running_loop()
+    cities = _city_sequence(seed)
+    stop_at = time.monotonic() + duration
+    completed = 0
+
+    async def session_loop():
+        nonlocal completed
+        while time.monotonic() < stop_at:
+            page = RenderProbePage(loop)
+            page.session_id = f"{seed}-{completed}"
+            app = weather_main.WeatherApp(page)
+            app.city_input.value = next(cities)
+            await app.get_weather()
+            await app.get_forecast()
+            app.update_scheduler.flush()
+            completed += 1
+
+    await asyncio.gather(*(session_loop() for _ in range(concurrency)))
+    return completed
+
+
+def _worker(worker_id, env, concurrency, duration, start_at, results):
+    os.environ.update(env)
+    # Each worker keeps its own per-session files, like separate hosts would
+    os.chdir(tempfile.mkdtemp(prefix=f"weather-worker{worker_id}-"))
+    sys.stdout = open(os.devnull, "w")
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    time.sleep(max(0.0, start_at - time.time()))
+    results.put(asyncio.run(_run_sessions(concurrency, duration, seed=worker_id)))
+
+
+def run(workers: int, mode: str, concurrency: int, duration: float, port: int) -> dict:
+    before = fetch_stats(port)
+    env = dict(upstream_env(port), WEATHER_RATE_LIMIT_PER_MINUTE="6000")
+    if mode == "shared":
+        env["WEATHER_SHARED_CACHE"] = str(Path(tempfile.mkdtemp()) / "shared_cache.db")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    start_at = time.time() + 3  # let every worker finish importing first
+    processes = [
+        ctx.Process(target=_worker, args=(i, env, concurrency, duration, start_at, results))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    sessions = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+
+    after = fetch_stats(port)
+    upstream = sum(after.values()) - sum(before.values())
+    return {"sessions_per_sec": sessions / duration, "sessions": sessions, "upstream": upstream}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mode", choices=["shared", "isolated"], default="shared")
+    parser.add_argument("--concurrency", type=int, default=20, help="sessions per worker")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--port", type=int, default=8701)
+    args = parser.parse_args()
+
+    upstream = start_in_process(args.port, args.latency_ms / 1000)
+    try:
+        print(f"mode={args.mode} concurrency/worker={args.concurrency} duration={args.duration}s")
+        print(f"{'workers':>8}{'sessions/s':>12}{'sessions':>10}{'upstream calls':>16}")
+        for workers in args.workers:
+            result = run(workers, args.mode, args.concurrency, args.duration, args.port)
+            print(
+                f"{workers:>8}{result['sessions_per_sec']:>12.1f}"
+                f"{result['sessions']:>10}{result['upstream']:>16}"
+            )
+    finally:
+        upstream.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Local stand-in for the OpenWeatherMap API, for offline benchmarks.
+
+Serves /data/2.5/weather, /data/2.5/forecast and /data/2.5/air_pollution
+from sample payloads,
+and an IP geolocation answer at /json, with a configurable delay, and
+counts calls (GET /__stats).
+
+Usage:
+    python benchmarks/fake_upstream.py [--port 8701] [--latency-ms 80]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from probe import load_fixture
+
+
+class FakeOpenWeather:
+    """Minimal HTTP/1.1 server (keep-alive, GET only) imitating OpenWeatherMap."""
+
+    def __init__(self, latency: float = 0.08):
+        self.latency = latency
+        self.calls = {"weather": 0, "forecast": 0, "air_pollution": 0, "location": 0}
+        self._weather = load_fixture("weather_london.json")
+        self._forecast = load_fixture("forecast_london.json")
+        self._air = load_fixture("air_pollution_london.json")
+
+    def delay(self) -> float:
+        """Seconds before answering a request (subclasses vary it)."""
+        return self.latency
+
+    def respond(self, path: str, query: dict):
+        city = query.get("q", [None])[0]
+        if path.endswith("/weather"):
+            self.calls["weather"] += 1
+            data = dict(self._weather, name=city.title() if city else "Coordinates")
+        elif path.endswith("/forecast"):
+            self.calls["forecast"] += 1
+            data = dict(self._forecast)
+            data["city"] = dict(data["city"], name=city.title() if city else "Coordinates")
+        elif path.endswith("/air_pollution"):
+            self.calls["air_pollution"] += 1
+            return 200, self._air
+        elif path == "/json":
+            self.calls["location"] += 1
+            return 200, {"latitude": 51.5085, "longitude": -0.1257, "city": "London"}
+        elif path == "/__stats":
+            return 200, self.calls
+        else:
+            return 404, {"cod": "404", "message": "not found"}
+        if city and city.lower().startswith("nowhere"):
+            return 404, {"cod": "404", "message": "city not found"}
+        return 200, data
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # headers are not needed
+                target = urlsplit(request_line.split()[1].decode())
+                status, data = self.respond(target.path, parse_qs(target.query))
+                if target.path != "/__stats":
+                    await asyncio.sleep(self.delay())
+                body = json.dumps(data).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (ConnectionError, IndexError, asyncio.CancelledError):
+            pass  # client went away, or the server is shutting down
+        finally:
+            writer.close()
+
+
+async def serve(port: int, latency: float):
+    upstream = FakeOpenWeather(latency)
+    server = await asyncio.start_server(upstream.handle, "127.0.0.1", port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+def _run(port: int, latency: float):
+    asyncio.run(serve(port, latency))
+
+
+def start_in_process(port: int, latency: float) -> multiprocessing.Process:
+    """Run the fake API in a child process and wait until it accepts connections."""
+    import socket
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=_run, args=(port, latency), daemon=True
+    )
+    process.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"fake upstream did not start on port {port}")
+
+
+def upstream_env(port: int) -> dict:
+    """Environment variables pointing the app's Config at the fake API."""
+    base = f"http://127.0.0.1:{port}/data/2.5"
+    return {
+        "OPENWEATHER_API_KEY": "benchmark",
+        "OPENWEATHER_BASE_URL": f"{base}/weather",
+        "OPENWEATHER_FORECAST_URL": f"{base}/forecast",
+        "OPENWEATHER_AIR_POLLUTION_URL": f"{base}/air_pollution",
+        "WEATHER_GEOLOCATION_URL": f"http://127.0.0.1:{port}/json",
+        "WEATHER_SECONDARY_PROVIDER": "",  # no hedging to the real Open-Meteo
+    }
+
+
+def fetch_stats(port: int) -> dict:
+    """Upstream call counts so far."""
+    import urllib.request
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/__stats") as response:
+        return json.loads(response.read())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8701)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    args = parser.parse_args()
+    print(f"Fake OpenWeatherMap on http://127.0.0.1:{args.port}/data/2.5")
+    _run(args.port, args.latency_ms / 1000)
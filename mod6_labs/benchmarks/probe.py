@@ -0,0 +1,99 @@
+"""Offline helpers shared by the benchmark scripts.
+
+RenderProbePage stands in for ft.Page without a Flet client: it builds the
+same add/update commands Flet would send and counts their serialized size,
+so render cost can be measured without a browser or desktop window.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Benchmarks run from anywhere; the app modules live one level up
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from flet.core.protocol import CommandEncoder  # noqa: E402
+
+
+def load_fixture(name: str):
+    """Load a sample API payload from benchmarks/fixtures."""
+    with open(FIXTURES_DIR / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class _ProbeWindow:
+    width = None
+    height = None
+    resizable = True
+
+    def center(self):
+        pass
+
+
+class RenderProbePage:
+    """Minimal page that measures the update payload of every page.update()."""
+
+    def __init__(self, loop=None):
+        self.window = _ProbeWindow()
+        self.controls = []
+        self.overlay = []
+        self.width = 400
+        self.height = 750
+        self.session_id = "probe"
+        self.loop = loop
+        self.title = ""
+        self.theme_mode = None
+        self.theme = None
+        self.padding = None
+        self.on_resized = None
+        self.on_disconnect = None
+        self._index = {"page": self}
+        self._next_id = 0
+        self.updates = 0
+        self.payload_bytes = 0
+
+    def _assign_ids(self, added):
+        for control in added:
+            self._next_id += 1
+            uid = f"_{self._next_id}"
+            control._Control__uid = uid
+            self._index[uid] = control
+
+    def _send(self, commands):
+        self.updates += 1
+        self.payload_bytes += len(json.dumps(commands, cls=CommandEncoder))
+
+    def add(self, *controls):
+        commands, added = [], []
+        for control in controls:
+            commands.extend(
+                control._build_add_commands(index=self._index, added_controls=added)
+            )
+            self.controls.append(control)
+        self._assign_ids(added)
+        self._send(commands)
+
+    def update(self, *controls):
+        commands, added, removed = [], [], []
+        for control in controls or self.controls:
+            control.build_update_commands(self._index, commands, added, removed)
+        self._assign_ids(added)
+        self._send(commands)
+
+    def run_task(self, handler, *args, **kwargs):
+        return asyncio.ensure_future(handler(*args, **kwargs))
+
+    def open(self, control):
+        self.overlay.append(control)
+
+    def close(self, control):
+        pass
+
+    def reset_counters(self):
+        self.updates = 0
+        self.payload_bytes = 0
@@ -0,0 +1,131 @@
+"""Replay a recorded cassette through WeatherService and report latencies.
+
+Record a cassette by running the app with WEATHER_RECORD_CASSETTE set:
+
+    WEATHER_RECORD_CASSETTE=session.jsonl.gz python main.py
+
+This script then re-issues the recorded weather, forecast and location
+requests through WeatherService at their original times (divided by
+--speed), with every HTTP answer served from the cassette after its
+recorded latency. Run it on two commits to bisect a slowdown offline.
+
+Usage:
+    python benchmarks/replay_cassette.py CASSETTE [--speed 1] [--repeat 1]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# The app modules live one level up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cassette import ReplayTransport, load_cassette  # noqa: E402
+from config import Config  # noqa: E402
+from metrics import LatencyTracker  # noqa: E402
+from weather_cache import RateLimiter  # noqa: E402
+from weather_service import WeatherService, WeatherServiceError  # noqa: E402
+
+
+def classify(entry: dict):
+    """
+    Turn a recorded request back into a WeatherService call.
+
+    Returns:
+        (kind, coroutine function name, args), or None for requests the
+        service makes on its own (e.g. a hedge to the secondary provider)
+    """
+    parts = urlsplit(entry["url"])
+    query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+    base = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    units = query.get("units", Config.UNITS)
+    if parts.path.endswith("/forecast") and "q" in query:
+        return "forecast", base, ("get_forecast", query["q"], units)
+    if parts.path.endswith("/weather") and "q" in query:
+        return "weather", base, ("get_weather", query["q"], units)
+    if parts.path.endswith("/weather") and "lat" in query:
+        return "coordinates", base, (
+            "get_weather_by_coordinates", float(query["lat"]), float(query["lon"])
+        )
+    secondary = base.startswith((Config.OPEN_METEO_URL, Config.OPEN_METEO_GEOCODING_URL))
+    body = entry.get("json")
+    if not secondary and isinstance(body, dict) and "latitude" in body and "city" in body:
+        return "location", base, ("get_location",)
+    return None
+
+
+async def replay(entries: list, speed: float) -> dict:
+    calls = [(entry, classify(entry)) for entry in entries]
+    calls = [(entry, found) for entry, found in calls if found is not None]
+    # Point the service at the URLs the cassette was recorded against
+    for _, (kind, base, _) in calls:
+        if kind == "forecast":
+            Config.FORECAST_URL = base
+        elif kind in ("weather", "coordinates"):
+            Config.BASE_URL = base
+        elif kind == "location":
+            Config.GEOLOCATION_URL = base
+    # Keys were stripped when recording; any non-placeholder key will match
+    Config.API_KEY = "replay"
+
+    service = WeatherService(
+        rate_limiter=RateLimiter(rate=1e6, capacity=1e6),
+        transport=ReplayTransport(entries, speed),
+    )
+    latency = defaultdict(lambda: LatencyTracker(window=len(calls) or 1))
+    failures = defaultdict(int)
+    started = time.monotonic()
+
+    async def issue(entry, kind, method, args):
+        if speed > 0:
+            await asyncio.sleep(max(0.0, started + entry["at"] / speed - time.monotonic()))
+        sent = time.perf_counter()
+        try:
+            await getattr(service, method)(*args)
+        except WeatherServiceError:
+            failures[kind] += 1
+        latency[kind].record(time.perf_counter() - sent)
+
+    await asyncio.gather(*(
+        issue(entry, kind, call[0], call[1:]) for entry, (kind, _, call) in calls
+    ))
+    await service.aclose()
+    return {
+        "latency": latency,
+        "failures": failures,
+        "wall": time.monotonic() - started,
+        "stats": service.stats()["counters"],
+        "unmatched": service.transport.unmatched,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="time compression; 0 replays without any delays")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    entries = load_cassette(args.cassette)
+    print(f"{len(entries)} recorded exchanges, replay speed {args.speed:g}x")
+    for run in range(args.repeat):
+        r = asyncio.run(replay(entries, args.speed))
+        print(f"\nrun {run + 1}: {r['wall']:.2f}s wall, "
+              f"{r['stats'].get('upstream_calls', 0)} upstream calls, "
+              f"{r['unmatched']} unmatched requests")
+        print(f"{'kind':<13}{'calls':>7}{'failed':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+        for kind, tracker in sorted(r["latency"].items()):
+            print(
+                f"{kind:<13}{len(tracker):>7}{r['failures'][kind]:>8}"
+                f"{tracker.percentile(50) * 1000:>9.1f}{tracker.percentile(90) * 1000:>9.1f}"
+                f"{tracker.percentile(99) * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
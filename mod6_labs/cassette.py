@@ -0,0 +1,188 @@
+"""Record and replay the app's HTTP traffic at the transport level.
+
+RecordingTransport sits under WeatherService's httpx client and appends
+every exchange (weather, forecast, geolocation, Open-Meteo) to a cassette
+file: one compact JSON line per request with the URL, status, body, when
+it was sent and how long the answer took. API keys are stripped before
+anything is written.
+
+ReplayTransport serves a cassette back through the same client: each
+request gets the recorded answer for its URL after the recorded latency
+(divided by `speed`), so slowdowns can be reproduced and bisected offline.
+A cassette ending in ".gz" is gzip-compressed.
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+# Query parameters that must never reach a cassette file
+SECRET_PARAMS = {"appid", "apikey", "api_key", "key", "token"}
+
+# Response headers worth keeping; the body is stored already decoded
+KEPT_HEADERS = ("content-type",)
+
+
+def request_key(method: str, url: httpx.URL) -> Tuple[str, str]:
+    """
+    Match key for a request: method and URL without secrets.
+
+    Query parameters are sorted, so the order the client sends them in
+    does not matter.
+    """
+    params = sorted(
+        (name, value) for name, value in url.params.multi_items()
+        if name.lower() not in SECRET_PARAMS
+    )
+    base = str(url.copy_with(query=None))
+    return method.upper(), f"{base}?{urlencode(params)}" if params else base
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load_cassette(path) -> List[Dict]:
+    """Read a cassette's entries in recording order."""
+    with _open(Path(path), "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Passes requests through to a real transport and records each exchange.
+
+    Entries are appended as they complete, so a recording survives the app
+    being closed mid-session. Requests that were cancelled (e.g. the losing
+    side of a hedge) or failed without a response are not recorded.
+    """
+
+    def __init__(self, path, limits: Optional[httpx.Limits] = None):
+        self.path = Path(path)
+        self.limits = limits or httpx.Limits()
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+        self._transport_loop = None
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.recorded = 0
+
+    def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        """Real network transport, recreated if closed or the event loop changed."""
+        loop = asyncio.get_running_loop()
+        if self._transport is None or self._transport_loop is not loop:
+            self._transport = httpx.AsyncHTTPTransport(limits=self.limits)
+            self._transport_loop = loop
+        return self._transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        sent = time.monotonic()
+        response = await self._get_transport().handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.monotonic() - sent
+
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        self._write(request, response.status_code, headers, content, sent, elapsed)
+        # aread() decoded the body, so drop the original encoding headers
+        return httpx.Response(
+            response.status_code, headers=headers, content=content, request=request
+        )
+
+    def _write(self, request: httpx.Request, status: int, headers: Dict[str, str],
+               content: bytes, sent: float, elapsed: float):
+        method, url = request_key(request.method, request.url)
+        entry = {
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "at": round(sent - self._started, 4),
+            "elapsed": round(elapsed, 4),
+        }
+        try:
+            entry["json"] = json.loads(content)
+        except ValueError:
+            entry["body"] = content.decode("utf-8", errors="replace")
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            with _open(self.path, "a") as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+    async def aclose(self):
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Answers requests from a cassette instead of the network.
+
+    Requests are matched on method and URL (secrets ignored). Repeated
+    requests for the same URL get that URL's recordings in order, starting
+    over when they run out, so a replay is deterministic. Each answer is
+    delayed by its recorded latency divided by `speed` (0 = no delay); if
+    that is longer than the request's timeout, it times out just as the
+    real request would have. A request with no recording fails with a
+    connection error.
+    """
+
+    def __init__(self, entries: List[Dict], speed: float = 1.0):
+        self.speed = speed
+        self._recordings: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        for entry in entries:
+            self._recordings[(entry["method"], entry["url"])].append(entry)
+        self._next: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.replayed = 0
+        self.unmatched = 0
+
+    @classmethod
+    def from_file(cls, path, speed: float = 1.0) -> "ReplayTransport":
+        return cls(load_cassette(path), speed)
+
+    def _take(self, key: Tuple[str, str]) -> Optional[Dict]:
+        recordings = self._recordings.get(key)
+        if not recordings:
+            return None
+        index = self._next[key]
+        self._next[key] = index + 1
+        return recordings[index % len(recordings)]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._take(request_key(request.method, request.url))
+        if entry is None:
+            self.unmatched += 1
+            raise httpx.ConnectError(
+                f"No recorded response for {request.method} {request.url.copy_with(query=None)}",
+                request=request,
+            )
+
+        delay = entry["elapsed"] / self.speed if self.speed > 0 else 0.0
+        timeout = request.extensions.get("timeout", {}).get("read")
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise httpx.ReadTimeout("Replayed response took longer than the timeout",
+                                    request=request)
+        await asyncio.sleep(delay)
+        self.replayed += 1
+
+        if "json" in entry:
+            content = json.dumps(entry["json"]).encode("utf-8")
+        else:
+            content = entry.get("body", "").encode("utf-8")
+        return httpx.Response(
+            entry["status"], headers=entry.get("headers", {}), content=content, request=request
+        )
@@ -0,0 +1,159 @@
+"""Offline nearest-city lookup over a bundled city dataset.
+
+IP geolocation returns slightly different coordinates from one lookup to
+the next, so caching weather on raw lat/lon almost never hits. Snapping
+the coordinates to the nearest known city gives a stable cache key and a
+display name that do not depend on the geolocation service.
+
+The dataset (data/cities.tsv.gz) lists cities with 50000+ inhabitants
+from GeoNames (CC BY 4.0), one "name, country, lat, lon, population" row
+per line. Cities are indexed in a k-d tree over points on the unit
+sphere, so distances are correct across the date line and near the
+poles, and a lookup visits a few dozen nodes instead of every city.
+"""
+
+import gzip
+import math
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+Vector = Tuple[float, float, float]
+# (point, city position, split axis, left subtree, right subtree)
+Node = Tuple[Vector, int, int, Optional[tuple], Optional[tuple]]
+
+
+class City(NamedTuple):
+    """One city of the dataset."""
+    name: str
+    country: str  # ISO 3166 alpha-2 code
+    lat: float
+    lon: float
+    population: int
+
+    @property
+    def key(self) -> str:
+        """Stable identifier, e.g. "London,GB" (names repeat across countries)."""
+        return f"{self.name},{self.country}"
+
+
+class NearestCity(NamedTuple):
+    """Result of a nearest-city lookup."""
+    city: City
+    distance_km: float
+
+
+def _unit_vector(lat: float, lon: float) -> Vector:
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_to_km(chord: float) -> float:
+    return EARTH_RADIUS_KM * 2 * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km: float) -> float:
+    return 2 * math.sin(min(math.pi / 2, km / EARTH_RADIUS_KM / 2))
+
+
+def read_cities(path) -> List[City]:
+    """Read a (optionally gzipped) tab-separated city file; '#' lines are comments."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    cities = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            name, country, lat, lon, population = line.rstrip("\n").split("\t")
+            cities.append(City(name, country, float(lat), float(lon), int(population)))
+    return cities
+
+
+class CityIndex:
+    """
+    k-d tree of cities for nearest-neighbour queries.
+
+    Building the tree for ~12000 cities takes a fraction of a second; a
+    query takes tens of microseconds.
+    """
+
+    def __init__(self, cities: Iterable[City]):
+        self.cities: List[City] = list(cities)
+        points = [(_unit_vector(city.lat, city.lon), i) for i, city in enumerate(self.cities)]
+        self._root = self._build(points, 0)
+
+    def __len__(self) -> int:
+        return len(self.cities)
+
+    @classmethod
+    def load(cls, path) -> "CityIndex":
+        """Index of the cities in a dataset file (see read_cities())."""
+        return cls(read_cities(path))
+
+    def _build(self, points: Sequence[Tuple[Vector, int]], depth: int) -> Optional[Node]:
+        if not points:
+            return None
+        axis = depth % 3
+        points = sorted(points, key=lambda p: p[0][axis])
+        middle = len(points) // 2
+        point, index = points[middle]
+        return (
+            point, index, axis,
+            self._build(points[:middle], depth + 1),
+            self._build(points[middle + 1:], depth + 1),
+        )
+
+    def nearest(self, lat: float, lon: float,
+                max_km: Optional[float] = None) -> Optional[NearestCity]:
+        """
+        The city closest to a point.
+
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            max_km: Ignore cities farther away than this
+
+        Returns:
+            The nearest city and its great-circle distance, or None if no
+            city is within `max_km`
+        """
+        target = _unit_vector(lat, lon)
+        # Squared chord length of the best match so far (or of the limit)
+        best_d2 = _km_to_chord(max_km) ** 2 if max_km is not None else math.inf
+        best_index = -1
+        # (subtree, squared distance from the target to its region's split plane)
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, plane_d2 = stack.pop()
+            # A subtree can only hold a closer city if its split plane is closer
+            if node is None or plane_d2 >= best_d2:
+                continue
+            point, index, axis, left, right = node
+            dx, dy, dz = point[0] - target[0], point[1] - target[1], point[2] - target[2]
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 < best_d2:
+                best_d2, best_index = d2, index
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, diff * diff))
+            stack.append((near, plane_d2))
+        if best_index < 0:
+            return None
+        return NearestCity(self.cities[best_index], _chord_to_km(math.sqrt(best_d2)))
+
+
+_loaded: Dict[Path, CityIndex] = {}
+_loaded_lock = threading.Lock()
+
+
+def shared_index(path) -> CityIndex:
+    """The process-wide index of a dataset file, loaded on first use."""
+    path = Path(path).resolve()
+    with _loaded_lock:
+        index = _loaded.get(path)
+        if index is None:
+            index = _loaded[path] = CityIndex.load(path)
+        return index
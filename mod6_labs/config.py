@@ -17,15 +17,112 @@ class Config:
         "OPENWEATHER_BASE_URL", 
         "https://api.openweathermap.org/data/2.5/weather"
     )
+    FORECAST_URL = os.getenv(
+        "OPENWEATHER_FORECAST_URL",
+        "https://api.openweathermap.org/data/2.5/forecast"
+    )
+    AIR_POLLUTION_URL = os.getenv(
+        "OPENWEATHER_AIR_POLLUTION_URL",
+        "https://api.openweathermap.org/data/2.5/air_pollution"
+    )
     
     # App Configuration
     APP_TITLE = "Weather App"
     APP_WIDTH = 400
     APP_HEIGHT = 600
+    HISTORY_DROPDOWN_SIZE = 10  # cities shown in "Recent Searches"
+    WATCHLIST_PAGE_SIZE = 8  # watchlist cards shown (and fetched) at a time
+    WATCHLIST_PREFETCH = 4  # cities after the visible page fetched ahead
+    TYPEAHEAD_DEBOUNCE = 0.3  # seconds of no typing before suggestions and prefetch
+    TYPEAHEAD_MIN_CHARS = 2
+    TYPEAHEAD_SUGGESTIONS = 5
+    # Idle prefetch: after IDLE_PREFETCH_DELAY seconds without interaction, the
+    # weather and forecast of the likeliest next cities are fetched (0 turns it off)
+    IDLE_PREFETCH_CITIES = int(os.getenv("WEATHER_IDLE_PREFETCH_CITIES", "5"))
+    IDLE_PREFETCH_DELAY = 5  # seconds
+    IDLE_PREFETCH_ROUNDS = 3  # rounds per idle period, one per CACHE_TTL
+    # Kiosk mode (--kiosk): rotate through the watchlist on a wall display
+    KIOSK = os.getenv("WEATHER_KIOSK", "0") == "1"
+    KIOSK_INTERVAL = float(os.getenv("WEATHER_KIOSK_INTERVAL", "30"))  # seconds per city
+    CHART_POINT_SPACING = 6  # min pixels between hourly chart points (LTTB target)
+    CHART_BAR_SPACING = 10  # min pixels per precipitation bar
+    # Seconds between background alert checks of the watchlist (0 turns it off)
+    ALERT_MONITOR_INTERVAL = int(os.getenv("WEATHER_ALERT_MONITOR_INTERVAL", "300"))
+    ALERT_MONITOR_CONCURRENCY = 4  # watchlist requests in flight per tick
+    ALERT_MONITOR_RESERVE_TOKENS = 5  # tokens the monitor must leave for searches
+    # "Above normal for this hour" alerts, from per-city hour-of-day baselines
+    ANOMALY_Z = 2.0  # standard deviations from the hour's mean
+    ANOMALY_MIN_SAMPLES = 10  # samples an hour needs before it has a normal
+    BASELINE_WINDOW = 60  # samples per hour of day; older ones fade out beyond that
+    # Event-loop watchdog (loop_watchdog.py): prints the stack of handlers
+    # that block the loop for longer than LOOP_STALL_THRESHOLD seconds
+    LOOP_WATCHDOG = os.getenv("WEATHER_LOOP_WATCHDOG", "0") == "1"
+    LOOP_STALL_THRESHOLD = 0.1
     
     # API Settings
     UNITS = "metric"  # metric, imperial, or standard
-    TIMEOUT = 10  # seconds
+    TIMEOUT = 10  # seconds, per request (the most an adaptive timeout can grow to)
+    # Adaptive timeouts (adaptive_timeouts.py): p99 latency of the endpoint
+    # times TIMEOUT_FACTOR, clamped to [TIMEOUT_MIN, TIMEOUT]
+    ADAPTIVE_TIMEOUTS = os.getenv("WEATHER_ADAPTIVE_TIMEOUTS", "1") != "0"
+    TIMEOUT_PERCENTILE = 99
+    TIMEOUT_FACTOR = 3.0
+    TIMEOUT_MIN = 2.0  # seconds, floor of the read timeout
+    CONNECT_TIMEOUT_MIN = 1.0  # seconds, floor of the connect timeout
+    TIMEOUT_MIN_SAMPLES = 20  # calls per endpoint before its timeout adapts
+    TIMEOUT_WINDOW = 200  # recent calls per endpoint the percentile is taken over
+    ACTION_DEADLINE = 12  # seconds for everything one click does (all requests)
+    GEOLOCATION_URL = os.getenv("WEATHER_GEOLOCATION_URL", "https://ipapi.co/json/")
+    # Offline nearest-city lookup for location weather (city_index.py)
+    CITY_DATASET = Path(__file__).parent / "data" / "cities.tsv.gz"
+    NEAREST_CITY_MAX_KM = 30  # farther from every known city: use the raw coordinates
+    MAX_CONNECTIONS = 20  # pooled HTTP connections shared by all sessions
+    
+    # Cache and API budget (shared by every session in the process)
+    CACHE_TTL = 600  # seconds; OpenWeatherMap updates about every 10 minutes
+    FORECAST_CACHE_TTL = 1800  # seconds
+    AIR_QUALITY_CACHE_TTL = 1800  # seconds, also used for the UV index
+    COORDINATES_CACHE_TTL = 7 * 24 * 3600  # city -> lat/lon, for air quality and UV
+    CACHE_MAX_ENTRIES = 1000
+    RATE_LIMIT_PER_MINUTE = int(os.getenv("WEATHER_RATE_LIMIT_PER_MINUTE", "60"))  # free tier
+    RATE_LIMIT_BURST = 10
+    PREFETCH_RESERVE_TOKENS = 3  # tokens type-ahead prefetches must leave for real searches
+    IDLE_PREFETCH_RESERVE_TOKENS = 5  # tokens idle prefetches must leave
+    
+    # Multi-worker web mode: when set, cache and rate limit live in this
+    # SQLite file and are shared by every worker process
+    SHARED_CACHE_PATH = os.getenv("WEATHER_SHARED_CACHE", "")
+    # Single-process mode: cached payloads are also kept, compressed, in this
+    # SQLite file so they survive a restart ("" keeps them in memory only)
+    PAYLOAD_CACHE_PATH = os.getenv("WEATHER_PAYLOAD_CACHE", "weather_app_data/payload_cache.db")
+    WEB_PORT = int(os.getenv("WEATHER_WEB_PORT", "8550"))
+    
+    # Weather proxy for other tools (weather_proxy.py)
+    PROXY_PORT = int(os.getenv("WEATHER_PROXY_PORT", "8600"))
+    PROXY_BATCH_MAX = 50  # cities per /batch request
+    
+    # Hedged requests: if OpenWeatherMap has not answered within its recent
+    # p90 latency, the secondary provider is asked too. Off by default, as it
+    # sends searched cities to a second service; "open-meteo" turns it on
+    SECONDARY_PROVIDER = os.getenv("WEATHER_SECONDARY_PROVIDER", "")
+    # UV index source, independent of hedging; it only receives coordinates
+    # (OpenWeatherMap's free tier has no UV). "" hides the UV card
+    UV_PROVIDER = os.getenv("WEATHER_UV_PROVIDER", "open-meteo")
+    OPEN_METEO_URL = os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+    OPEN_METEO_GEOCODING_URL = os.getenv(
+        "OPEN_METEO_GEOCODING_URL",
+        "https://geocoding-api.open-meteo.com/v1/search"
+    )
+    HEDGE_PERCENTILE = 90
+    HEDGE_MIN_SAMPLES = 20  # primary latencies needed before using the percentile
+    HEDGE_INITIAL_DELAY = 1.0  # seconds, until then
+    HEDGE_MIN_DELAY = 0.05  # seconds
+    
+    # Cassettes (cassette.py): record all HTTP traffic to a file, or answer
+    # every request from one instead of the network
+    RECORD_CASSETTE = os.getenv("WEATHER_RECORD_CASSETTE", "")
+    REPLAY_CASSETTE = os.getenv("WEATHER_REPLAY_CASSETTE", "")
+    REPLAY_SPEED = float(os.getenv("WEATHER_REPLAY_SPEED", "1"))  # 0 = no delays
     
     @classmethod
     def validate(cls):
@@ -0,0 +1,128 @@
+"""Per-action time budgets that flow through the service layer.
+
+A handler opens `async with deadline(seconds):` around everything one user
+action does. The deadline travels in a context variable, so WeatherService
+and the providers can give each HTTP request only the time that is left
+(`time_left()`), and when the budget runs out the action is cancelled and
+DeadlineExceeded is raised in the handler.
+"""
+
+import asyncio
+import contextvars
+import time
+from typing import Optional
+
+from errors import WeatherServiceError
+
+
+class DeadlineExceeded(WeatherServiceError):
+    """Raised when an action runs out of its time budget."""
+    pass
+
+
+class Deadline:
+    """An absolute point in (monotonic) time by which an action must finish."""
+
+    __slots__ = ("budget", "expires_at")
+
+    def __init__(self, budget: float, expires_at: Optional[float] = None):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget if expires_at is None else expires_at
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def error(self) -> DeadlineExceeded:
+        return DeadlineExceeded(
+            f"⏱️ This took longer than {self.budget:g} seconds. Please try again."
+        )
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("weather_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the running action, or None outside any action."""
+    return _current.get()
+
+
+def time_left(cap: float) -> float:
+    """
+    Timeout for one sub-call.
+
+    Args:
+        cap: The sub-call's own timeout
+
+    Returns:
+        `cap`, or the time left on the current deadline if that is shorter
+
+    Raises:
+        DeadlineExceeded: If the current deadline has already passed
+    """
+    current = _current.get()
+    if current is None:
+        return cap
+    if current.expired:
+        raise current.error()
+    return min(cap, current.remaining())
+
+
+def detach():
+    """
+    Run the rest of the current task without a deadline.
+
+    For shared work (a fetch other sessions may join) started from inside
+    an action: it should not inherit one caller's budget. Tasks copy the
+    context when created, so this does not affect the caller.
+    """
+    _current.set(None)
+
+
+class deadline:
+    """
+    Async context manager giving the enclosed code a time budget.
+
+    Nested deadlines can only shorten the outer one. When the budget runs
+    out the task is cancelled and DeadlineExceeded is raised on exit;
+    shared work started inside (e.g. a fetch other sessions are waiting
+    for) is shielded and keeps running.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._token = None
+        self._handle = None
+        self._task = None
+        self._fired = False
+
+    async def __aenter__(self) -> Deadline:
+        new = Deadline(self.seconds)
+        outer = _current.get()
+        if outer is not None and outer.expires_at <= new.expires_at:
+            new = outer
+        self.deadline = new
+        self._token = _current.set(new)
+        self._task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        # loop.time() and time.monotonic() are the same clock
+        self._handle = loop.call_at(new.expires_at, self._expire)
+        return new
+
+    def _expire(self):
+        self._fired = True
+        self._task.cancel()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._handle.cancel()
+        _current.reset(self._token)
+        if self._fired and exc_type is asyncio.CancelledError:
+            uncancel = getattr(self._task, "uncancel", None)  # Python 3.11+
+            if uncancel is not None:
+                uncancel()
+            raise self.deadline.error() from None
+        return False
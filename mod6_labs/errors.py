@@ -0,0 +1,15 @@
+"""Exceptions shared by the weather service modules."""
+
+
+class WeatherServiceError(Exception):
+    """Custom exception for weather service errors."""
+    pass
+
+
+class ClientRequestError(WeatherServiceError):
+    """
+    The provider rejected the request itself (4xx other than 429): an
+    unknown city or an invalid API key. Asking another provider would
+    only hide the problem, so these are never hedged.
+    """
+    pass
@@ -0,0 +1,195 @@
+"""Hourly forecast chart data: interpolation, LTTB downsampling and caching.
+
+The /forecast response has 40 three-hour slots. The chart spreads them
+over every hour (temperature interpolated, precipitation split evenly),
+then reduces the series to what the chart's pixel width can show:
+temperature with Largest-Triangle-Three-Buckets, which keeps peaks and
+troughs where plain decimation would cut them off, and precipitation by
+summing into equal-time bars, so totals are preserved.
+
+The result is plain data (no Flet controls), so one ChartCache can serve
+every session in the process.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from config import Config
+from metrics import Metrics
+from search_history import canonical_city_key
+from weather_cache import TTLCache
+
+Point = Tuple[float, float]
+
+# Keys of a forecast slot holding precipitation, each as {"3h": mm}
+PRECIPITATION_KEYS = ("rain", "snow")
+
+
+class ChartData(NamedTuple):
+    """Downsampled series ready to be turned into chart controls."""
+    temps: List[Point]  # (unix seconds, temperature)
+    precipitation: List[Point]  # (bar start, mm during the bar)
+    bar_seconds: float
+    min_temp: float
+    max_temp: float
+    max_precipitation: float
+    day_labels: List[Tuple[float, str]]  # (local midnight, weekday name)
+
+
+def day_labels(start: float, end: float, utc_offset: int) -> List[Tuple[float, str]]:
+    """Local midnights between start and end, with short weekday names."""
+    zone = timezone(timedelta(seconds=utc_offset))
+    day = datetime.fromtimestamp(start, zone).replace(hour=0, minute=0, second=0)
+    labels = []
+    while True:
+        day += timedelta(days=1)
+        ts = day.timestamp()
+        if ts >= end:
+            return labels
+        labels.append((ts, day.strftime("%a")))
+
+
+def hourly_series(forecast_list: Sequence[Dict]) -> Tuple[List[Point], List[Point]]:
+    """
+    Spread 3-hour forecast slots over single hours.
+
+    Returns:
+        (hourly temperatures, hourly precipitation in mm)
+    """
+    slots = [
+        (item["dt"], item.get("main", {}).get("temp"), item)
+        for item in forecast_list if "dt" in item
+    ]
+    slots = [(ts, temp, item) for ts, temp, item in slots if temp is not None]
+    temps: List[Point] = []
+    precipitation: List[Point] = []
+    for i, (ts, temp, item) in enumerate(slots):
+        mm = sum(item.get(key, {}).get("3h", 0) for key in PRECIPITATION_KEYS)
+        if i + 1 < len(slots):
+            next_ts, next_temp, _ = slots[i + 1]
+            hours = max(1, round((next_ts - ts) / 3600))
+        else:
+            next_temp, hours = temp, 3
+        for h in range(hours):
+            share = h / hours
+            temps.append((ts + h * 3600, temp + (next_temp - temp) * share))
+            precipitation.append((ts + h * 3600, mm / hours))
+    if slots:
+        # Close the last slot so the line covers its whole period
+        temps.append((slots[-1][0] + 3 * 3600, slots[-1][1]))
+    return temps, precipitation
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, from each of `threshold - 2` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket.
+
+    Args:
+        points: (x, y) pairs sorted by x
+        threshold: Number of points to keep
+
+    Returns:
+        `threshold` points, or all of them if there are not more than that
+        (or `threshold` is below 3)
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (count - 2) / (threshold - 2)
+    kept = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        avg_x = sum(p[0] for p in points[next_start:next_end]) / span
+        avg_y = sum(p[1] for p in points[next_start:next_end]) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = points[kept]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        kept = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def bucket_totals(points: Sequence[Point], buckets: int) -> Tuple[List[Point], float]:
+    """
+    Sum evenly spaced (x, value) points into at most `buckets` bars.
+
+    Returns:
+        ([(bar start, total)], bar width in x units)
+    """
+    if not points:
+        return [], 0.0
+    step = points[1][0] - points[0][0] if len(points) > 1 else 3600
+    per_bar = max(1, -(-len(points) // max(1, buckets)))  # ceiling division
+    bars = [
+        (points[i][0], sum(value for _, value in points[i:i + per_bar]))
+        for i in range(0, len(points), per_bar)
+    ]
+    return bars, step * per_bar
+
+
+def build_chart_data(forecast: Dict, width: int) -> ChartData:
+    """Downsample a forecast to fit a chart `width` pixels wide."""
+    temps, precipitation = hourly_series(forecast.get("list", []))
+    temps = lttb(temps, max(3, width // Config.CHART_POINT_SPACING))
+    bars, bar_seconds = bucket_totals(precipitation, max(1, width // Config.CHART_BAR_SPACING))
+    values = [temp for _, temp in temps] or [0.0]
+    labels = day_labels(
+        temps[0][0], temps[-1][0], forecast.get("city", {}).get("timezone", 0)
+    ) if temps else []
+    return ChartData(
+        temps=temps,
+        precipitation=bars,
+        bar_seconds=bar_seconds,
+        min_temp=min(values),
+        max_temp=max(values),
+        max_precipitation=max((mm for _, mm in bars), default=0.0),
+        day_labels=labels,
+    )
+
+
+class ChartCache:
+    """
+    Chart data per (city, units, width), shared by all sessions.
+
+    The key also includes the forecast's first timestamp, so a refreshed
+    forecast is drawn from scratch instead of showing the old chart.
+    """
+
+    def __init__(self, ttl: float = None, max_entries: int = None,
+                 metrics: Optional[Metrics] = None):
+        self._cache = TTLCache(
+            ttl or Config.FORECAST_CACHE_TTL, max_entries or Config.CACHE_MAX_ENTRIES
+        )
+        self.metrics = metrics if metrics is not None else Metrics()
+
+    def get(self, city: str, units: str, width: int, forecast: Dict) -> ChartData:
+        """Chart data for a forecast, computed on the first request only."""
+        first_slot = (forecast.get("list") or [{}])[0]
+        key = (canonical_city_key(city), units, int(width), first_slot.get("dt"))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.metrics.incr("chart_cache_hits")
+            return cached[0]
+        self.metrics.incr("chart_cache_misses")
+        data = build_chart_data(forecast, int(width))
+        self._cache.set(key, data)
+        return data
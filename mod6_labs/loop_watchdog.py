@@ -0,0 +1,146 @@
+"""Event-loop lag watchdog.
+
+A handler that blocks the event loop (a synchronous file write, a database
+call, a flood of prints) freezes every other task and the UI with it.
+LoopWatchdog.run() is a task that wakes every `interval` seconds and
+records how late it was woken: its scheduling lag. Lags above `threshold`
+are stalls, counted in a histogram for the session.
+
+A task cannot see what blocks the loop while it is blocked, so run() also
+starts a helper thread. When the task has not been woken for `threshold`
+seconds past its interval, the thread prints the event loop thread's
+current stack: the handler or coroutine that is blocking it, caught in the
+act.
+
+The module has no app dependencies, so other Flet apps can copy it as is.
+week3_labs/src/loop_watchdog.py is such a copy: every lab is a separate
+Flet project, and `flet build` packages only its own src directory, so
+the labs cannot import from a shared location. Keep the copies identical.
+
+Usage (in a Flet app):
+    watchdog = LoopWatchdog(threshold=0.1)
+    task = page.run_task(watchdog.run)
+    ...
+    # when the session ends (page.on_close / page.on_disconnect)
+    task.cancel()
+    watchdog.stop()
+    print(watchdog.snapshot())
+"""
+
+import asyncio
+import bisect
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Optional
+
+# Upper bounds (ms) of the stall histogram buckets; one more bucket above the last
+STALL_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000)
+
+# Innermost frames of the blocked loop thread shown in a stall report
+STACK_LIMIT = 12
+
+# Frames of the event loop itself, left out of stall reports
+ASYNCIO_DIR = str(Path(asyncio.__file__).parent)
+
+
+def blocking_stack(frame) -> str:
+    """The stack above the event loop's own frames: the code that blocks it."""
+    stack = traceback.extract_stack(frame, limit=STACK_LIMIT)
+    loop_frames = [i for i, entry in enumerate(stack) if entry.filename.startswith(ASYNCIO_DIR)]
+    if loop_frames:
+        stack = stack[loop_frames[-1] + 1:]
+    return "".join(traceback.format_list(stack))
+
+
+class LoopWatchdog:
+    """Measures event-loop scheduling lag and reports what blocks the loop."""
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05):
+        """
+        Args:
+            threshold: Lag in seconds that counts as a stall
+            interval: Seconds between the watchdog task's wake-ups
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = 0
+        self.stalled_seconds = 0.0
+        self.max_lag = 0.0
+        self.histogram = [0] * (len(STALL_BUCKETS_MS) + 1)
+        self.last_stack: Optional[str] = None
+        self._lock = threading.Lock()
+        self._beat = 0.0  # when the task was last woken (perf_counter)
+        self._reported = 0.0  # beat whose stall already had its stack printed
+        self._loop_thread: Optional[int] = None
+        self._stopped = threading.Event()
+
+    async def run(self):
+        """Measure loop lag until cancelled, with the stack-reporting thread."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        # One event per run, so a restart never revives the previous thread
+        stopped = self._stopped = threading.Event()
+        threading.Thread(
+            target=self._watch, args=(stopped,), name="loop-watchdog", daemon=True
+        ).start()
+        try:
+            while True:
+                woken = self._beat
+                await asyncio.sleep(self.interval)
+                self._beat = time.perf_counter()
+                self._record(self._beat - woken - self.interval)
+        finally:
+            stopped.set()
+
+    def stop(self):
+        """
+        Stop the helper thread.
+
+        Cancelling the run() task stops it too, once the task gets to run
+        again; call this as well when the session ends so the thread does
+        not outlive it.
+        """
+        self._stopped.set()
+
+    def _record(self, lag: float):
+        with self._lock:
+            self.max_lag = max(self.max_lag, lag)
+            if lag < self.threshold:
+                return
+            self.stalls += 1
+            self.stalled_seconds += lag
+            self.histogram[bisect.bisect_left(STALL_BUCKETS_MS, lag * 1000)] += 1
+        print(f"🐢 Event loop stalled for {lag * 1000:.0f} ms")
+
+    def _watch(self, stopped: threading.Event):
+        """Helper thread: print the loop thread's stack while it is blocked."""
+        while not stopped.wait(self.interval):
+            beat = self._beat
+            late = time.perf_counter() - beat - self.interval
+            if late < self.threshold or beat == self._reported:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._reported = beat
+            stack = blocking_stack(frame)
+            del frame
+            with self._lock:
+                self.last_stack = stack
+            print(f"🐢 Event loop blocked for {late * 1000:.0f} ms so far, in:\n{stack}")
+
+    def snapshot(self) -> Dict:
+        """Stall count, worst lag and histogram, safe to serialize."""
+        labels = [f"<={bound}ms" for bound in STALL_BUCKETS_MS]
+        labels.append(f">{STALL_BUCKETS_MS[-1]}ms")
+        with self._lock:
+            return {
+                "stalls": self.stalls,
+                "stalled_ms": round(self.stalled_seconds * 1000, 1),
+                "max_lag_ms": round(self.max_lag * 1000, 1),
+                "threshold_ms": self.threshold * 1000,
+                "histogram": dict(zip(labels, self.histogram)),
+            }
@@ -2,12 +2,22 @@
 
 import flet as ft
 import asyncio
-import httpx
 import json
+import os
+import tempfile
 import time
 from pathlib import Path
 from datetime import datetime
-from weather_service import WeatherService, WeatherServiceError
+from weather_service import WeatherServiceError
+from deadline import DeadlineExceeded, deadline
+from service_registry import registry
+from search_history import SearchHistory, canonical_city_key
+from metrics import Metrics
+from update_scheduler import UpdateScheduler
+from view_tasks import ViewTasks
+from watchlist_index import WatchlistIndex, WatchlistSnapshot
+from alert_monitor import AlertMonitor
+from loop_watchdog import LoopWatchdog
 from config import Config
 
 
@@ -81,9 +91,39 @@ class WeatherApp:
         }
     }
     
+    # Characters used to draw text sparklines, lowest to highest
+    SPARKLINE_CHARS = "▁▂▃▄▅▆▇█"
+    
+    # Alert severity styling (Feature 6)
+    SEVERITY_COLORS = {
+        "high": ft.Colors.RED_100,
+        "medium": ft.Colors.ORANGE_100,
+        "low": ft.Colors.YELLOW_100
+    }
+    SEVERITY_BADGE_COLORS = {
+        "high": ft.Colors.RED_700,
+        "medium": ft.Colors.ORANGE_700,
+        "low": ft.Colors.AMBER_700
+    }
+    SEVERITY_TEXT = {
+        "high": "⚠️ HIGH",
+        "medium": "⚠️ MEDIUM",
+        "low": "ℹ️ LOW"
+    }
+    
+    # "Unusual for this hour" alerts per checked observation field
+    ANOMALY_ALERTS = {
+        "temp": (ft.Icons.THERMOSTAT, "🌡️ Unusual Temperature"),
+        "humidity": (ft.Icons.WATER_DROP, "💧 Unusual Humidity"),
+        "wind_speed": (ft.Icons.AIR, "💨 Unusual Wind"),
+    }
+    
     def __init__(self, page: ft.Page):
         self.page = page
-        self.weather_service = WeatherService()
+        # Shared by every session in the process (pool, cache, rate limiter);
+        # everything else on this object is per-session state
+        self.weather_service = registry.weather_service()
+        self.session_id = page.session_id
         
         # Persistent storage setup
         self.data_dir = Path("weather_app_data")
@@ -94,19 +134,87 @@ class WeatherApp:
         
         # Load persistent data
         self.search_history = self.load_history()
+        self.history_dirty = False
+        self.history_saving = False
         self.settings = self.load_settings()
         self.watchlist = self.load_watchlist()
+        self.watchlist_index = WatchlistIndex(self.watchlist)
+        self.watchlist_page = 0
+        self.observations = registry.observation_store(self.data_dir / "observations.db")
+        self.chart_cache = registry.chart_cache()
         
         # Current app state
         self.current_weather_condition = "Clear"
         self.current_city = ""
         self.current_unit = self.settings.get("unit", "metric")
         self.current_weather_data = None
+        self.current_forecast_data = None
+        # Anomalies of the shown weather, and the last found per (city, observation time)
+        self.current_anomalies = []
+        self.recent_anomalies = {}
+        self.rendered_chart = None
+        # Content fingerprints of what the weather, forecast and watchlist panels show
+        self.rendered_weather = None
+        self.rendered_forecast = None
+        self.rendered_watchlist_chrome = None
+        self.metrics = Metrics()
+        
+        # All page updates go through the scheduler (one flush per frame)
+        self.update_scheduler = UpdateScheduler(page, self.metrics)
+        # Every interaction stops the idle prefetch and restarts its wait
+        self.update_scheduler.on_interaction = lambda name: self.start_idle_prefetch()
+        # One in-flight task per view; a newer search cancels the older one
+        self.view_tasks = ViewTasks(page, self.metrics)
+        # Alert state of watchlist cities, re-evaluated when their weather changes
+        self.alert_monitor = AlertMonitor(
+            lambda *inputs: self.create_weather_alerts(*inputs)[0], self.metrics
+        )
+        # Reused for every alert notice; a new snack bar each time would pile up
+        self.alert_snackbar = None
+        # Optional: reports handlers that block the event loop (WEATHER_LOOP_WATCHDOG=1)
+        self.loop_watchdog = (
+            LoopWatchdog(Config.LOOP_STALL_THRESHOLD) if Config.LOOP_WATCHDOG else None
+        )
+        
+        # False once the browser tab disconnects or the session closes;
+        # background work only runs while the session is live
+        self.session_live = True
         
         self.setup_page()
         self.build_ui()
         # Initialize UI components
         self.update_history_dropdown()
+        self.start_background_tasks()
+    
+    def start_background_tasks(self):
+        """Start the session's background work: alert monitor, watchdog, kiosk or idle prefetch."""
+        if self.watchlist:
+            self.start_alert_monitor()
+        if self.loop_watchdog:
+            self.view_tasks.start("loop_watchdog", self.loop_watchdog.run)
+        if Config.KIOSK:
+            self.view_tasks.start("kiosk", self.run_kiosk)
+        else:
+            self.start_idle_prefetch()
+    
+    def on_disconnect(self, e):
+        """Stop all background work while the browser tab is away (web mode)."""
+        self.session_live = False
+        self.view_tasks.cancel_all()
+        if self.loop_watchdog:
+            self.loop_watchdog.stop()
+            print(f"🐢 Event loop stalls this session: {self.loop_watchdog.snapshot()}")
+    
+    def on_connect(self, e):
+        """The tab reconnected to its session: resume background work."""
+        if not self.session_live:
+            self.session_live = True
+            self.start_background_tasks()
+    
+    def on_close(self, e):
+        """The session ended for good: cancel everything it started."""
+        self.on_disconnect(e)
+        self.page.on_connect = None
     
     def setup_page(self):
         """Configure page settings."""
@@ -120,26 +228,60 @@ class WeatherApp:
         self.page.window.height = 750
         self.page.window.resizable = False
         self.page.window.center()
+        self.page.on_resized = self.on_page_resized
+        # Every session's tasks (alert monitor, watchdog, prefetch) end with it
+        self.page.on_disconnect = self.on_disconnect
+        self.page.on_connect = self.on_connect
+        self.page.on_close = self.on_close
     
     def load_history(self):
         """Load search history from file. (Feature 1 - Enhanced)"""
         try:
             if self.history_file.exists():
                 with open(self.history_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Ensure we have a list and limit to 10 items
-                    return data[:10] if isinstance(data, list) else []
+                    # Accepts both the indexed format and the old list of names
+                    return SearchHistory.from_list(json.load(f))
         except Exception as e:
             print(f"Error loading history: {e}")
-        return []
+        return SearchHistory()
     
     def save_history(self):
-        """Save search history to file. (Feature 1 - Enhanced)"""
+        """Save search history to file, off the event loop. (Feature 1 - Enhanced)
+        
+        Lookups made while a write is in flight are picked up by one more
+        write when it finishes, so a burst of searches costs at most two.
+        """
+        self.history_dirty = True
+        if not self.history_saving:
+            self.history_saving = True
+            self.page.run_task(self.write_history)
+    
+    async def write_history(self):
+        """Write the history file until no lookup is left unsaved."""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.search_history, f, ensure_ascii=False, indent=2)
+            while self.history_dirty:
+                self.history_dirty = False
+                # Serializing tens of thousands of entries takes a while, so
+                # only the snapshot is taken here; a lookup landing during the
+                # write sets history_dirty again and is saved on the next pass
+                entries = self.search_history.entries()
+                await asyncio.to_thread(self.write_history_file, entries)
         except Exception as e:
             print(f"Error saving history: {e}")
+        finally:
+            self.history_saving = False
+    
+    def write_history_file(self, entries):
+        """Serialize and write a history snapshot (runs in a worker thread)."""
+        self.write_json_file(self.history_file, [entry.to_dict() for entry in entries])
+    
+    @staticmethod
+    def write_json_file(path: Path, data):
+        """Replace a JSON file atomically (a crash never leaves it half written)."""
+        fd, temp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        with open(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp, path)
     
     def load_settings(self):
         """Load user settings from file."""
@@ -178,6 +320,45 @@ class WeatherApp:
         except Exception as e:
             print(f"Error saving watchlist: {e}")
     
+    async def record_observation(self, city: str, weather_data: dict, units: str = None):
+        """Append a fetched snapshot to the per-city time-series store.
+        
+        Returns its anomalies against the city's normal weather for the hour,
+        checked before the snapshot joins that baseline. A cached snapshot
+        seen before keeps the anomalies found the first time. The SQLite work
+        runs in a worker thread so it never stalls the UI.
+        """
+        units = units or self.current_unit
+        key = (city, weather_data.get("dt"))
+        if key in self.recent_anomalies:
+            return self.recent_anomalies[key]
+        try:
+            anomalies = await asyncio.to_thread(
+                self.observations.anomalies_in_payload, city, weather_data, units
+            )
+            await asyncio.to_thread(self.observations.append_payload, city, weather_data, units)
+        except Exception as e:
+            print(f"Error recording observation: {e}")
+            return []
+        if len(self.recent_anomalies) >= Config.CACHE_MAX_ENTRIES:
+            self.recent_anomalies.clear()
+        self.recent_anomalies[key] = anomalies
+        return anomalies
+    
+    def create_sparkline(self, city: str, hours: int = 24, points: int = 12):
+        """Temperature trend for a city from stored observations, as text."""
+        now = time.time()
+        samples = self.observations.downsample(city, now - hours * 3600, now, points)
+        if len(samples) < 2:
+            return None
+        values = [value for _, value in samples]
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        steps = len(self.SPARKLINE_CHARS) - 1
+        return "".join(
+            self.SPARKLINE_CHARS[round((value - low) / span * steps)] for value in values
+        )
+    
     def get_weather_theme(self, condition: str):
         """Get theme colors based on weather condition. (Feature 3)"""
         for key in self.WEATHER_THEMES.keys():
@@ -242,9 +423,19 @@ class WeatherApp:
             prefix_icon=ft.Icons.LOCATION_CITY,
             autofocus=True,
             on_submit=self.on_search,
+            on_change=self.on_city_input_change,
             width=300,
         )
         
+        # Type-ahead suggestions from the search history (Feature 1 - Enhanced)
+        self.suggestion_slots = []
+        self.suggestion_row = ft.Row(
+            [],
+            alignment=ft.MainAxisAlignment.CENTER,
+            wrap=True,
+            visible=False,
+        )
+        
         # Search and forecast buttons
         self.search_button = ft.ElevatedButton(
             "Get Weather",
@@ -334,6 +525,12 @@ class WeatherApp:
         # Loading indicator
         self.loading = ft.ProgressRing(visible=False)
         
+        # Panels are built once and updated in place on every search
+        self.build_weather_panel()
+        self.build_alerts_panel()
+        self.build_forecast_panel()
+        self.build_watchlist_panel()
+        
         # Main scrollable container
         main_content = ft.Column(
             [
@@ -341,6 +538,7 @@ class WeatherApp:
                 ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
                 self.history_dropdown,
                 self.city_input,
+                self.suggestion_row,
                 ft.Row([
                     self.search_button,
                     self.forecast_button,
@@ -376,16 +574,18 @@ class WeatherApp:
     
     def toggle_theme(self, e):
         """Toggle between light and dark theme."""
+        self.update_scheduler.begin_interaction("toggle_theme")
         if self.page.theme_mode == ft.ThemeMode.LIGHT:
             self.page.theme_mode = ft.ThemeMode.DARK
             self.theme_button.icon = ft.Icons.LIGHT_MODE
         else:
             self.page.theme_mode = ft.ThemeMode.LIGHT
             self.theme_button.icon = ft.Icons.DARK_MODE
-        self.page.update()
+        self.request_update()
     
     def toggle_units(self, e):
         """Toggle between Celsius and Fahrenheit. (Feature 2)"""
+        self.update_scheduler.begin_interaction("toggle_units")
         if self.current_unit == "metric":
             self.current_unit = "imperial"
             self.unit_button.tooltip = "Switch to Celsius"
@@ -399,138 +599,312 @@ class WeatherApp:
         
         # Re-fetch weather data with new units if we have a current city
         if self.current_city and self.current_weather_data:
-            self.page.run_task(self.get_weather)
+            self.view_tasks.start("current", self.get_weather)
         
-        self.page.update()
+        self.request_update(self.unit_button)
     
     def on_location_click(self, e):
         """Handle location button click."""
-        self.page.run_task(self.get_location_weather)
+        self.update_scheduler.begin_interaction("location")
+        self.view_tasks.start("current", self.get_location_weather)
     
     def on_forecast_click(self, e):
         """Handle forecast button click."""
-        self.page.run_task(self.get_forecast)
+        self.update_scheduler.begin_interaction("forecast")
+        self.view_tasks.start("forecast", self.get_forecast)
     
     def on_search(self, e):
         """Handle search button click."""
-        self.page.run_task(self.get_weather)
+        self.update_scheduler.begin_interaction("search")
+        # Drop a pending type-ahead; a prefetch in flight is kept for the search to join
+        self.view_tasks.cancel("typeahead")
+        self.hide_suggestions()
+        self.view_tasks.start("current", self.get_weather)
+    
+    def on_city_input_change(self, e):
+        """Start a debounced type-ahead lookup. (Feature 1 - Enhanced)"""
+        # The text changed, so an earlier guess is no longer worth fetching
+        self.view_tasks.cancel("prefetch")
+        self.view_tasks.start("typeahead", self.typeahead, self.city_input.value or "")
+        self.start_idle_prefetch()
+    
+    async def typeahead(self, text: str):
+        """Suggest history matches for the typed text and prefetch the best one.
+        
+        Runs once typing pauses for Config.TYPEAHEAD_DEBOUNCE seconds; every
+        keystroke cancels the previous run and its prefetch. The prefetch
+        puts the top match in the cache so pressing Enter is instant.
+        """
+        await asyncio.sleep(Config.TYPEAHEAD_DEBOUNCE)
+        text = text.strip()
+        matches = []
+        if len(text) >= Config.TYPEAHEAD_MIN_CHARS:
+            matches = self.search_history.search(text, limit=Config.TYPEAHEAD_SUGGESTIONS)
+        self.show_suggestions([entry.name for entry in matches])
+        if matches:
+            self.view_tasks.start(
+                "prefetch", self.weather_service.prefetch_weather,
+                matches[0].name, self.current_unit, self.session_id,
+            )
+    
+    def likely_next_cities(self, limit: int):
+        """Cities the user is most likely to open next. (Feature 1 - Enhanced)
+        
+        Ranked by search history frecency; a watchlist city counts one
+        extra lookup, since its card is always one click away.
+        """
+        now = time.time()
+        scores = {}
+        for entry in self.search_history.top(limit):
+            scores[entry.key] = (entry.frecency(now), entry.name)
+        for city in self.watchlist:
+            entry = self.search_history.get(city)
+            score = entry.frecency(now) if entry else 0.0
+            scores[canonical_city_key(city)] = (score + 1.0, city)
+        ranked = sorted(scores.values(), reverse=True)
+        return [name for _, name in ranked[:limit]]
+    
+    def start_idle_prefetch(self):
+        """(Re)start waiting for idle time; a prefetch round in progress stops."""
+        # The kiosk fetches the city it shows next itself
+        if Config.IDLE_PREFETCH_CITIES > 0 and not Config.KIOSK and self.session_live:
+            self.view_tasks.start("idle_prefetch", self.idle_prefetch)
+    
+    async def idle_prefetch(self):
+        """Prefetch the likely next cities while the app is idle.
+        
+        After Config.IDLE_PREFETCH_DELAY quiet seconds the weather of the
+        top cities is fetched, then their forecasts, one request at a time
+        and never below Config.IDLE_PREFETCH_RESERVE_TOKENS of the API
+        budget, so opening one of them from the history is a cache hit.
+        The next interaction cancels this task; a request already sent
+        still completes, so clicking that city joins it instead of paying
+        twice.
+        """
+        service = self.weather_service
+        delay = Config.IDLE_PREFETCH_DELAY
+        for _ in range(Config.IDLE_PREFETCH_ROUNDS):
+            await asyncio.sleep(delay)
+            delay = Config.CACHE_TTL  # later rounds refresh what expired
+            units = self.current_unit
+            cities = self.likely_next_cities(Config.IDLE_PREFETCH_CITIES)
+            for kind, prefetch in (("weather", service.prefetch_weather),
+                                   ("forecast", service.prefetch_forecast)):
+                for city in cities:
+                    # Short of budget: wait for one token to refill, try once more
+                    for _ in range(2):
+                        fetched = await asyncio.shield(prefetch(
+                            city, units, self.session_id,
+                            reserve=Config.IDLE_PREFETCH_RESERVE_TOKENS,
+                        ))
+                        if fetched or service.is_cached(kind, city, units):
+                            break
+                        await asyncio.sleep(60 / Config.RATE_LIMIT_PER_MINUTE)
+    
+    def create_suggestion_slot(self):
+        """Create a reusable suggestion chip."""
+        return {
+            "button": ft.TextButton(
+                "",
+                icon=ft.Icons.HISTORY,
+                on_click=lambda e: self.select_suggestion(e.control.text),
+            ),
+        }
+    
+    def show_suggestions(self, cities):
+        """Show type-ahead suggestions below the city input."""
+        self.ensure_slots(
+            self.suggestion_slots, self.suggestion_row, len(cities),
+            self.create_suggestion_slot, "button",
+        )
+        for i, slot in enumerate(self.suggestion_slots):
+            slot["button"].visible = i < len(cities)
+            if i < len(cities):
+                slot["button"].text = cities[i]
+        self.suggestion_row.visible = bool(cities)
+        self.request_update(self.suggestion_row)
+    
+    def hide_suggestions(self):
+        if self.suggestion_row.visible:
+            self.suggestion_row.visible = False
+            self.request_update(self.suggestion_row)
+    
+    def select_suggestion(self, city: str):
+        """Search a suggested city."""
+        self.update_scheduler.begin_interaction("suggestion")
+        self.city_input.value = city
+        self.hide_suggestions()
+        self.request_update(self.city_input)
+        self.view_tasks.start("current", self.get_weather)
     
     def add_to_watchlist(self, e):
         """Add current city to watchlist. (Feature 7)"""
+        self.update_scheduler.begin_interaction("add_to_watchlist")
         if self.current_city and self.current_city not in self.watchlist:
             self.watchlist.append(self.current_city)
             self.save_watchlist()
+            self.watchlist_index.set_cities(self.watchlist)
+            self.start_alert_monitor()
             self.add_to_watchlist_button.text = "Added to Watchlist!"
             self.add_to_watchlist_button.icon = ft.Icons.FAVORITE
-            self.page.update()
+            self.request_update(self.add_to_watchlist_button)
             
             # Reset button after 2 seconds
-            asyncio.create_task(self.reset_watchlist_button())
+            self.page.run_task(self.reset_watchlist_button)
     
     async def reset_watchlist_button(self):
         """Reset watchlist button after adding."""
         await asyncio.sleep(2)
         self.add_to_watchlist_button.text = "Add to Watchlist"
         self.add_to_watchlist_button.icon = ft.Icons.FAVORITE_BORDER
-        self.page.update()
+        self.request_update(self.add_to_watchlist_button)
     
     def toggle_watchlist_view(self, e):
         """Toggle watchlist view. (Feature 7)"""
+        self.update_scheduler.begin_interaction("toggle_watchlist")
         if self.watchlist_container.visible:
             self.watchlist_container.visible = False
             self.view_watchlist_button.text = "View Watchlist"
+            self.view_tasks.cancel("watchlist")
         else:
-            self.page.run_task(self.display_watchlist)
+            self.view_tasks.start("watchlist", self.display_watchlist)
             self.view_watchlist_button.text = "Hide Watchlist"
-        self.page.update()
+        self.request_update(self.watchlist_container, self.view_watchlist_button)
     
     def add_to_history(self, city: str):
-        """Add city to search history with persistent storage. (Feature 1 - Enhanced)"""
+        """Record a city lookup in the search history. (Feature 1 - Enhanced)
+        
+        Every lookup is counted; cities are deduped by canonical key so
+        "Mataoroc" and "mataoroc" share one entry.
+        """
         if city and city.strip():
             city = city.strip().title()  # Normalize city name
-            if city not in self.search_history:
-                self.search_history.insert(0, city)
-                self.search_history = self.search_history[:10]  # Keep last 10
-                self.save_history()  # Persist to file
-                self.update_history_dropdown()
+            self.search_history.record(city)
+            self.save_history()  # Persist to file
+            self.update_history_dropdown()
     
     def update_history_dropdown(self):
         """Update the history dropdown display."""
         if self.search_history:
+            # Show the 10 most relevant cities by frecency
             self.history_dropdown.options = [
-                ft.dropdown.Option(c) for c in self.search_history
+                ft.dropdown.Option(entry.name)
+                for entry in self.search_history.top(Config.HISTORY_DROPDOWN_SIZE)
             ]
             self.history_dropdown.visible = True
         else:
             self.history_dropdown.visible = False
-        self.page.update()
+        self.request_update(self.history_dropdown)
     
     def load_from_history(self, e):
         """Load weather from history."""
+        self.update_scheduler.begin_interaction("history")
         if e.control.value:
             self.city_input.value = e.control.value
-            self.page.run_task(self.get_weather)
+            self.view_tasks.start("current", self.get_weather)
     
     async def get_location_weather(self):
-        """Get weather for current location."""
+        """Get weather for current location.
+        
+        The location lookup and the weather request share one deadline,
+        so the click fails after Config.ACTION_DEADLINE seconds in total.
+        """
         self.loading.visible = True
         self.error_message.visible = False
-        self.page.update()
+        self.request_update()
         
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get("https://ipapi.co/json/")
-                data = response.json()
-                lat, lon = data['latitude'], data['longitude']
-                city = data.get('city', 'Your Location')
-            
-            weather_data = await self.weather_service.get_weather_by_coordinates(lat, lon)
+            async with deadline(Config.ACTION_DEADLINE):
+                lat, lon, city = await self.weather_service.get_location()
+                # The nearest known city gives a stable name (offline lookup)
+                place = self.weather_service.nearest_city(lat, lon)
+                if place is not None:
+                    city = place.name
+                weather_data = await self.weather_service.get_weather_by_coordinates(
+                    lat, lon, session_id=self.session_id
+                )
+            if self.view_tasks.superseded():
+                return  # a newer search owns the view now
             self.city_input.value = city
             self.current_city = city
             self.current_weather_data = weather_data
+            self.current_anomalies = await self.record_observation(city, weather_data, units=Config.UNITS)
             await self.display_weather(weather_data)
             self.add_to_history(city)
-            
+        
+        except DeadlineExceeded as e:
+            self.show_error(str(e))
         except Exception as e:
             self.show_error("Could not get your location. Please enter city manually.")
         
         finally:
-            self.loading.visible = False
-            self.page.update()
+            # A superseded task leaves the spinner to the newer one
+            if not self.view_tasks.superseded():
+                self.loading.visible = False
+            self.request_update()
     
     async def get_weather(self):
-        """Fetch and display weather data."""
+        """Fetch and display weather, forecast, air quality and UV for a city.
+        
+        All four are requested at once through WeatherService.dashboard()
+        and each panel is drawn as soon as its data arrives, so the view is
+        complete after the slowest request rather than after all of them
+        in turn.
+        """
         city = self.city_input.value.strip()
         
         if not city:
             self.show_error("Please enter a city name")
             return
         
-        self.loading.visible = True
-        self.error_message.visible = False
-        self.weather_container.visible = False
-        self.alerts_container.visible = False
-        self.forecast_container.visible = False
-        self.forecast_button.visible = False
-        self.page.update()
-        
+        # A forecast still loading belongs to the previous city
+        self.view_tasks.cancel("forecast")
+        # Refreshing the city on screen keeps its panels, so the ones whose
+        # data did not change need no update at all
+        refresh = (
+            self.weather_container.visible
+            and canonical_city_key(city) == canonical_city_key(self.current_city)
+        )
+        # A cached city (prefetched, or seen recently) shows without a spinner
+        cached = self.weather_service.is_cached("weather", city, self.current_unit)
+        self.metrics.incr("searches")
+        if cached:
+            self.metrics.incr("searches_from_cache")
+        if not refresh:
+            self.loading.visible = not cached
+            self.error_message.visible = False
+            self.weather_container.visible = False
+            self.alerts_container.visible = False
+            self.forecast_container.visible = False
+            self.forecast_button.visible = False
+            parts = self.weather_service.dashboard_parts()
+            for card, part in ((self.air_quality_card, "air"), (self.uv_card, "uv")):
+                card.visible = part in parts
+                self.update_info_card(card, "…", ft.Colors.GREY_500)
+            self.request_update()
+        
+        dashboard = self.weather_service.dashboard(
+            city, units=self.current_unit, session_id=self.session_id
+        )
         try:
-            weather_data = await self.weather_service.get_weather(city, units=self.current_unit)
-            self.current_city = city
-            self.current_weather_data = weather_data
-            self.add_to_history(city)
-            await self.display_weather(weather_data)
-            self.forecast_button.visible = True
-            self.add_to_watchlist_button.visible = True
-            
-            # Update button state based on watchlist
-            if city in self.watchlist:
-                self.add_to_watchlist_button.text = "In Watchlist"
-                self.add_to_watchlist_button.icon = ft.Icons.FAVORITE
-            else:
-                self.add_to_watchlist_button.text = "Add to Watchlist"
-                self.add_to_watchlist_button.icon = ft.Icons.FAVORITE_BORDER
-            
+            async with deadline(Config.ACTION_DEADLINE):
+                async for part, result in dashboard:
+                    if self.view_tasks.superseded():
+                        return  # a newer search owns the view now
+                    if part == "weather":
+                        if isinstance(result, Exception):
+                            raise result
+                        await self.show_city_weather(city, result)
+                    elif part == "forecast":
+                        if isinstance(result, Exception):
+                            print(f"⚠️ Forecast unavailable: {result}")  # Debug info
+                        else:
+                            await self.display_forecast(result)
+                    elif part == "air":
+                        self.display_air_quality(result)
+                    elif part == "uv":
+                        self.display_uv_index(result)
+        
         except WeatherServiceError as e:
             error_msg = str(e)
             if "API key" in error_msg:
@@ -546,8 +920,36 @@ class WeatherApp:
             self.show_error(f"❌ Unexpected error: {str(e)}. Please check the console for details.")
         
         finally:
-            self.loading.visible = False
-            self.page.update()
+            # Cancels the requests still outstanding (error, newer search, deadline)
+            await dashboard.aclose()
+            # A superseded task leaves the spinner to the newer one
+            if not self.view_tasks.superseded() and self.loading.visible:
+                self.loading.visible = False
+                self.request_update()
+    
+    async def show_city_weather(self, city: str, weather_data: dict, remember: bool = True):
+        """Show a searched city's current weather and its actions.
+        
+        `remember=False` leaves the search history alone (kiosk rotation).
+        """
+        self.current_city = city
+        self.current_weather_data = weather_data
+        self.current_anomalies = await self.record_observation(city, weather_data)
+        if remember:
+            self.add_to_history(city)
+        # The spinner only covers the first panel; the rest fill in as they arrive
+        self.loading.visible = False
+        await self.display_weather(weather_data)
+        self.forecast_button.visible = True
+        self.add_to_watchlist_button.visible = True
+        
+        # Update button state based on watchlist
+        if city in self.watchlist:
+            self.add_to_watchlist_button.text = "In Watchlist"
+            self.add_to_watchlist_button.icon = ft.Icons.FAVORITE
+        else:
+            self.add_to_watchlist_button.text = "Add to Watchlist"
+            self.add_to_watchlist_button.icon = ft.Icons.FAVORITE_BORDER
     
     async def get_forecast(self):
         """Fetch and display 5-day forecast. (Feature 5)"""
@@ -559,20 +961,52 @@ class WeatherApp:
         
         self.loading.visible = True
         self.forecast_container.visible = False
-        self.page.update()
+        self.request_update()
         
         try:
-            forecast_data = await self.weather_service.get_forecast(city, units=self.current_unit)
+            async with deadline(Config.ACTION_DEADLINE):
+                forecast_data = await self.weather_service.get_forecast(
+                    city, units=self.current_unit, session_id=self.session_id
+                )
+            if self.view_tasks.superseded():
+                return
             await self.display_forecast(forecast_data)
-            
+        
         except WeatherServiceError as e:
             self.show_error(str(e))
         except Exception as e:
             self.show_error("Could not load forecast data")
         
         finally:
-            self.loading.visible = False
-            self.page.update()
+            # A superseded task leaves the spinner to the newer one
+            if not self.view_tasks.superseded():
+                self.loading.visible = False
+            self.request_update()
+    
+    def create_anomaly_alerts(self, anomalies):
+        """Alerts for readings far from the city's normal at this hour of day."""
+        imperial = self.current_unit == "imperial"
+        alerts = []
+        for anomaly in anomalies:
+            # Anomalies are in metric units, like the stored observations
+            delta = abs(anomaly.delta)
+            if anomaly.field == "temp":
+                amount = f"{delta * 9 / 5:.0f}°F" if imperial else f"{delta:.0f}°C"
+            elif anomaly.field == "wind_speed":
+                amount = f"{delta / 0.44704:.0f} mph" if imperial else f"{delta:.0f} m/s"
+            else:
+                amount = f"{delta:.0f}%"
+            direction = "above" if anomaly.delta > 0 else "below"
+            icon, title = self.ANOMALY_ALERTS[anomaly.field]
+            alerts.append({
+                "icon": icon,
+                "color": ft.Colors.DEEP_PURPLE_700,
+                "title": title,
+                "message": f"{amount} {direction} normal for this hour",
+                # Three standard deviations out is rare even for this city
+                "severity": "medium" if delta >= 3 * anomaly.std else "low"
+            })
+        return alerts
     
     def create_weather_alerts(self, temp: float, feels_like: float, humidity: int, 
                              wind_speed: float, condition: str):
@@ -688,8 +1122,244 @@ class WeatherApp:
         
         return alerts, recommendations
     
+    def build_weather_panel(self):
+        """Build the weather display once; searches only update its values. (Feature 3)"""
+        self.weather_location_text = ft.Text("", size=24, weight=ft.FontWeight.BOLD)
+        self.weather_icon_image = ft.Image(
+            src="https://openweathermap.org/img/wn/01d@2x.png",
+            width=100,
+            height=100,
+        )
+        self.weather_condition_emoji = ft.Text("", size=40)
+        self.weather_description_text = ft.Text("", size=20, italic=True)
+        self.weather_temp_text = ft.Text("", size=48, weight=ft.FontWeight.BOLD)
+        self.weather_feels_like_text = ft.Text("", size=16)
+        self.weather_updated_text = ft.Text(
+            "",
+            size=12,
+            color=ft.Colors.GREY_600,
+            italic=True,
+        )
+        self.weather_divider = ft.Divider()
+        self.humidity_card = self.create_info_card(ft.Icons.WATER_DROP, "Humidity", "", None)
+        self.wind_card = self.create_info_card(ft.Icons.AIR, "Wind Speed", "", None)
+        # Filled in as the dashboard fan-out delivers them
+        self.air_quality_card = self.create_info_card(ft.Icons.MASKS, "Air Quality", "", None)
+        self.uv_card = self.create_info_card(ft.Icons.WB_SUNNY, "UV Index", "", None)
+        
+        self.weather_container.content = ft.Column(
+            [
+                self.weather_location_text,
+                ft.Row(
+                    [
+                        self.weather_icon_image,
+                        ft.Column([
+                            self.weather_condition_emoji,
+                            self.weather_description_text,
+                        ]),
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                self.weather_temp_text,
+                self.weather_feels_like_text,
+                self.weather_updated_text,
+                self.weather_divider,
+                ft.Row(
+                    [self.humidity_card, self.wind_card],
+                    alignment=ft.MainAxisAlignment.SPACE_EVENLY,
+                ),
+                ft.Row(
+                    [self.air_quality_card, self.uv_card],
+                    alignment=ft.MainAxisAlignment.SPACE_EVENLY,
+                ),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=10,
+        )
+    
+    def build_alerts_panel(self):
+        """Build the alerts panel once; cards are reused between searches. (Feature 6)"""
+        self.alert_slots = []
+        self.alert_cards_column = ft.Column([], spacing=12)
+        
+        self.recommendation_slots = []
+        self.recommendation_rows = ft.Column([], spacing=2)
+        self.recommendation_card = ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.LIGHTBULB, color=ft.Colors.BLUE_700, size=24),
+                    ft.Text("Recommendations", weight=ft.FontWeight.BOLD, size=15, color=ft.Colors.BLUE_700),
+                ], spacing=8),
+                ft.Divider(height=10, color=ft.Colors.BLUE_200),
+                self.recommendation_rows,
+            ]),
+            bgcolor=ft.Colors.LIGHT_BLUE_50,
+            padding=15,
+            border_radius=10,
+            border=ft.border.all(2, ft.Colors.BLUE_300),
+            shadow=ft.BoxShadow(blur_radius=3, spread_radius=0, color=ft.Colors.BLACK12),
+            visible=False,
+        )
+        
+        self.alerts_container.content = ft.Column(
+            [self.alert_cards_column, self.recommendation_card],
+            spacing=12,
+        )
+    
+    def create_alert_slot(self):
+        """Create a reusable alert card and keep handles to its changing parts."""
+        slot = {
+            "icon": ft.Icon(ft.Icons.INFO, size=32),
+            "title": ft.Text("", weight=ft.FontWeight.BOLD, size=16),
+            "message": ft.Text("", size=13, color=ft.Colors.BLACK87),
+            "badge_text": ft.Text(
+                "",
+                size=10,
+                weight=ft.FontWeight.BOLD,
+                color=ft.Colors.WHITE,
+            ),
+        }
+        slot["badge"] = ft.Container(
+            content=slot["badge_text"],
+            padding=ft.padding.symmetric(8, 4),
+            border_radius=4,
+        )
+        slot["card"] = ft.Container(
+            content=ft.Column(
+                [
+                    # Severity badge row
+                    ft.Row(
+                        [
+                            slot["icon"],
+                            ft.Column(
+                                [slot["title"], slot["message"]],
+                                spacing=2,
+                                expand=True,
+                            ),
+                            slot["badge"],
+                        ],
+                        spacing=12,
+                        vertical_alignment=ft.CrossAxisAlignment.START,
+                    ),
+                ]
+            ),
+            padding=12,
+            border_radius=10,
+            shadow=ft.BoxShadow(
+                blur_radius=4,
+                spread_radius=0,
+                color=ft.Colors.BLACK12,
+            ),
+        )
+        return slot
+    
+    def create_recommendation_slot(self):
+        """Create a reusable recommendation row."""
+        text = ft.Text("", size=12, color=ft.Colors.BLACK87, expand=True)
+        row = ft.Container(
+            content=ft.Row([
+                ft.Text("→", size=14, color=ft.Colors.BLUE_700, weight=ft.FontWeight.BOLD),
+                text,
+            ], spacing=8),
+            padding=ft.padding.symmetric(0, 6),
+        )
+        return {"row": row, "text": text}
+    
+    def build_forecast_panel(self):
+        """Build the forecast panel once; day cards are reused. (Feature 5)"""
+        self.forecast_slots = []
+        self.forecast_cards_row = ft.Row(
+            [],
+            alignment=ft.MainAxisAlignment.CENTER,
+            wrap=True,
+        )
+        
+        # Hourly chart; render_forecast_chart() swaps in new points
+        self.forecast_temp_series = ft.LineChartData(
+            data_points=[],
+            curved=True,
+            prevent_curve_over_shooting=True,
+            stroke_width=2,
+            color=ft.Colors.ORANGE_700,
+            below_line_bgcolor=ft.Colors.with_opacity(0.15, ft.Colors.ORANGE_700),
+        )
+        self.forecast_temp_chart = ft.LineChart(
+            data_series=[self.forecast_temp_series],
+            left_axis=ft.ChartAxis(labels_size=32),
+            bottom_axis=ft.ChartAxis(labels_size=20),
+            height=140,
+        )
+        self.forecast_precip_chart = ft.BarChart(
+            bar_groups=[],
+            left_axis=ft.ChartAxis(labels_size=32),
+            height=60,
+        )
+        self.forecast_chart_column = ft.Column(
+            [
+                ft.Text("Hourly Temperature & Precipitation", size=14, weight=ft.FontWeight.BOLD),
+                self.forecast_temp_chart,
+                self.forecast_precip_chart,
+            ],
+            spacing=4,
+            visible=False,
+        )
+        self.forecast_container.content = ft.Column(
+            [
+                ft.Text("5-Day Forecast", size=20, weight=ft.FontWeight.BOLD),
+                self.forecast_cards_row,
+                self.forecast_chart_column,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=10,
+        )
+    
+    def create_forecast_slot(self):
+        """Create a reusable forecast day card."""
+        slot = {
+            "date": ft.Text("", size=12, weight=ft.FontWeight.BOLD),
+            "emoji": ft.Text("", size=30),
+            "image": ft.Image(
+                src="https://openweathermap.org/img/wn/01d.png",
+                width=50,
+                height=50,
+            ),
+            "temps": ft.Text("", size=14, weight=ft.FontWeight.BOLD),
+            "description": ft.Text("", size=10, text_align=ft.TextAlign.CENTER),
+        }
+        slot["card"] = ft.Container(
+            content=ft.Column(
+                [
+                    slot["date"],
+                    slot["emoji"],
+                    slot["image"],
+                    slot["temps"],
+                    slot["description"],
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=5,
+            ),
+            border_radius=10,
+            padding=10,
+            width=120,
+        )
+        return slot
+    
+    @staticmethod
+    def ensure_slots(slots, column, count, factory, key):
+        """Grow a pool of reusable controls to at least `count` entries."""
+        while len(slots) < count:
+            slot = factory()
+            slots.append(slot)
+            column.controls.append(slot[key])
+    
     async def display_weather(self, data: dict):
-        """Display weather with dynamic colors and alerts. (Features 3 & 6)"""
+        """Display weather with dynamic colors and alerts. (Features 3 & 6)
+        
+        Only the values of the prebuilt weather panel change, so Flet sends
+        small property updates instead of a whole new control tree.
+        """
+        started = time.perf_counter()
+        
         # Extract data
         city_name = data.get("name", "Unknown")
         country = data.get("sys", {}).get("country", "")
@@ -700,6 +1370,21 @@ class WeatherApp:
         condition = data.get("weather", [{}])[0].get("main", "Clear")
         icon_code = data.get("weather", [{}])[0].get("icon", "01d")
         wind_speed = data.get("wind", {}).get("speed", 0)
+        unit_symbol = "°F" if self.current_unit == "imperial" else "°C"
+        
+        # The same weather already on screen: only the timestamp may change
+        fingerprint = (city_name, country, temp, feels_like, humidity, description,
+                       condition, icon_code, wind_speed, unit_symbol,
+                       tuple(self.current_anomalies))
+        if fingerprint == self.rendered_weather and self.weather_container.visible:
+            self.count_render("weather", changed=False)
+            updated = f"Last updated: {datetime.now().strftime('%H:%M')}"
+            if self.weather_updated_text.value != updated:
+                self.weather_updated_text.value = updated
+                self.request_update(self.weather_updated_text)
+            return
+        self.rendered_weather = fingerprint
+        self.count_render("weather", changed=True)
         
         # Get theme for this weather condition (Feature 3)
         theme = self.get_weather_theme(condition)
@@ -707,16 +1392,18 @@ class WeatherApp:
         
         # Update title emoji
         self.weather_emoji.value = theme["emoji"]
-        self.page.update()
         
         # Create alerts (Feature 6)
         alerts, recommendations = self.create_weather_alerts(
             temp, feels_like, humidity, wind_speed, description
         )
+        alerts.extend(self.create_anomaly_alerts(self.current_anomalies))
         
         # Display alerts and/or recommendations if present
         if alerts or recommendations:
             await self.display_alerts(alerts, recommendations, theme)
+        else:
+            self.alerts_container.visible = False
         
         # Apply gradient background (Feature 3)
         self.weather_container.gradient = ft.LinearGradient(
@@ -725,92 +1412,77 @@ class WeatherApp:
             colors=theme["gradient"],
         )
         
-        # Build weather display with themed colors
-        self.weather_container.content = ft.Column(
-            [
-                ft.Text(
-                    f"{city_name}, {country}",
-                    size=24,
-                    weight=ft.FontWeight.BOLD,
-                    color=theme["primary"],
-                ),
-                
-                ft.Row(
-                    [
-                        ft.Image(
-                            src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png",
-                            width=100,
-                            height=100,
-                        ),
-                        ft.Column([
-                            ft.Text(
-                                theme["emoji"],
-                                size=40,
-                            ),
-                            ft.Text(
-                                description,
-                                size=20,
-                                italic=True,
-                                color=theme["secondary"],
-                            ),
-                        ]),
-                    ],
-                    alignment=ft.MainAxisAlignment.CENTER,
-                ),
-                
-                ft.Text(
-                    f"{temp:.1f}°{'F' if self.current_unit == 'imperial' else 'C'}",
-                    size=48,
-                    weight=ft.FontWeight.BOLD,
-                    color=theme["primary"],
-                ),
-                
-                ft.Text(
-                    f"Feels like {feels_like:.1f}°{'F' if self.current_unit == 'imperial' else 'C'}",
-                    size=16,
-                    color=theme["secondary"],
-                ),
-                
-                ft.Text(
-                    f"Last updated: {datetime.now().strftime('%H:%M')}",
-                    size=12,
-                    color=ft.Colors.GREY_600,
-                    italic=True,
-                ),
-                
-                ft.Divider(color=theme["secondary"]),
-                
-                ft.Row(
-                    [
-                        self.create_info_card(
-                            ft.Icons.WATER_DROP,
-                            "Humidity",
-                            f"{humidity}%",
-                            theme["primary"]
-                        ),
-                        self.create_info_card(
-                            ft.Icons.AIR,
-                            "Wind Speed",
-                            f"{wind_speed:.1f} m/s",
-                            theme["primary"]
-                        ),
-                    ],
-                    alignment=ft.MainAxisAlignment.SPACE_EVENLY,
-                ),
-            ],
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=10,
-        )
+        # Update the retained weather panel with themed colors
+        self.weather_location_text.value = f"{city_name}, {country}"
+        self.weather_location_text.color = theme["primary"]
+        self.weather_icon_image.src = f"https://openweathermap.org/img/wn/{icon_code}@2x.png"
+        self.weather_condition_emoji.value = theme["emoji"]
+        self.weather_description_text.value = description
+        self.weather_description_text.color = theme["secondary"]
+        self.weather_temp_text.value = f"{temp:.1f}{unit_symbol}"
+        self.weather_temp_text.color = theme["primary"]
+        self.weather_feels_like_text.value = f"Feels like {feels_like:.1f}{unit_symbol}"
+        self.weather_feels_like_text.color = theme["secondary"]
+        self.weather_updated_text.value = f"Last updated: {datetime.now().strftime('%H:%M')}"
+        self.weather_divider.color = theme["secondary"]
+        self.update_info_card(self.humidity_card, f"{humidity}%", theme["primary"])
+        self.update_info_card(self.wind_card, f"{wind_speed:.1f} m/s", theme["primary"])
         
         # Animate appearance
         self.weather_container.opacity = 0
         self.weather_container.visible = True
         self.error_message.visible = False
-        self.page.update()
+        # Only the panels touched here need diffing, not the whole page
+        self.request_update(
+            self.weather_emoji, self.weather_container, self.alerts_container, self.error_message
+        )
+        self.metrics.observe("render_weather_ms", (time.perf_counter() - started) * 1000)
         
         await asyncio.sleep(0.1)
         self.weather_container.opacity = 1
-        self.page.update()
+        self.request_update(self.weather_container)
+    
+    # OpenWeatherMap AQI 1-5
+    AIR_QUALITY_LEVELS = {
+        1: ("Good", ft.Colors.GREEN_700),
+        2: ("Fair", ft.Colors.LIGHT_GREEN_700),
+        3: ("Moderate", ft.Colors.AMBER_700),
+        4: ("Poor", ft.Colors.DEEP_ORANGE_700),
+        5: ("Very Poor", ft.Colors.RED_700),
+    }
+    
+    # WHO UV index categories: (lowest index, label, color)
+    UV_LEVELS = [
+        (11, "Extreme", ft.Colors.PURPLE_700),
+        (8, "Very High", ft.Colors.RED_700),
+        (6, "High", ft.Colors.DEEP_ORANGE_700),
+        (3, "Moderate", ft.Colors.AMBER_700),
+        (0, "Low", ft.Colors.GREEN_700),
+    ]
+    
+    def display_air_quality(self, result):
+        """Show the air quality index (or that it is unavailable) in its card."""
+        try:
+            aqi = result["list"][0]["main"]["aqi"]
+            label, color = self.AIR_QUALITY_LEVELS[aqi]
+            self.update_info_card(self.air_quality_card, f"{aqi} · {label}", color)
+        except (TypeError, KeyError, IndexError):
+            print(f"⚠️ Air quality unavailable: {result}")  # Debug info
+            self.update_info_card(self.air_quality_card, "—", ft.Colors.GREY_500)
+        self.request_update(self.air_quality_card)
+    
+    def display_uv_index(self, result):
+        """Show the UV index and its risk category in its card."""
+        uvi = result.get("uvi") if isinstance(result, dict) else None
+        if uvi is None:
+            print(f"⚠️ UV index unavailable: {result}")  # Debug info
+            self.update_info_card(self.uv_card, "—", ft.Colors.GREY_500)
+        else:
+            label, color = next(
+                (label, color) for low, label, color in self.UV_LEVELS if uvi >= low
+            )
+            self.update_info_card(self.uv_card, f"{uvi:.0f} · {label}", color)
+        self.request_update(self.uv_card)
     
     async def display_alerts(self, alerts, recommendations, theme):
         """Display weather alerts and recommendations. (Feature 6)
@@ -821,137 +1493,66 @@ class WeatherApp:
         - Colored banners with icons
         - Personalized recommendations
         """
-        alert_cards = []
-        
         # Sort by severity: HIGH (red) -> MEDIUM (orange) -> LOW (yellow)
         severity_order = {"high": 0, "medium": 1, "low": 2}
         alerts.sort(key=lambda x: severity_order.get(x["severity"], 3))
         
-        # Create visually distinct alert cards with severity indicators
-        for alert in alerts:
-            severity_colors = {
-                "high": ft.Colors.RED_100,
-                "medium": ft.Colors.ORANGE_100,
-                "low": ft.Colors.YELLOW_100
-            }
-            
-            # Severity badge
-            severity_badge_color = {
-                "high": ft.Colors.RED_700,
-                "medium": ft.Colors.ORANGE_700,
-                "low": ft.Colors.AMBER_700
-            }
-            
-            severity_text = {
-                "high": "⚠️ HIGH",
-                "medium": "⚠️ MEDIUM",
-                "low": "ℹ️ LOW"
-            }
-            
-            card = ft.Container(
-                content=ft.Column(
-                    [
-                        # Severity badge row
-                        ft.Row(
-                            [
-                                ft.Icon(
-                                    alert["icon"],
-                                    color=alert["color"],
-                                    size=32,
-                                ),
-                                ft.Column(
-                                    [
-                                        ft.Text(
-                                            alert["title"],
-                                            weight=ft.FontWeight.BOLD,
-                                            size=16,
-                                            color=alert["color"],
-                                        ),
-                                        ft.Text(
-                                            alert["message"],
-                                            size=13,
-                                            color=ft.Colors.BLACK87,
-                                        ),
-                                    ],
-                                    spacing=2,
-                                    expand=True,
-                                ),
-                                ft.Container(
-                                    content=ft.Text(
-                                        severity_text.get(alert["severity"], "INFO"),
-                                        size=10,
-                                        weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.WHITE,
-                                    ),
-                                    bgcolor=severity_badge_color.get(alert["severity"], ft.Colors.GREY_700),
-                                    padding=ft.padding.symmetric(8, 4),
-                                    border_radius=4,
-                                )
-                            ],
-                            spacing=12,
-                            vertical_alignment=ft.CrossAxisAlignment.START,
-                        ),
-                    ]
-                ),
-                bgcolor=severity_colors.get(alert["severity"], ft.Colors.GREY_100),
-                padding=12,
-                border_radius=10,
-                border=ft.border.all(3, alert["color"]),
-                shadow=ft.BoxShadow(
-                    blur_radius=4,
-                    spread_radius=0,
-                    color=ft.Colors.BLACK12,
-                ),
-            )
-            alert_cards.append(card)
+        # Fill visually distinct alert cards with severity indicators
+        self.ensure_slots(
+            self.alert_slots, self.alert_cards_column, len(alerts),
+            self.create_alert_slot, "card",
+        )
+        for i, slot in enumerate(self.alert_slots):
+            if i >= len(alerts):
+                slot["card"].visible = False
+                continue
+            alert = alerts[i]
+            severity = alert["severity"]
+            slot["icon"].name = alert["icon"]
+            slot["icon"].color = alert["color"]
+            slot["title"].value = alert["title"]
+            slot["title"].color = alert["color"]
+            slot["message"].value = alert["message"]
+            slot["badge_text"].value = self.SEVERITY_TEXT.get(severity, "INFO")
+            slot["badge"].bgcolor = self.SEVERITY_BADGE_COLORS.get(severity, ft.Colors.GREY_700)
+            slot["card"].bgcolor = self.SEVERITY_COLORS.get(severity, ft.Colors.GREY_100)
+            slot["card"].border = ft.border.all(3, alert["color"])
+            slot["card"].visible = True
+        self.alert_cards_column.visible = bool(alerts)
         
         # Always show recommendations card, even if no alerts
-        alert_cards_to_show = alert_cards.copy()
-        if recommendations:
-            rec_items = []
-            for rec in recommendations:
-                rec_items.append(
-                    ft.Container(
-                        content=ft.Row([
-                            ft.Text("→", size=14, color=ft.Colors.BLUE_700, weight=ft.FontWeight.BOLD),
-                            ft.Text(rec, size=12, color=ft.Colors.BLACK87, expand=True),
-                        ], spacing=8),
-                        padding=ft.padding.symmetric(0, 6),
-                    )
-                )
-            rec_card = ft.Container(
-                content=ft.Column([
-                    ft.Row([
-                        ft.Icon(ft.Icons.LIGHTBULB, color=ft.Colors.BLUE_700, size=24),
-                        ft.Text("Recommendations", weight=ft.FontWeight.BOLD, size=15, color=ft.Colors.BLUE_700),
-                    ], spacing=8),
-                    ft.Divider(height=10, color=ft.Colors.BLUE_200),
-                    ft.Column(rec_items, spacing=2),
-                ]),
-                bgcolor=ft.Colors.LIGHT_BLUE_50,
-                padding=15,
-                border_radius=10,
-                border=ft.border.all(2, ft.Colors.BLUE_300),
-                shadow=ft.BoxShadow(blur_radius=3, spread_radius=0, color=ft.Colors.BLACK12),
-            )
-            alert_cards_to_show.append(rec_card)
-        # If no alerts but recommendations exist, show only recommendations
-        if not alert_cards and recommendations:
-            alert_cards_to_show = [rec_card]
-        self.alerts_container.content = ft.Column(alert_cards_to_show, spacing=12)
+        self.ensure_slots(
+            self.recommendation_slots, self.recommendation_rows, len(recommendations),
+            self.create_recommendation_slot, "row",
+        )
+        for i, slot in enumerate(self.recommendation_slots):
+            if i < len(recommendations):
+                slot["text"].value = recommendations[i]
+                slot["row"].visible = True
+            else:
+                slot["row"].visible = False
+        self.recommendation_card.visible = bool(recommendations)
         
         self.alerts_container.bgcolor = theme["bg"]
         self.alerts_container.visible = True
-        self.page.update()
     
     async def display_forecast(self, data: dict):
         """Display 5-day forecast. (Feature 5)"""
+        started = time.perf_counter()
         forecast_list = data.get("list", [])
         
         if not forecast_list:
             self.show_error("No forecast data available")
             return
         
+        # The same forecast already on screen (e.g. refreshing the city)
+        fingerprint = (forecast_list, self.current_unit)
+        if fingerprint == self.rendered_forecast and self.forecast_container.visible:
+            self.count_render("forecast", changed=False)
+            return
+        self.rendered_forecast = fingerprint
+        self.count_render("forecast", changed=True)
+        
         daily_forecasts = []
         seen_dates = set()
         
@@ -967,8 +1568,16 @@ class WeatherApp:
                 if len(daily_forecasts) >= 5:
                     break
         
-        forecast_cards = []
-        for forecast in daily_forecasts:
+        unit_symbol = "°F" if self.current_unit == "imperial" else "°C"
+        self.ensure_slots(
+            self.forecast_slots, self.forecast_cards_row, len(daily_forecasts),
+            self.create_forecast_slot, "card",
+        )
+        for i, slot in enumerate(self.forecast_slots):
+            if i >= len(daily_forecasts):
+                slot["card"].visible = False
+                continue
+            forecast = daily_forecasts[i]
             date = forecast.get("dt_txt", "").split()[0]
             temp_max = forecast.get("main", {}).get("temp_max", 0)
             temp_min = forecast.get("main", {}).get("temp_min", 0)
@@ -978,81 +1587,89 @@ class WeatherApp:
             
             # Get theme for forecast day
             theme = self.get_weather_theme(condition)
-            unit_symbol = "°F" if self.current_unit == "imperial" else "°C"
             
-            card = ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Text(date, size=12, weight=ft.FontWeight.BOLD),
-                        ft.Text(theme["emoji"], size=30),
-                        ft.Image(
-                            src=f"https://openweathermap.org/img/wn/{icon_code}.png",
-                            width=50,
-                            height=50,
-                        ),
-                        ft.Text(
-                            f"{temp_max:.0f}{unit_symbol} / {temp_min:.0f}{unit_symbol}",
-                            size=14,
-                            weight=ft.FontWeight.BOLD,
-                        ),
-                        ft.Text(description, size=10, text_align=ft.TextAlign.CENTER),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    spacing=5,
-                ),
-                bgcolor=theme["bg"],
-                border_radius=10,
-                padding=10,
-                width=120,
-                border=ft.border.all(2, theme["primary"]),
-            )
-            forecast_cards.append(card)
-        
-        self.forecast_container.content = ft.Column(
-            [
-                ft.Text("5-Day Forecast", size=20, weight=ft.FontWeight.BOLD),
-                ft.Row(
-                    forecast_cards,
-                    alignment=ft.MainAxisAlignment.CENTER,
-                    wrap=True,
-                ),
-            ],
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=10,
-        )
-        
+            slot["date"].value = date
+            slot["emoji"].value = theme["emoji"]
+            slot["image"].src = f"https://openweathermap.org/img/wn/{icon_code}.png"
+            slot["temps"].value = f"{temp_max:.0f}{unit_symbol} / {temp_min:.0f}{unit_symbol}"
+            slot["description"].value = description
+            slot["card"].bgcolor = theme["bg"]
+            slot["card"].border = ft.border.all(2, theme["primary"])
+            slot["card"].visible = True
+        
+        self.current_forecast_data = data
+        self.render_forecast_chart(data)
         self.forecast_container.opacity = 0
         self.forecast_container.visible = True
-        self.page.update()
+        self.request_update(self.forecast_container)
+        self.metrics.observe("render_forecast_ms", (time.perf_counter() - started) * 1000)
         
         await asyncio.sleep(0.1)
         self.forecast_container.opacity = 1
-        self.page.update()
+        self.request_update(self.forecast_container)
     
-    async def display_watchlist(self):
-        """Display multiple cities comparison. (Feature 7)"""
-        if not self.watchlist:
-            self.watchlist_container.content = ft.Column([
-                ft.Text(
-                    "No cities in watchlist",
-                    size=18,
-                    weight=ft.FontWeight.BOLD,
-                    text_align=ft.TextAlign.CENTER,
-                ),
-                ft.Text(
-                    "Add cities using the 'Add to Watchlist' button",
-                    size=14,
-                    color=ft.Colors.GREY_600,
-                    text_align=ft.TextAlign.CENTER,
-                ),
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
-            self.watchlist_container.visible = True
-            self.page.update()
+    def forecast_chart_width(self) -> int:
+        """Pixel width available to the hourly chart, rounded down to 10 px."""
+        page_width = self.page.width or Config.APP_WIDTH
+        # Page and forecast panel padding on both sides
+        width = int(page_width) - 2 * 20 - 2 * 20
+        return max(100, width // 10 * 10)
+    
+    def render_forecast_chart(self, data: dict):
+        """Draw the full forecast as an hourly chart sized to the page. (Feature 5)"""
+        city = data.get("city", {}).get("name") or self.current_city
+        chart = self.chart_cache.get(city, self.current_unit, self.forecast_chart_width(), data)
+        if not chart.temps:
+            self.forecast_chart_column.visible = False
             return
+        if chart is self.rendered_chart:
+            # Same city, units, width and forecast: the client already has these points
+            self.forecast_chart_column.visible = True
+            return
+        self.rendered_chart = chart
+        
+        # x is hours since the first point; values are rounded to keep the payload small
+        start = chart.temps[0][0]
+        hours = lambda ts: round((ts - start) / 3600, 2)
+        self.forecast_temp_series.data_points = [
+            ft.LineChartDataPoint(hours(ts), round(temp, 1)) for ts, temp in chart.temps
+        ]
+        self.forecast_temp_chart.min_x = 0
+        self.forecast_temp_chart.max_x = hours(chart.temps[-1][0])
+        self.forecast_temp_chart.min_y = int(chart.min_temp) - 2
+        self.forecast_temp_chart.max_y = int(chart.max_temp) + 2
+        self.forecast_temp_chart.bottom_axis.labels = [
+            ft.ChartAxisLabel(value=hours(ts), label=ft.Text(name, size=10))
+            for ts, name in chart.day_labels
+        ]
+        
+        bar_width = max(2, self.forecast_chart_width() // max(1, len(chart.precipitation)) - 3)
+        self.forecast_precip_chart.bar_groups = [
+            ft.BarChartGroup(x=i, bar_rods=[
+                ft.BarChartRod(from_y=0, to_y=round(mm, 1), width=bar_width,
+                               color=ft.Colors.BLUE_400, border_radius=2),
+            ])
+            for i, (_, mm) in enumerate(chart.precipitation)
+        ]
+        self.forecast_precip_chart.max_y = max(1, round(chart.max_precipitation + 0.5))
+        self.forecast_precip_chart.visible = chart.max_precipitation > 0
+        self.forecast_chart_column.visible = True
+    
+    def on_page_resized(self, e):
+        """Redraw the hourly chart for the new width."""
+        if self.forecast_container.visible and self.current_forecast_data:
+            self.render_forecast_chart(self.current_forecast_data)
+            self.request_update(self.forecast_container)
+    
+    def build_watchlist_panel(self):
+        """Build the watchlist view once; its cards are recycled between pages. (Feature 7)"""
+        self.watchlist_slots = []
+        self.watchlist_cards_column = ft.Column(
+            [],
+            spacing=10,
+            horizontal_alignment=ft.CrossAxisAlignment.STRETCH,
+        )
         
-        watchlist_cards = []
-        
-        # Header
         header = ft.Container(
             content=ft.Row([
                 ft.Text(
@@ -1064,121 +1681,451 @@ class WeatherApp:
                 ft.IconButton(
                     icon=ft.Icons.REFRESH,
                     tooltip="Refresh all",
-                    on_click=lambda e: self.page.run_task(self.refresh_watchlist),
+                    on_click=lambda e: self.view_tasks.start("watchlist", self.refresh_watchlist),
                 ),
             ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
             padding=10,
         )
-        watchlist_cards.append(header)
         
-        # Fetch weather for all watchlist cities
-        for city in self.watchlist:
-            try:
-                weather_data = await self.weather_service.get_weather(city, units=self.current_unit)
-                card = self.create_watchlist_city_card(city, weather_data)
-                watchlist_cards.append(card)
-            except Exception as e:
-                # Create error card for failed cities
-                error_card = ft.Container(
-                    content=ft.Column([
-                        ft.Text(f"❌ {city}", weight=ft.FontWeight.BOLD),
-                        ft.Text("Failed to load", size=12, color=ft.Colors.RED),
-                        ft.ElevatedButton(
-                            "Remove",
-                            icon=ft.Icons.DELETE,
-                            on_click=lambda e, c=city: self.remove_from_watchlist(c),
-                            style=ft.ButtonStyle(
-                                bgcolor=ft.Colors.RED_100,
-                                color=ft.Colors.RED_700,
-                            ),
-                        ),
-                    ]),
-                    bgcolor=ft.Colors.RED_50,
-                    border_radius=10,
-                    padding=15,
-                    border=ft.border.all(2, ft.Colors.RED_300),
-                )
-                watchlist_cards.append(error_card)
+        self.watchlist_filter = ft.TextField(
+            hint_text="Filter by city or condition",
+            prefix_icon=ft.Icons.SEARCH,
+            dense=True,
+            expand=True,
+            on_change=self.on_watchlist_filter,
+        )
+        self.watchlist_sort = ft.Dropdown(
+            value="added",
+            options=[
+                ft.dropdown.Option(key=key, text=label)
+                for key, label in WatchlistIndex.SORTS.items()
+            ],
+            dense=True,
+            width=150,
+            on_change=self.on_watchlist_sort,
+        )
+        self.watchlist_tools = ft.Row([self.watchlist_filter, self.watchlist_sort])
+        
+        self.watchlist_empty = ft.Column([
+            ft.Text(
+                "No cities in watchlist",
+                size=18,
+                weight=ft.FontWeight.BOLD,
+                text_align=ft.TextAlign.CENTER,
+            ),
+            ft.Text(
+                "Add cities using the 'Add to Watchlist' button",
+                size=14,
+                color=ft.Colors.GREY_600,
+                text_align=ft.TextAlign.CENTER,
+            ),
+        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, visible=False)
+        
+        self.watchlist_prev_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_LEFT,
+            tooltip="Previous page",
+            on_click=lambda e: self.change_watchlist_page(-1),
+        )
+        self.watchlist_next_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_RIGHT,
+            tooltip="Next page",
+            on_click=lambda e: self.change_watchlist_page(1),
+        )
+        self.watchlist_page_text = ft.Text("", size=12, color=ft.Colors.GREY_600)
+        self.watchlist_pager = ft.Row(
+            [self.watchlist_prev_button, self.watchlist_page_text, self.watchlist_next_button],
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
         
         self.watchlist_container.content = ft.Column(
-            watchlist_cards,
+            [
+                header,
+                self.watchlist_tools,
+                self.watchlist_empty,
+                self.watchlist_cards_column,
+                self.watchlist_pager,
+            ],
             spacing=10,
             horizontal_alignment=ft.CrossAxisAlignment.STRETCH,
         )
-        
-        self.watchlist_container.visible = True
-        self.page.update()
     
-    def create_watchlist_city_card(self, city, weather_data):
-        """Create a card for watchlist city display. (Feature 7)"""
-        temp = weather_data.get("main", {}).get("temp", 0)
-        condition = weather_data.get("weather", [{}])[0].get("main", "Clear")
-        description = weather_data.get("weather", [{}])[0].get("description", "").title()
-        humidity = weather_data.get("main", {}).get("humidity", 0)
-        wind_speed = weather_data.get("wind", {}).get("speed", 0)
-        
-        theme = self.get_weather_theme(condition)
-        unit_symbol = "°F" if self.current_unit == "imperial" else "°C"
-        
-        return ft.Container(
+    def create_watchlist_slot(self):
+        """Create a reusable watchlist city card."""
+        slot = {
+            "city": None,
+            "fingerprint": None,
+            "emoji": ft.Text("", size=30),
+            "temp": ft.Text("", size=16, weight=ft.FontWeight.BOLD),
+            "name": ft.Text("", size=16, weight=ft.FontWeight.BOLD),
+            "description": ft.Text("", size=12),
+            "details": ft.Text("", size=10),
+            "sparkline": ft.Text("", size=10, visible=False),
+        }
+        # Buttons read the slot's current city, so they survive recycling
+        slot["view"] = ft.ElevatedButton(
+            "View",
+            icon=ft.Icons.VISIBILITY,
+            on_click=lambda e: self.load_city_from_watchlist(slot["city"]),
+        )
+        slot["remove"] = ft.ElevatedButton(
+            "Remove",
+            icon=ft.Icons.DELETE,
+            on_click=lambda e: self.remove_from_watchlist(slot["city"]),
+            style=ft.ButtonStyle(
+                bgcolor=ft.Colors.RED_100,
+                color=ft.Colors.RED_700,
+            ),
+        )
+        slot["card"] = ft.Container(
             content=ft.Row([
                 ft.Container(
-                    content=ft.Column([
-                        ft.Text(theme["emoji"], size=30),
-                        ft.Text(f"{temp:.0f}{unit_symbol}", size=16, weight=ft.FontWeight.BOLD),
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                    content=ft.Column(
+                        [slot["emoji"], slot["temp"]],
+                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    ),
                     width=80,
                 ),
-                ft.Column([
-                    ft.Text(city, size=16, weight=ft.FontWeight.BOLD, color=theme["primary"]),
-                    ft.Text(description, size=12, color=theme["secondary"]),
-                    ft.Text(f"💧{humidity}% | 💨{wind_speed:.1f}m/s", size=10),
-                ], expand=True),
-                ft.Column([
-                    ft.ElevatedButton(
-                        "View",
-                        icon=ft.Icons.VISIBILITY,
-                        on_click=lambda e, c=city: self.load_city_from_watchlist(c),
-                        style=ft.ButtonStyle(
-                            bgcolor=theme["primary"],
-                            color=ft.Colors.WHITE,
-                        ),
-                    ),
-                    ft.ElevatedButton(
-                        "Remove",
-                        icon=ft.Icons.DELETE,
-                        on_click=lambda e, c=city: self.remove_from_watchlist(c),
-                        style=ft.ButtonStyle(
-                            bgcolor=ft.Colors.RED_100,
-                            color=ft.Colors.RED_700,
-                        ),
-                    ),
-                ]),
+                ft.Column(
+                    [slot["name"], slot["description"], slot["details"], slot["sparkline"]],
+                    expand=True,
+                ),
+                ft.Column([slot["view"], slot["remove"]]),
             ], vertical_alignment=ft.CrossAxisAlignment.CENTER),
-            bgcolor=theme["bg"],
             border_radius=10,
             padding=15,
-            border=ft.border.all(2, theme["primary"]),
         )
+        return slot
+    
+    def fill_watchlist_slot(self, slot, city, snapshot):
+        """Show a city's latest snapshot (or its loading/error state) in a card.
+        
+        Returns:
+            False if the card already showed exactly this, True otherwise
+        """
+        card = slot["card"]
+        fingerprint = (city, snapshot.fingerprint() if snapshot is not None else None)
+        if fingerprint == slot["fingerprint"] and card.visible:
+            return False
+        slot["fingerprint"] = fingerprint
+        slot["city"] = city
+        card.visible = True
+        
+        if snapshot is None or snapshot.error:
+            failed = snapshot is not None
+            slot["emoji"].value = "❌" if failed else "⏳"
+            slot["temp"].value = ""
+            slot["name"].value = city
+            slot["name"].color = ft.Colors.RED_700 if failed else ft.Colors.GREY_700
+            slot["description"].value = "Failed to load" if failed else "Loading..."
+            slot["description"].color = ft.Colors.RED if failed else ft.Colors.GREY_600
+            slot["details"].value = ""
+            slot["sparkline"].visible = False
+            slot["view"].visible = False
+            card.bgcolor = ft.Colors.RED_50 if failed else ft.Colors.GREY_50
+            card.border = ft.border.all(2, ft.Colors.RED_300 if failed else ft.Colors.GREY_300)
+            return True
+        
+        theme = self.get_weather_theme(snapshot.condition)
+        unit_symbol = "°F" if snapshot.units == "imperial" else "°C"
+        slot["emoji"].value = theme["emoji"]
+        slot["temp"].value = f"{snapshot.temp:.0f}{unit_symbol}"
+        slot["name"].value = city
+        slot["name"].color = theme["primary"]
+        slot["description"].value = snapshot.description
+        slot["description"].color = theme["secondary"]
+        slot["details"].value = f"💧{snapshot.humidity}% | 💨{snapshot.wind_speed:.1f}m/s"
+        if snapshot.stale:
+            slot["details"].value += " | ⚠️ update failed"
+        sparkline = self.create_sparkline(city)
+        slot["sparkline"].value = f"24h {sparkline}" if sparkline else ""
+        slot["sparkline"].color = theme["secondary"]
+        slot["sparkline"].visible = bool(sparkline)
+        slot["view"].visible = True
+        slot["view"].style = ft.ButtonStyle(bgcolor=theme["primary"], color=ft.Colors.WHITE)
+        card.bgcolor = theme["bg"]
+        card.border = ft.border.all(2, theme["primary"])
+        return True
+    
+    def render_watchlist(self):
+        """Fill the recycled cards with the current page of the filtered, sorted watchlist.
+        
+        Returns:
+            (visible cities, the cities of the whole view, index of the first visible one)
+        """
+        cities = self.watchlist_index.view(self.watchlist_sort.value, self.watchlist_filter.value)
+        page_size = Config.WATCHLIST_PAGE_SIZE
+        page_count = max(1, -(-len(cities) // page_size))
+        self.watchlist_page = min(max(self.watchlist_page, 0), page_count - 1)
+        start = self.watchlist_page * page_size
+        visible = cities[start:start + page_size]
+        
+        self.ensure_slots(
+            self.watchlist_slots, self.watchlist_cards_column, len(visible),
+            self.create_watchlist_slot, "card",
+        )
+        changed = False
+        for i, slot in enumerate(self.watchlist_slots):
+            if i < len(visible):
+                changed |= self.fill_watchlist_slot(
+                    slot, visible[i], self.watchlist_index.get(visible[i])
+                )
+            else:
+                changed |= slot["card"].visible
+                slot["city"] = None
+                slot["fingerprint"] = None
+                slot["card"].visible = False
+        
+        has_cities = bool(self.watchlist)
+        if visible:
+            page_text = f"{start + 1}-{start + len(visible)} of {len(cities)}"
+        else:
+            page_text = "No matching cities"
+        chrome = (has_cities, page_count, self.watchlist_page, page_text)
+        changed |= chrome != self.rendered_watchlist_chrome or not self.watchlist_container.visible
+        self.rendered_watchlist_chrome = chrome
+        self.count_render("watchlist", changed)
+        if not changed:
+            return visible, cities, start  # nothing on screen would change
+        
+        self.watchlist_empty.visible = not has_cities
+        self.watchlist_tools.visible = has_cities
+        self.watchlist_pager.visible = has_cities and page_count > 1
+        self.watchlist_prev_button.disabled = self.watchlist_page == 0
+        self.watchlist_next_button.disabled = self.watchlist_page >= page_count - 1
+        self.watchlist_page_text.value = page_text
+        self.watchlist_container.visible = True
+        self.request_update(self.watchlist_container)
+        return visible, cities, start
+    
+    async def display_watchlist(self, refresh: bool = False):
+        """Display the current page of the watchlist. (Feature 7)
+        
+        Only the visible cities are fetched, plus the next few as a
+        prefetch margin, so opening a watchlist of hundreds of cities
+        costs one page of cards and requests.
+        """
+        ttl = 0 if refresh else Config.CACHE_TTL
+        visible, cities, start = self.render_watchlist()
+        
+        missing = self.watchlist_index.needs_fetch(visible, ttl, self.current_unit)
+        if missing:
+            await self.fetch_watchlist_cities(missing)
+            if self.view_tasks.superseded():
+                return
+            visible, cities, start = self.render_watchlist()
+        
+        end = start + len(visible)
+        margin = cities[end:end + Config.WATCHLIST_PREFETCH]
+        await self.fetch_watchlist_cities(
+            self.watchlist_index.needs_fetch(margin, Config.CACHE_TTL, self.current_unit)
+        )
+    
+    async def fetch_watchlist_cities(self, cities, concurrency: int = None):
+        """Fetch weather for some watchlist cities into the snapshot index.
+        
+        A city whose refresh fails keeps its previous snapshot, marked
+        stale; only a city never loaded shows the error. `concurrency`
+        caps the requests in flight at once (default: all of them).
+        """
+        units = self.current_unit
+        slots = asyncio.Semaphore(concurrency or max(1, len(cities)))
+        
+        async def fetch(city):
+            try:
+                async with slots, deadline(Config.ACTION_DEADLINE):
+                    weather_data = await self.weather_service.get_weather(
+                        city, units=units, session_id=self.session_id
+                    )
+                await self.record_observation(city, weather_data, units)
+                snapshot = WatchlistSnapshot.from_payload(city, weather_data, units)
+            except Exception as e:
+                previous = self.watchlist_index.get(city)
+                if previous is not None and previous.error is None and previous.units == units:
+                    snapshot = previous.as_stale()
+                else:
+                    snapshot = WatchlistSnapshot.failed(city, str(e), units)
+            self.watchlist_index.update(snapshot)
+            self.notify_alert_changes(self.alert_monitor.observe(snapshot))
+        
+        self.metrics.incr("watchlist_fetches", len(cities))
+        await asyncio.gather(*(fetch(city) for city in cities))
+    
+    def change_watchlist_page(self, delta: int):
+        """Show the previous or next page of the watchlist."""
+        self.update_scheduler.begin_interaction("watchlist_page")
+        self.watchlist_page += delta
+        self.view_tasks.start("watchlist", self.display_watchlist)
+    
+    def on_watchlist_filter(self, e):
+        """Filter the watchlist as the user types."""
+        self.update_scheduler.begin_interaction("watchlist_filter")
+        self.watchlist_page = 0
+        self.view_tasks.start("watchlist", self.display_watchlist)
+    
+    def on_watchlist_sort(self, e):
+        """Re-sort the watchlist."""
+        self.update_scheduler.begin_interaction("watchlist_sort")
+        self.watchlist_page = 0
+        self.view_tasks.start("watchlist", self.display_watchlist)
     
     def load_city_from_watchlist(self, city):
         """Load weather for a city from watchlist."""
+        self.update_scheduler.begin_interaction("watchlist_view_city")
         self.city_input.value = city
-        self.page.run_task(self.get_weather)
+        self.view_tasks.start("current", self.get_weather)
     
     def remove_from_watchlist(self, city):
         """Remove city from watchlist."""
+        self.update_scheduler.begin_interaction("remove_from_watchlist")
         if city in self.watchlist:
             self.watchlist.remove(city)
             self.save_watchlist()
+            self.watchlist_index.set_cities(self.watchlist)
+            self.alert_monitor.retain(self.watchlist)
             # Refresh watchlist display if it's currently visible
             if self.watchlist_container.visible:
-                self.page.run_task(self.display_watchlist)
+                self.view_tasks.start("watchlist", self.display_watchlist)
     
     async def refresh_watchlist(self):
         """Refresh all watchlist cities."""
+        self.update_scheduler.begin_interaction("refresh_watchlist")
         if self.watchlist_container.visible:
-            await self.display_watchlist()
+            await self.display_watchlist(refresh=True)
+    
+    def start_alert_monitor(self):
+        """Start the background watchlist alert check, unless it is running, off or the session ended."""
+        if not self.session_live:
+            return
+        if Config.ALERT_MONITOR_INTERVAL > 0 and not self.view_tasks.running("alert_monitor"):
+            self.view_tasks.start("alert_monitor", self.monitor_alerts)
+    
+    async def monitor_alerts(self):
+        """Re-check watchlist alerts in the background. (Feature 6)
+        
+        Each tick refetches the cities whose snapshot is older than the
+        cache TTL, oldest first, Config.ALERT_MONITOR_CONCURRENCY at a time
+        and only as many as the API budget allows beyond
+        Config.ALERT_MONITOR_RESERVE_TOKENS, so searches never wait on it;
+        the rest are picked up by later ticks. The alert rules then only
+        run for cities whose weather actually changed.
+        """
+        limiter = self.weather_service.rate_limiter
+        while self.watchlist:
+            await asyncio.sleep(Config.ALERT_MONITOR_INTERVAL)
+            stale = self.watchlist_index.needs_fetch(
+                self.watchlist, Config.CACHE_TTL, self.current_unit
+            )
+            if not stale:
+                continue
+            # The shared limiter may read its bucket from SQLite
+            available = await asyncio.to_thread(getattr, limiter, "available")
+            budget = int(available - Config.ALERT_MONITOR_RESERVE_TOKENS)
+            if budget <= 0:
+                self.metrics.incr("alert_monitor_deferred", len(stale))
+                continue
+            stale.sort(key=self.snapshot_age_key)
+            self.metrics.incr("alert_monitor_deferred", max(0, len(stale) - budget))
+            await self.fetch_watchlist_cities(
+                stale[:budget], concurrency=Config.ALERT_MONITOR_CONCURRENCY
+            )
+            if self.watchlist_container.visible:
+                self.render_watchlist()
+    
+    def snapshot_age_key(self, city):
+        """Sort key putting never-fetched, then least recently fetched, cities first."""
+        snapshot = self.watchlist_index.get(city)
+        return snapshot.fetched_at if snapshot is not None else 0.0
+    
+    def notify_alert_changes(self, changes):
+        """Tell the user about watchlist alerts that started or cleared. (Feature 6)"""
+        if not changes:
+            return
+        lines = []
+        for change in changes:
+            if change.started:
+                lines.append(f"{self.SEVERITY_TEXT[change.severity]} {change.city}: {change.title}")
+            else:
+                lines.append(f"✅ {change.city}: {change.title} cleared")
+            print(f"🔔 {lines[-1]}")
+        started = [change.severity for change in changes if change.started]
+        worst = min(started, key=["high", "medium", "low"].index) if started else None
+        if self.alert_snackbar is None:
+            self.alert_snackbar = ft.SnackBar(ft.Text("", color=ft.Colors.WHITE), duration=6000)
+        self.alert_snackbar.content.value = "\n".join(lines)
+        self.alert_snackbar.bgcolor = (
+            self.SEVERITY_BADGE_COLORS[worst] if worst else ft.Colors.GREEN_700
+        )
+        self.page.open(self.alert_snackbar)
+    
+    async def run_kiosk(self):
+        """Rotate through the watchlist on a wall display (--kiosk). (Feature 7)
+        
+        One-ahead pipeline: while a city is on screen the next one is
+        already being fetched, so a switch only fills the retained panels
+        with data that is waiting, and the spinner never shows. Nothing
+        is kept per rotation, so memory stays flat however long it runs.
+        """
+        upcoming = None  # (city, fetch task) shown at the next switch
+        try:
+            while True:
+                if not self.watchlist:
+                    await asyncio.sleep(Config.KIOSK_INTERVAL)
+                    continue
+                if upcoming is None:
+                    city = self.watchlist[0]
+                    upcoming = (city, asyncio.ensure_future(self.fetch_kiosk_city(city)))
+                city, fetch = upcoming
+                waited = time.perf_counter()
+                results = await fetch
+                self.metrics.observe("kiosk_fetch_wait_ms", (time.perf_counter() - waited) * 1000)
+                
+                # Start on the next city before drawing this one
+                cities = self.watchlist
+                position = cities.index(city) + 1 if city in cities else 0
+                following = cities[position % len(cities)] if cities else city
+                upcoming = (following, asyncio.ensure_future(self.fetch_kiosk_city(following)))
+                
+                if await self.show_kiosk_city(city, results):
+                    self.metrics.incr("kiosk_rotations")
+                await asyncio.sleep(Config.KIOSK_INTERVAL)
+        finally:
+            if upcoming is not None:
+                upcoming[1].cancel()
+    
+    async def fetch_kiosk_city(self, city: str) -> dict:
+        """Weather, forecast, air quality and UV of a city, as {part: result}."""
+        results = {}
+        dashboard = self.weather_service.dashboard(
+            city, units=self.current_unit, session_id=self.session_id
+        )
+        try:
+            async with deadline(Config.ACTION_DEADLINE):
+                async for part, result in dashboard:
+                    results[part] = result
+        except WeatherServiceError as e:
+            print(f"⚠️ Kiosk could not fetch {city}: {e}")  # Debug info
+        finally:
+            await dashboard.aclose()
+        return results
+    
+    async def show_kiosk_city(self, city: str, results: dict) -> bool:
+        """Show a fetched city in the retained panels; False keeps the previous one."""
+        weather_data = results.get("weather")
+        if not isinstance(weather_data, dict):
+            print(f"⚠️ Kiosk skipping {city}: {weather_data}")  # Debug info
+            return False
+        self.city_input.value = city
+        self.request_update(self.city_input)
+        await self.show_city_weather(city, weather_data, remember=False)
+        forecast = results.get("forecast")
+        if isinstance(forecast, dict):
+            await self.display_forecast(forecast)
+        for card, part, show in ((self.air_quality_card, "air", self.display_air_quality),
+                                 (self.uv_card, "uv", self.display_uv_index)):
+            card.visible = part in results
+            if card.visible:
+                show(results[part])
+        return True
     
     def create_info_card(self, icon, label, value, color):
         """Create info card with themed colors."""
@@ -1203,8 +2150,38 @@ class WeatherApp:
             width=150,
         )
     
+    def update_info_card(self, card, value, color):
+        """Update the value and color of a card made by create_info_card."""
+        icon, _, value_text = card.content.controls
+        icon.color = color
+        value_text.value = value
+        value_text.color = color
+    
+    def count_render(self, panel: str, changed: bool):
+        """Count a panel render, and whether it was skipped as unchanged."""
+        self.metrics.incr("panel_renders")
+        if not changed:
+            self.metrics.incr("panel_renders_suppressed")
+            self.metrics.incr(f"panel_renders_suppressed.{panel}")
+    
+    def stats(self) -> dict:
+        """Session metrics, the share of renders skipped as unchanged and loop stalls."""
+        snapshot = self.metrics.snapshot()
+        snapshot["suppressed_render_rate"] = self.metrics.ratio(
+            "panel_renders_suppressed", "panel_renders"
+        )
+        if self.loop_watchdog:
+            snapshot["loop_stalls"] = self.loop_watchdog.snapshot()
+        return snapshot
+    
+    def request_update(self, *controls):
+        """Queue a coalesced page update (flushed at most once per frame)."""
+        self.update_scheduler.request_update(*controls)
+    
     def show_error(self, message: str):
         """Display error message with improved formatting."""
+        if self.view_tasks.superseded():
+            return  # error of a search the user already replaced
         self.error_message.value = message
         self.error_message.visible = True
         self.weather_container.visible = False
@@ -1214,7 +2191,7 @@ class WeatherApp:
         # Print to console for debugging
         print(f"🚫 Error displayed to user: {message}")
         
-        self.page.update()
+        self.request_update()
 
 
 def main(page: ft.Page):
@@ -1222,5 +2199,40 @@ def main(page: ft.Page):
     WeatherApp(page)
 
 
+def run_web(workers: int, port: int):
+    """Serve the app in the browser, optionally with several worker processes.
+    
+    Each worker is a separate process with its own event loop; they share
+    the weather cache and API rate limit through a SQLite file (WAL mode).
+    Sessions stay on the worker that accepted their websocket.
+    """
+    import uvicorn
+    
+    if workers > 1 and not Config.SHARED_CACHE_PATH:
+        shared_path = Path("weather_app_data") / "shared_cache.db"
+        shared_path.parent.mkdir(exist_ok=True)
+        # Inherited by the worker processes, read by Config on import
+        os.environ["WEATHER_SHARED_CACHE"] = str(shared_path.resolve())
+    uvicorn.run("web_app:app", host="0.0.0.0", port=port, workers=workers)
+
+
 if __name__ == "__main__":
-    ft.app(target=main)
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description=Config.APP_TITLE)
+    parser.add_argument("--web", action="store_true", help="serve in the browser")
+    parser.add_argument("--workers", type=int, default=1, help="web worker processes")
+    parser.add_argument("--port", type=int, default=Config.WEB_PORT)
+    parser.add_argument("--kiosk", action="store_true",
+                        help="rotate through the watchlist (wall display)")
+    args = parser.parse_args()
+    
+    if args.kiosk:
+        # Inherited by web worker processes, read by Config on import
+        os.environ["WEATHER_KIOSK"] = "1"
+        Config.KIOSK = True
+    
+    if args.web or args.workers > 1:
+        run_web(args.workers, args.port)
+    else:
+        ft.app(target=main)
\ No newline at end of file
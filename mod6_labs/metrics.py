@@ -0,0 +1,96 @@
+"""Lightweight in-process metrics for the Weather App."""
+
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+class Metrics:
+    """Thread-safe counters and timing summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, amount: int = 1):
+        """Increase a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float):
+        """Record one sample of a measured value (e.g. a latency in ms)."""
+        with self._lock:
+            summary = self.timings.get(name)
+            if summary is None:
+                self.timings[name] = {
+                    "count": 1, "total": value, "min": value, "max": value, "last": value,
+                }
+                return
+            summary["count"] += 1
+            summary["total"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    def get(self, name: str) -> int:
+        """Current value of a counter."""
+        return self.counters.get(name, 0)
+
+    def mean(self, name: str) -> Optional[float]:
+        """Average of an observed value, or None before the first sample."""
+        summary = self.timings.get(name)
+        if not summary:
+            return None
+        return summary["total"] / summary["count"]
+
+    def ratio(self, numerator: str, denominator: str) -> float:
+        """Ratio of two counters, 0.0 when the denominator is zero."""
+        total = self.get(denominator)
+        return self.get(numerator) / total if total else 0.0
+
+    def snapshot(self) -> Dict:
+        """Copy of all metrics, safe to serialize."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "timings": {
+                    name: dict(summary, mean=summary["total"] / summary["count"])
+                    for name, summary in self.timings.items()
+                },
+            }
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent latencies with percentile queries.
+
+    Used to derive hedging delays: only the last `window` samples count, so
+    the percentiles follow the provider as its latency changes.
+    """
+
+    def __init__(self, window: int = 500):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        """Add one latency sample."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Latency below which `q` percent of recent samples fall.
+
+        Returns:
+            Seconds (nearest-rank), or None before the first sample
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered))) - 1))
+        return ordered[rank]
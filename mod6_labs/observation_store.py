@@ -0,0 +1,570 @@
+"""Append-only per-city time-series store for weather observations."""
+
+import bisect
+import itertools
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config import Config
+from search_history import canonical_city_key
+
+
+# Stored fields, always in metric units
+FIELDS = ("temp", "feels_like", "humidity", "pressure", "wind_speed")
+
+# One packed sample: seconds since chunk start + one float32 per field
+RECORD = struct.Struct("<I" + "f" * len(FIELDS))
+
+# Per-chunk min/max/sum of every field, kept up to date on append
+STATS = struct.Struct("<" + "d" * (3 * len(FIELDS)))
+
+# Samples are grouped into one row per city per day
+CHUNK_SECONDS = 24 * 3600
+
+# Running mean and sum of squared deviations (Welford) of every field
+BASELINE = struct.Struct("<" + "dd" * len(FIELDS))
+
+# Smallest departure from normal worth reporting, per checked field (metric)
+ANOMALY_MIN_DELTA = {"temp": 3.0, "humidity": 20.0, "wind_speed": 4.0}
+
+
+class Anomaly(NamedTuple):
+    """A reading unusually far from its city's normal for the hour of day."""
+    field: str
+    value: float
+    normal: float
+    std: float
+    samples: int
+
+    @property
+    def delta(self) -> float:
+        return self.value - self.normal
+
+
+def decode_chunk(data: bytes, sealed: bool = False) -> Tuple[tuple, List[tuple]]:
+    """
+    Unpack a chunk blob in one call.
+
+    Returns:
+        (offsets, [column per field]) where offsets are seconds since the
+        chunk start
+    """
+    if sealed:
+        return _unseal(data)
+    count = len(data) // RECORD.size
+    flat = struct.unpack("<" + RECORD.format[1:] * count, data)
+    width = len(FIELDS) + 1
+    return flat[0::width], [flat[i::width] for i in range(1, width)]
+
+
+def seal_chunk(data: bytes) -> bytes:
+    """
+    Compress a chunk that will not be appended to any more.
+
+    Samples are stored column by column (offset deltas, then each field),
+    and the 4-byte values are split into byte planes before zlib, so the
+    slowly changing high bytes of neighbouring readings compress to almost
+    nothing.
+    """
+    offsets, columns = decode_chunk(data)
+    count = len(offsets)
+    deltas = [b - a for a, b in zip((0,) + offsets[:-1], offsets)]
+    body = struct.pack(f"<{count}I", *deltas) + b"".join(
+        struct.pack(f"<{count}f", *column) for column in columns
+    )
+    planes = b"".join(body[i::4] for i in range(4))
+    return zlib.compress(planes, 9)
+
+
+def _unseal(data: bytes) -> Tuple[tuple, List[tuple]]:
+    planes = zlib.decompress(data)
+    size = len(planes) // 4
+    body = bytearray(len(planes))
+    for i in range(4):
+        body[i::4] = planes[i * size:(i + 1) * size]
+    count = len(body) // RECORD.size
+    offsets = tuple(itertools.accumulate(struct.unpack_from(f"<{count}I", body)))
+    column = struct.Struct(f"<{count}f")
+    columns = [
+        column.unpack_from(body, 4 * count * (i + 1)) for i in range(len(FIELDS))
+    ]
+    return offsets, columns
+
+
+def _merge_stats(stats: Optional[bytes], values) -> bytes:
+    """Fold one sample into a chunk's packed min/max/sum summary."""
+    if stats is None:
+        return STATS.pack(*values, *values, *values)
+    current = STATS.unpack(stats)
+    size = len(FIELDS)
+    mins = [min(a, b) for a, b in zip(current[:size], values)]
+    maxs = [max(a, b) for a, b in zip(current[size:2 * size], values)]
+    sums = [a + b for a, b in zip(current[2 * size:], values)]
+    return STATS.pack(*mins, *maxs, *sums)
+
+
+def _fold_baseline(n: int, baseline: Optional[bytes], values) -> Tuple[int, bytes]:
+    """
+    Add one sample to an hour's running statistics in O(1) (Welford).
+
+    Past Config.BASELINE_WINDOW samples the oldest weight is faded out
+    instead (the count stays at the window), so the baseline follows the
+    seasons rather than averaging every year ever stored.
+    """
+    if baseline is None:
+        return 1, BASELINE.pack(*itertools.chain.from_iterable((v, 0.0) for v in values))
+    stats = BASELINE.unpack(baseline)
+    keep = 1.0
+    if n >= Config.BASELINE_WINDOW:
+        n = Config.BASELINE_WINDOW - 1
+        keep = n / Config.BASELINE_WINDOW
+    n += 1
+    folded = []
+    for mean, m2, value in zip(stats[0::2], stats[1::2], values):
+        delta = value - mean
+        mean += delta / n
+        folded += (mean, m2 * keep + delta * (value - mean))
+    return n, BASELINE.pack(*folded)
+
+
+def hour_of_day(timestamp: float) -> int:
+    """
+    Baseline bucket of a timestamp: its hour of day in UTC.
+
+    A city's UTC offset is fixed apart from daylight saving, so the UTC hour
+    stands for the same time of day there and needs no time zone per city.
+    """
+    return int(timestamp // 3600) % 24
+
+
+def observation_from_payload(data: Dict, units: str = "metric") -> Tuple[int, Tuple[float, ...]]:
+    """
+    Extract a (timestamp, values) sample from a /weather response.
+
+    Imperial readings are converted so every stored sample is metric.
+    """
+    main = data.get("main", {})
+    temp = float(main.get("temp", 0))
+    feels_like = float(main.get("feels_like", 0))
+    wind_speed = float(data.get("wind", {}).get("speed", 0))
+    if units == "imperial":
+        temp = (temp - 32) * 5 / 9
+        feels_like = (feels_like - 32) * 5 / 9
+        wind_speed = wind_speed * 0.44704  # mph -> m/s
+    elif units == "standard":
+        temp -= 273.15
+        feels_like -= 273.15
+
+    timestamp = int(data.get("dt") or time.time())
+    return timestamp, (
+        temp,
+        feels_like,
+        float(main.get("humidity", 0)),
+        float(main.get("pressure", 0)),
+        wind_speed,
+    )
+
+
+class ObservationStore:
+    """
+    Compact time series of observations per city, backed by SQLite.
+
+    Each (city, day) is one row whose blob holds fixed-size packed samples,
+    so appending extends one small blob and a range query reads a handful
+    of rows regardless of how many years are stored. Samples must arrive
+    in time order per city; repeated or older timestamps are ignored,
+    which also dedupes the same API observation fetched twice.
+    
+    When a city's first sample of a new day arrives, its earlier days can
+    no longer change and are sealed (compressed with seal_chunk()).
+    
+    Every append also folds the sample into its city's running statistics
+    for that hour of day, so anomalies() compares a reading with what is
+    normal at that time without reading any history.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cities (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                city_id INTEGER NOT NULL,
+                chunk_start INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                stats BLOB NOT NULL,
+                sealed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (city_id, chunk_start)
+            ) WITHOUT ROWID;
+            """
+        )
+        has_baselines = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'baselines'"
+        ).fetchone()
+        if not has_baselines:
+            self._conn.execute(
+                """
+                CREATE TABLE baselines (
+                    city_id INTEGER NOT NULL,
+                    hour INTEGER NOT NULL,
+                    n INTEGER NOT NULL,
+                    stats BLOB NOT NULL,
+                    PRIMARY KEY (city_id, hour)
+                ) WITHOUT ROWID
+                """
+            )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")]
+        if "sealed" not in columns:
+            # Database from before sealing: compress its finished days once
+            self._conn.execute("ALTER TABLE chunks ADD COLUMN sealed INTEGER NOT NULL DEFAULT 0")
+            self._seal_closed_chunks()
+        if not has_baselines:
+            # Database from before baselines: build them from the history once
+            self._build_baselines()
+        self._conn.commit()
+        self._city_ids: Dict[str, int] = {}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _city_id(self, city: str, create: bool = False) -> Optional[int]:
+        key = canonical_city_key(city)
+        city_id = self._city_ids.get(key)
+        if city_id is not None:
+            return city_id
+        row = self._conn.execute("SELECT id FROM cities WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            if not create or not key:
+                return None
+            cursor = self._conn.execute(
+                "INSERT INTO cities (key, name) VALUES (?, ?)", (key, city.strip())
+            )
+            city_id = cursor.lastrowid
+        else:
+            city_id = row[0]
+        self._city_ids[key] = city_id
+        return city_id
+
+    def _last_timestamp(self, city_id: int) -> int:
+        """Timestamp of the city's newest stored sample, as committed in the file."""
+        row = self._conn.execute(
+            "SELECT chunk_start, data, sealed FROM chunks WHERE city_id = ? "
+            "ORDER BY chunk_start DESC LIMIT 1",
+            (city_id,),
+        ).fetchone()
+        if row is None:
+            return -1
+        if row[2]:
+            return row[0] + decode_chunk(row[1], sealed=True)[0][-1]
+        return row[0] + RECORD.unpack_from(row[1], len(row[1]) - RECORD.size)[0]
+
+    def _seal_before(self, city_id: int, chunk_start: int):
+        """Seal a city's open chunks older than chunk_start."""
+        rows = self._conn.execute(
+            "SELECT chunk_start, data FROM chunks "
+            "WHERE city_id = ? AND chunk_start < ? AND sealed = 0",
+            (city_id, chunk_start),
+        ).fetchall()
+        for start, data in rows:
+            self._conn.execute(
+                "UPDATE chunks SET data = ?, sealed = 1 WHERE city_id = ? AND chunk_start = ?",
+                (seal_chunk(data), city_id, start),
+            )
+
+    def _seal_closed_chunks(self):
+        """Seal every chunk except each city's latest."""
+        latest = self._conn.execute(
+            "SELECT city_id, MAX(chunk_start) FROM chunks GROUP BY city_id"
+        ).fetchall()
+        for city_id, chunk_start in latest:
+            self._seal_before(city_id, chunk_start)
+
+    def _fold(self, city_id: int, timestamp: int, values):
+        """Add one sample to the baseline of its hour of day."""
+        hour = hour_of_day(timestamp)
+        row = self._conn.execute(
+            "SELECT n, stats FROM baselines WHERE city_id = ? AND hour = ?", (city_id, hour)
+        ).fetchone()
+        n, stats = _fold_baseline(row[0] if row else 0, row[1] if row else None, values)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO baselines (city_id, hour, n, stats) VALUES (?, ?, ?, ?)",
+            (city_id, hour, n, stats),
+        )
+
+    def _build_baselines(self):
+        """Fold every stored sample into the baselines, oldest first."""
+        baselines: Dict[Tuple[int, int], Tuple[int, Optional[bytes]]] = {}
+        rows = self._conn.execute(
+            "SELECT city_id, chunk_start, data, sealed FROM chunks ORDER BY city_id, chunk_start"
+        )
+        for city_id, chunk_start, data, sealed in rows:
+            offsets, columns = decode_chunk(data, sealed)
+            for offset, values in zip(offsets, zip(*columns)):
+                key = (city_id, hour_of_day(chunk_start + offset))
+                baselines[key] = _fold_baseline(*baselines.get(key, (0, None)), values)
+        self._conn.executemany(
+            "INSERT INTO baselines (city_id, hour, n, stats) VALUES (?, ?, ?, ?)",
+            [(city_id, hour, n, stats) for (city_id, hour), (n, stats) in baselines.items()],
+        )
+
+    def append(self, city: str, timestamp: int, values) -> bool:
+        """
+        Append one sample for a city.
+
+        Args:
+            city: City name (deduped by canonical key)
+            timestamp: Observation time in Unix seconds
+            values: One float per entry in FIELDS, metric units
+
+        Returns:
+            True if stored, False if it was not newer than the last sample
+        """
+        with self._lock:
+            # Other worker processes append to the same file: the last
+            # timestamp is read and the day's blob rewritten under one
+            # write lock, so no sample is lost or stored twice
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                stored = self._append(city, timestamp, values)
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                self._city_ids.pop(canonical_city_key(city), None)
+                raise
+            return stored
+
+    def _append(self, city: str, timestamp: int, values) -> bool:
+        """append() inside its transaction."""
+        city_id = self._city_id(city, create=True)
+        if city_id is None or timestamp <= self._last_timestamp(city_id):
+            return False
+
+        chunk_start = timestamp - timestamp % CHUNK_SECONDS
+        record = RECORD.pack(timestamp - chunk_start, *values)
+        # Round-trip through float32 so the summary matches stored samples
+        values = RECORD.unpack(record)[1:]
+        # SQLite's || operator yields TEXT, so blobs are extended here
+        row = self._conn.execute(
+            "SELECT data, stats FROM chunks WHERE city_id = ? AND chunk_start = ?",
+            (city_id, chunk_start),
+        ).fetchone()
+        if row is None:
+            self._seal_before(city_id, chunk_start)
+            self._conn.execute(
+                "INSERT INTO chunks (city_id, chunk_start, n, data, stats) "
+                "VALUES (?, ?, 1, ?, ?)",
+                (city_id, chunk_start, record, _merge_stats(None, values)),
+            )
+        else:
+            self._conn.execute(
+                "UPDATE chunks SET data = ?, stats = ?, n = n + 1 "
+                "WHERE city_id = ? AND chunk_start = ?",
+                (row[0] + record, _merge_stats(row[1], values), city_id, chunk_start),
+            )
+        self._fold(city_id, timestamp, values)
+        return True
+
+    def append_payload(self, city: str, data: Dict, units: str = "metric") -> bool:
+        """Append the observation contained in a /weather API response."""
+        timestamp, values = observation_from_payload(data, units)
+        return self.append(city, timestamp, values)
+
+    def baseline(self, city: str, hour: int) -> Dict[str, Dict[str, float]]:
+        """
+        A city's normal weather at one hour of day (UTC, see hour_of_day()).
+
+        Returns:
+            {field: {"mean", "std", "count"}}; empty if no samples yet
+        """
+        with self._lock:
+            city_id = self._city_id(city)
+            if city_id is None:
+                return {}
+            row = self._conn.execute(
+                "SELECT n, stats FROM baselines WHERE city_id = ? AND hour = ?", (city_id, hour)
+            ).fetchone()
+        if row is None:
+            return {}
+        n, stats = row[0], BASELINE.unpack(row[1])
+        return {
+            field: {
+                "mean": stats[2 * i],
+                "std": (stats[2 * i + 1] / (n - 1)) ** 0.5 if n > 1 else 0.0,
+                "count": n,
+            }
+            for i, field in enumerate(FIELDS)
+        }
+
+    def anomalies(self, city: str, timestamp: int, values) -> List[Anomaly]:
+        """
+        Readings unusually far from the city's baseline for their hour.
+
+        A reading counts when it is at least Config.ANOMALY_Z standard
+        deviations and ANOMALY_MIN_DELTA away from the mean, and the hour has
+        Config.ANOMALY_MIN_SAMPLES samples. Call this before appending the
+        sample, so it is not compared with itself.
+
+        Args:
+            values: One float per entry in FIELDS, metric units
+
+        Returns:
+            Anomalies of the fields in ANOMALY_MIN_DELTA, largest first
+        """
+        baseline = self.baseline(city, hour_of_day(timestamp))
+        found = []
+        for field, min_delta in ANOMALY_MIN_DELTA.items():
+            normal = baseline.get(field)
+            if not normal or normal["count"] < Config.ANOMALY_MIN_SAMPLES:
+                continue
+            value = values[FIELDS.index(field)]
+            distance = abs(value - normal["mean"])
+            if distance >= min_delta and distance >= Config.ANOMALY_Z * normal["std"]:
+                found.append(Anomaly(field, value, normal["mean"], normal["std"], normal["count"]))
+        found.sort(key=lambda a: abs(a.delta) / ANOMALY_MIN_DELTA[a.field], reverse=True)
+        return found
+
+    def anomalies_in_payload(self, city: str, data: Dict, units: str = "metric") -> List[Anomaly]:
+        """anomalies() of the observation contained in a /weather API response."""
+        timestamp, values = observation_from_payload(data, units)
+        return self.anomalies(city, timestamp, values)
+
+    def cities(self) -> List[str]:
+        """Display names of all cities with stored observations."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM cities ORDER BY key")]
+
+    def _chunks(self, city: str, start: float, end: float):
+        """Rows (chunk_start, n, data, stats, sealed) overlapping [start, end]."""
+        with self._lock:
+            city_id = self._city_id(city)
+            if city_id is None:
+                return []
+            return self._conn.execute(
+                "SELECT chunk_start, n, data, stats, sealed FROM chunks WHERE city_id = ? "
+                "AND chunk_start > ? AND chunk_start <= ? ORDER BY chunk_start",
+                (city_id, start - CHUNK_SECONDS, end),
+            ).fetchall()
+
+    def query(self, city: str, start: float, end: float) -> Dict[str, array]:
+        """
+        Samples for a city within [start, end].
+
+        Returns:
+            Column arrays: "ts" plus one array per entry in FIELDS
+        """
+        columns = {"ts": array("d")}
+        columns.update((field, array("d")) for field in FIELDS)
+        field_columns = [columns[field] for field in FIELDS]
+        for chunk_start, _, data, _, sealed in self._chunks(city, start, end):
+            offsets, values = decode_chunk(data, sealed)
+            # Offsets are sorted, so the range is a slice of each chunk
+            lo = bisect.bisect_left(offsets, start - chunk_start)
+            hi = bisect.bisect_right(offsets, end - chunk_start)
+            columns["ts"].extend(chunk_start + offset for offset in offsets[lo:hi])
+            for column, field_values in zip(field_columns, values):
+                column.extend(field_values[lo:hi])
+        return columns
+
+    def downsample(self, city: str, start: float, end: float, buckets: int,
+                   field: str = "temp") -> List[Tuple[float, float]]:
+        """
+        Mean of a field over equal-width time buckets (for sparklines).
+
+        Chunks that fall entirely inside one bucket are folded in from their
+        stored summary, so long ranges do not decode every sample.
+
+        Returns:
+            (bucket start, mean) pairs; empty buckets are omitted
+        """
+        if buckets <= 0 or end <= start:
+            return []
+        index = FIELDS.index(field)
+        size = len(FIELDS)
+        width = (end - start) / buckets
+        sums = [0.0] * buckets
+        counts = [0] * buckets
+
+        def bucket(timestamp):
+            return min(int((timestamp - start) / width), buckets - 1)
+
+        for chunk_start, n, data, stats, sealed in self._chunks(city, start, end):
+            chunk_end = chunk_start + CHUNK_SECONDS - 1
+            if chunk_start >= start and chunk_end <= end and bucket(chunk_start) == bucket(chunk_end):
+                i = bucket(chunk_start)
+                sums[i] += STATS.unpack(stats)[2 * size + index]
+                counts[i] += n
+                continue
+            offsets, values = decode_chunk(data, sealed)
+            for offset, value in zip(offsets, values[index]):
+                timestamp = chunk_start + offset
+                if start <= timestamp <= end:
+                    i = bucket(timestamp)
+                    sums[i] += value
+                    counts[i] += 1
+        return [
+            (start + i * width, sums[i] / counts[i])
+            for i in range(buckets) if counts[i]
+        ]
+
+    def rollup(self, city: str, start: float, end: float) -> Dict[str, Dict[str, float]]:
+        """
+        Min/max/mean of every field over a time range.
+
+        Whole days inside the range come from the per-chunk summaries; only
+        the partial days at either end are decoded.
+
+        Returns:
+            {field: {"min", "max", "mean", "count"}}; empty if no samples
+        """
+        size = len(FIELDS)
+        mins = [float("inf")] * size
+        maxs = [float("-inf")] * size
+        sums = [0.0] * size
+        count = 0
+        for chunk_start, n, data, stats, sealed in self._chunks(city, start, end):
+            if chunk_start >= start and chunk_start + CHUNK_SECONDS - 1 <= end:
+                summary = STATS.unpack(stats)
+                chunk_mins = summary[:size]
+                chunk_maxs = summary[size:2 * size]
+                chunk_sums = summary[2 * size:]
+            else:
+                offsets, values = decode_chunk(data, sealed)
+                lo = bisect.bisect_left(offsets, start - chunk_start)
+                hi = bisect.bisect_right(offsets, end - chunk_start)
+                if lo == hi:
+                    continue
+                n = hi - lo
+                chunk_mins = [min(column[lo:hi]) for column in values]
+                chunk_maxs = [max(column[lo:hi]) for column in values]
+                chunk_sums = [sum(column[lo:hi]) for column in values]
+            mins = [min(a, b) for a, b in zip(mins, chunk_mins)]
+            maxs = [max(a, b) for a, b in zip(maxs, chunk_maxs)]
+            sums = [a + b for a, b in zip(sums, chunk_sums)]
+            count += n
+        if not count:
+            return {}
+        return {
+            field: {
+                "min": mins[i],
+                "max": maxs[i],
+                "mean": sums[i] / count,
+                "count": count,
+            }
+            for i, field in enumerate(FIELDS)
+        }
@@ -0,0 +1,97 @@
+"""Compact binary encoding for API payloads kept on disk.
+
+Payloads are compact JSON compressed with zlib using a preset dictionary
+of the keys and values every OpenWeatherMap response repeats (field
+names, condition texts, forecast item layout). The dictionary lets even a
+single small /weather response compress well, which plain zlib cannot do
+without any history to refer back to.
+
+The first byte is a format version, so the dictionary can be extended
+later without breaking payloads already stored with an older one.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Union
+
+# Condition texts as they appear in responses ("main" and "description")
+_CONDITIONS = (
+    '"main":"Thunderstorm","description":"thunderstorm with rain"'
+    '"main":"Drizzle","description":"light intensity drizzle"'
+    '"main":"Snow","description":"light snow"'
+    '"main":"Mist","description":"mist"'
+    '"main":"Fog","description":"fog"'
+    '"main":"Haze","description":"haze"'
+    '"main":"Clear","description":"clear sky"'
+    '"main":"Clouds","description":"few clouds"'
+    '"main":"Clouds","description":"scattered clouds"'
+    '"main":"Clouds","description":"broken clouds"'
+    '"main":"Rain","description":"moderate rain"'
+)
+
+# The layout of a /weather response and of one /forecast list item, in the
+# order the API sends keys; most frequent strings last (zlib prefers
+# matches near the end of the dictionary)
+_CURRENT = (
+    '{"coord":{"lon":0,"lat":0},"weather":[{"id":800,"main":"Clear",'
+    '"description":"clear sky","icon":"01d"}],"base":"stations","main":{"temp":0,'
+    '"feels_like":0,"temp_min":0,"temp_max":0,"pressure":1013,"humidity":0,'
+    '"sea_level":1013,"grnd_level":1000},"visibility":10000,"wind":{"speed":0,'
+    '"deg":0,"gust":0},"rain":{"1h":0},"snow":{"1h":0},"clouds":{"all":0},"dt":0,'
+    '"sys":{"type":2,"id":0,"country":"","sunrise":0,"sunset":0},"timezone":0,'
+    '"id":0,"name":"","cod":200}'
+)
+_FORECAST = (
+    '{"cod":"200","message":0,"cnt":40,"list":[],"city":{"id":0,"name":"",'
+    '"coord":{"lat":0,"lon":0},"country":"","population":0,"timezone":0,'
+    '"sunrise":0,"sunset":0}}'
+    '{"dt":0,"main":{"temp":0,"feels_like":0,"temp_min":0,"temp_max":0,'
+    '"pressure":1013,"sea_level":1013,"grnd_level":1000,"humidity":0,"temp_kf":0},'
+    '"weather":[{"id":803,"main":"Clouds","description":"overcast clouds",'
+    '"icon":"04n"}],"clouds":{"all":0},"wind":{"speed":0,"deg":0,"gust":0},'
+    '"visibility":10000,"pop":0,"rain":{"3h":0},"sys":{"pod":"d"},'
+    '"dt_txt":"2000-01-01 12:00:00"},'
+    '{"dt":0,"main":{"temp":0,"feels_like":0,"temp_min":0,"temp_max":0,'
+    '"pressure":1013,"sea_level":1013,"grnd_level":1000,"humidity":0,"temp_kf":0},'
+    '"weather":[{"id":500,"main":"Rain","description":"light rain","icon":"10d"}],'
+    '"clouds":{"all":0},"wind":{"speed":0,"deg":0,"gust":0},"visibility":10000,'
+    '"pop":0,"sys":{"pod":"n"},"dt_txt":"2000-01-01 00:00:00"},'
+)
+
+# Version 1 dictionary; never change it, add a new version instead
+DICTIONARY = (_CONDITIONS + _CURRENT + _FORECAST).encode("utf-8")
+
+_VERSION = b"\x01"
+_LEVEL = 6
+
+
+def encode_payload(value: Any) -> bytes:
+    """Serialize a JSON-compatible value to compressed bytes."""
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    compressor = zlib.compressobj(_LEVEL, zlib.DEFLATED, -15, zdict=DICTIONARY)
+    return _VERSION + compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+def decode_payload(data: Union[bytes, str]) -> Any:
+    """
+    Inverse of encode_payload().
+
+    Plain JSON text (as stored before payloads were compressed) is accepted
+    too, so existing databases keep working.
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    if data[:1] != _VERSION:
+        raise ValueError(f"Unknown payload format: {data[:1]!r}")
+    decompressor = zlib.decompressobj(-15, zdict=DICTIONARY)
+    return json.loads(decompressor.decompress(data[1:]) + decompressor.flush())
+
+
+def compression_stats(value: Any) -> Dict[str, int]:
+    """Sizes of a value as compact JSON, plain zlib and encode_payload()."""
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return {
+        "json": len(text),
+        "zlib": len(zlib.compress(text, _LEVEL)),
+        "encoded": len(encode_payload(value)),
+    }
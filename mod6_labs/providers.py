@@ -0,0 +1,524 @@
+"""Weather data providers behind WeatherService.
+
+Every provider returns payloads in one model: the OpenWeatherMap JSON
+shape the UI already reads (`name`, `sys.country`, `main.temp`,
+`weather[0].main/description/icon`, `wind.speed`, `dt`, and for forecasts
+a `list` of 3-hour slots with `dt_txt`). OpenWeatherMap responses pass
+through as-is; other providers are converted into that shape.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from config import Config
+from deadline import time_left
+from errors import ClientRequestError, WeatherServiceError
+
+
+def status_error(status_code: int) -> type:
+    """
+    Exception class for an unexpected HTTP status.
+
+    4xx responses other than 429 reject the request itself; everything
+    else (429, 5xx) may succeed elsewhere or later.
+    """
+    if 400 <= status_code < 500 and status_code != 429:
+        return ClientRequestError
+    return WeatherServiceError
+
+
+class WeatherProvider:
+    """
+    Interface of a weather data source.
+
+    Providers are stateless apart from configuration, so one instance is
+    shared by every session; the HTTP client is passed in by WeatherService
+    so all providers use its connection pool. Each request's timeout is
+    capped by the time left on the current action's deadline.
+    """
+
+    name = "provider"
+
+    async def current(self, client: httpx.AsyncClient, city: str, units: str) -> Dict:
+        """Current weather for a city name."""
+        raise NotImplementedError
+
+    async def current_by_coordinates(self, client: httpx.AsyncClient,
+                                     lat: float, lon: float, units: str) -> Dict:
+        """Current weather for a latitude/longitude."""
+        raise NotImplementedError
+
+    async def forecast(self, client: httpx.AsyncClient, city: str, units: str) -> Dict:
+        """5-day forecast in 3-hour slots for a city name."""
+        raise NotImplementedError
+
+    # Optional data; WeatherService uses the first provider implementing each
+
+    async def air_quality(self, client: httpx.AsyncClient, lat: float, lon: float) -> Dict:
+        """Current air pollution in the OpenWeatherMap /air_pollution shape."""
+        raise NotImplementedError
+
+    async def uv_index(self, client: httpx.AsyncClient, lat: float, lon: float) -> Dict:
+        """Current and today's maximum UV index: {"uvi": ..., "uvi_max": ...}."""
+        raise NotImplementedError
+
+
+class OpenWeatherProvider(WeatherProvider):
+    """OpenWeatherMap current weather and forecast APIs (the primary source)."""
+
+    name = "openweather"
+
+    def __init__(self, api_key: str = None, base_url: str = None, forecast_url: str = None,
+                 air_pollution_url: str = None):
+        self.api_key = api_key if api_key is not None else Config.API_KEY
+        self.base_url = base_url or Config.BASE_URL
+        self.forecast_url = forecast_url or Config.FORECAST_URL
+        self.air_pollution_url = air_pollution_url or Config.AIR_POLLUTION_URL
+
+    async def current(self, client: httpx.AsyncClient, city: str, units: str) -> Dict:
+        """Request current weather from the API and map HTTP errors."""
+        params = {
+            "q": city,
+            "appid": self.api_key,
+            "units": units,
+        }
+        print(f"🌐 Making API request for: {city}")  # Debug info
+
+        try:
+            response = await client.get(
+                self.base_url, params=params, timeout=time_left(Config.TIMEOUT)
+            )
+
+            print(f"📡 API Response Status: {response.status_code}")  # Debug info
+
+            # Check for HTTP errors
+            if response.status_code == 404:
+                raise ClientRequestError(
+                    f"🏙️ City '{city}' not found. Please check the spelling and try again."
+                )
+            elif response.status_code == 401:
+                raise ClientRequestError(
+                    "🔑 Invalid API key. Please check your .env file and verify your OpenWeatherMap API key is correct."
+                )
+            elif response.status_code == 429:
+                raise WeatherServiceError(
+                    "⏱️ API rate limit exceeded. Please wait a moment and try again."
+                )
+            elif response.status_code >= 500:
+                raise WeatherServiceError(
+                    "🌐 Weather service is currently unavailable. Please try again later."
+                )
+            elif response.status_code != 200:
+                raise status_error(response.status_code)(
+                    f"⚠️ Error fetching weather data (Status: {response.status_code}). Please try again."
+                )
+
+            # Parse JSON response
+            data = response.json()
+            print(f"✅ Successfully fetched weather for {city}")  # Debug info
+            return data
+
+        except WeatherServiceError:
+            raise
+        except httpx.TimeoutException:
+            raise WeatherServiceError(
+                "⏱️ Request timed out. Please check your internet connection and try again."
+            )
+        except httpx.NetworkError as e:
+            raise WeatherServiceError(
+                f"🌐 Network error: {str(e)}. Please check your internet connection."
+            )
+        except httpx.HTTPError as e:
+            raise WeatherServiceError(f"🌐 HTTP error occurred: {str(e)}")
+        except Exception as e:
+            print(f"❌ Unexpected error: {str(e)}")  # Debug info
+            raise WeatherServiceError(f"❌ Unexpected error: {str(e)}. Please try again.")
+
+    async def current_by_coordinates(self, client: httpx.AsyncClient,
+                                     lat: float, lon: float, units: str) -> Dict:
+        """Request weather for coordinates from the API and map HTTP errors."""
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.api_key,
+            "units": units,
+        }
+        try:
+            response = await client.get(
+                self.base_url, params=params, timeout=time_left(Config.TIMEOUT)
+            )
+
+            if response.status_code == 401:
+                raise ClientRequestError(
+                    "🔑 Invalid API key. Please check your .env file and verify your OpenWeatherMap API key is correct."
+                )
+            elif response.status_code != 200:
+                raise status_error(response.status_code)(
+                    f"⚠️ Error fetching weather data: {response.status_code}"
+                )
+
+            return response.json()
+
+        except WeatherServiceError:
+            raise
+        except httpx.TimeoutException:
+            raise WeatherServiceError(
+                "⏱️ Request timed out. Please check your internet connection."
+            )
+        except httpx.NetworkError:
+            raise WeatherServiceError(
+                "🌐 Network error. Please check your internet connection."
+            )
+        except Exception as e:
+            raise WeatherServiceError(f"❌ Error fetching weather data: {str(e)}")
+
+    async def forecast(self, client: httpx.AsyncClient, city: str, units: str) -> Dict:
+        """Request the 5-day forecast from the API and map HTTP errors."""
+        params = {
+            "q": city,
+            "appid": self.api_key,
+            "units": units,
+        }
+        try:
+            response = await client.get(
+                self.forecast_url, params=params, timeout=time_left(Config.TIMEOUT)
+            )
+
+            # Check for HTTP errors
+            if response.status_code == 404:
+                raise ClientRequestError(
+                    f"🏙️ City '{city}' not found. Please check the spelling."
+                )
+            elif response.status_code == 401:
+                raise ClientRequestError(
+                    "🔑 Invalid API key. Please check your configuration."
+                )
+            elif response.status_code >= 500:
+                raise WeatherServiceError(
+                    "🌐 Weather service is currently unavailable. Please try again later."
+                )
+            elif response.status_code != 200:
+                raise status_error(response.status_code)(
+                    f"⚠️ Error fetching forecast data: {response.status_code}"
+                )
+
+            return response.json()
+
+        except WeatherServiceError:
+            raise
+        except httpx.TimeoutException:
+            raise WeatherServiceError(
+                "⏱️ Request timed out. Please check your internet connection."
+            )
+        except httpx.NetworkError:
+            raise WeatherServiceError(
+                "🌐 Network error. Please check your internet connection."
+            )
+        except httpx.HTTPError as e:
+            raise WeatherServiceError(f"🌐 HTTP error occurred: {str(e)}")
+        except Exception as e:
+            raise WeatherServiceError(f"❌ An unexpected error occurred: {str(e)}")
+
+    async def air_quality(self, client: httpx.AsyncClient, lat: float, lon: float) -> Dict:
+        """Request current air pollution (AQI 1-5 and pollutants) for coordinates."""
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.api_key,
+        }
+        try:
+            response = await client.get(
+                self.air_pollution_url, params=params, timeout=time_left(Config.TIMEOUT)
+            )
+            if response.status_code != 200:
+                raise WeatherServiceError(
+                    f"⚠️ Error fetching air quality data: {response.status_code}"
+                )
+            return response.json()
+
+        except WeatherServiceError:
+            raise
+        except httpx.TimeoutException:
+            raise WeatherServiceError(
+                "⏱️ Request timed out. Please check your internet connection."
+            )
+        except httpx.HTTPError as e:
+            raise WeatherServiceError(f"🌐 Air quality request failed: {str(e)}")
+
+
+# WMO weather code -> (OpenWeatherMap condition id, main, description, icon)
+WMO_CONDITIONS = {
+    0: (800, "Clear", "clear sky", "01"),
+    1: (801, "Clouds", "few clouds", "02"),
+    2: (802, "Clouds", "scattered clouds", "03"),
+    3: (804, "Clouds", "overcast clouds", "04"),
+    45: (741, "Fog", "fog", "50"),
+    48: (741, "Fog", "depositing rime fog", "50"),
+    51: (300, "Drizzle", "light drizzle", "09"),
+    53: (301, "Drizzle", "drizzle", "09"),
+    55: (302, "Drizzle", "heavy drizzle", "09"),
+    56: (310, "Drizzle", "freezing drizzle", "09"),
+    57: (311, "Drizzle", "heavy freezing drizzle", "09"),
+    61: (500, "Rain", "light rain", "10"),
+    63: (501, "Rain", "moderate rain", "10"),
+    65: (502, "Rain", "heavy rain", "10"),
+    66: (511, "Rain", "freezing rain", "13"),
+    67: (511, "Rain", "heavy freezing rain", "13"),
+    71: (600, "Snow", "light snow", "13"),
+    73: (601, "Snow", "snow", "13"),
+    75: (602, "Snow", "heavy snow", "13"),
+    77: (600, "Snow", "snow grains", "13"),
+    80: (520, "Rain", "light shower rain", "09"),
+    81: (521, "Rain", "shower rain", "09"),
+    82: (522, "Rain", "heavy shower rain", "09"),
+    85: (620, "Snow", "light shower snow", "13"),
+    86: (621, "Snow", "shower snow", "13"),
+    95: (211, "Thunderstorm", "thunderstorm", "11"),
+    96: (201, "Thunderstorm", "thunderstorm with hail", "11"),
+    99: (202, "Thunderstorm", "thunderstorm with heavy hail", "11"),
+}
+
+OPEN_METEO_FIELDS = (
+    "temperature_2m,apparent_temperature,relative_humidity_2m,"
+    "pressure_msl,wind_speed_10m,weather_code,is_day"
+)
+
+# Readings the UI and the observation store need as numbers
+OPEN_METEO_REQUIRED = (
+    "temperature_2m", "apparent_temperature", "relative_humidity_2m",
+    "pressure_msl", "wind_speed_10m",
+)
+
+
+def wmo_condition(code: Optional[int], is_day: bool = True) -> Dict:
+    """OpenWeatherMap-style `weather` entry for a WMO weather code."""
+    condition_id, main, description, icon = WMO_CONDITIONS.get(code, WMO_CONDITIONS[0])
+    return {
+        "id": condition_id,
+        "main": main,
+        "description": description,
+        "icon": icon + ("d" if is_day else "n"),
+    }
+
+
+def _temperature(celsius: Optional[float], units: str) -> Optional[float]:
+    """Open-Meteo serves Celsius or Fahrenheit; "standard" units are Kelvin."""
+    if celsius is not None and units == "standard":
+        return round(celsius + 273.15, 2)
+    return celsius
+
+
+class OpenMeteoProvider(WeatherProvider):
+    """
+    Open-Meteo (keyless) as the secondary source for hedged requests.
+
+    City names are resolved with Open-Meteo's geocoding API; results are
+    remembered so only the first lookup of a city pays for two requests.
+    """
+
+    name = "open-meteo"
+
+    # Geocoded cities remembered per process
+    MAX_GEOCODED = 2000
+
+    def __init__(self, base_url: str = None, geocoding_url: str = None):
+        self.base_url = base_url or Config.OPEN_METEO_URL
+        self.geocoding_url = geocoding_url or Config.OPEN_METEO_GEOCODING_URL
+        self._places: Dict[str, Tuple[float, float, str, str]] = {}
+
+    async def _get(self, client: httpx.AsyncClient, url: str, params: Dict) -> Dict:
+        try:
+            response = await client.get(
+                url, params=params, timeout=time_left(Config.TIMEOUT)
+            )
+        except httpx.TimeoutException:
+            raise WeatherServiceError(
+                "⏱️ Request timed out. Please check your internet connection."
+            )
+        except httpx.HTTPError as e:
+            raise WeatherServiceError(f"🌐 Open-Meteo request failed: {str(e)}")
+        if response.status_code != 200:
+            raise status_error(response.status_code)(
+                f"⚠️ Error fetching Open-Meteo data: {response.status_code}"
+            )
+        try:
+            return response.json()
+        except ValueError:
+            raise WeatherServiceError("⚠️ Open-Meteo sent an invalid response.")
+
+    async def geocode(self, client: httpx.AsyncClient, city: str) -> Tuple[float, float, str, str]:
+        """
+        Resolve a city name.
+
+        Returns:
+            (latitude, longitude, display name, country code)
+        """
+        key = city.strip().lower()
+        place = self._places.get(key)
+        if place is not None:
+            return place
+        data = await self._get(client, self.geocoding_url, {"name": city.strip(), "count": 1})
+        results = data.get("results") or []
+        if not results:
+            raise ClientRequestError(
+                f"🏙️ City '{city}' not found. Please check the spelling and try again."
+            )
+        first = results[0]
+        place = (
+            first["latitude"], first["longitude"],
+            first.get("name", city), first.get("country_code", ""),
+        )
+        if len(self._places) >= self.MAX_GEOCODED:
+            self._places.clear()
+        self._places[key] = place
+        return place
+
+    def _unit_params(self, units: str) -> Dict:
+        imperial = units == "imperial"
+        return {
+            "temperature_unit": "fahrenheit" if imperial else "celsius",
+            "wind_speed_unit": "mph" if imperial else "ms",
+            "timeformat": "unixtime",
+        }
+
+    async def current(self, client: httpx.AsyncClient, city: str, units: str) -> Dict:
+        lat, lon, name, country = await self.geocode(client, city)
+        return await self._current(client, lat, lon, units, name, country)
+
+    async def current_by_coordinates(self, client: httpx.AsyncClient,
+                                     lat: float, lon: float, units: str) -> Dict:
+        # Open-Meteo has no reverse geocoding; show the coordinates instead
+        return await self._current(client, lat, lon, units, f"{lat:.2f}, {lon:.2f}", "")
+
+    async def _current(self, client: httpx.AsyncClient, lat: float, lon: float,
+                       units: str, name: str, country: str) -> Dict:
+        params = dict(self._unit_params(units), latitude=lat, longitude=lon,
+                      current=OPEN_METEO_FIELDS, timezone="auto")
+        data = await self._get(client, self.base_url, params)
+        return normalize_open_meteo_current(data, units, name, country)
+
+    async def forecast(self, client: httpx.AsyncClient, city: str, units: str) -> Dict:
+        lat, lon, name, country = await self.geocode(client, city)
+        params = dict(self._unit_params(units), latitude=lat, longitude=lon,
+                      hourly=OPEN_METEO_FIELDS, forecast_days=6, timezone="UTC")
+        data = await self._get(client, self.base_url, params)
+        return normalize_open_meteo_forecast(data, units, name, country)
+
+    async def uv_index(self, client: httpx.AsyncClient, lat: float, lon: float) -> Dict:
+        params = dict(latitude=lat, longitude=lon, current="uv_index",
+                      daily="uv_index_max", forecast_days=1, timezone="auto")
+        data = await self._get(client, self.base_url, params)
+        return {
+            "uvi": data.get("current", {}).get("uv_index"),
+            "uvi_max": (data.get("daily", {}).get("uv_index_max") or [None])[0],
+        }
+
+
+def normalize_open_meteo_current(data: Dict, units: str, name: str, country: str) -> Dict:
+    """
+    Convert an Open-Meteo `current` response into the OpenWeatherMap shape.
+
+    Raises:
+        WeatherServiceError: If a reading in OPEN_METEO_REQUIRED is missing
+    """
+    current = data.get("current") or {}
+    missing = [field for field in OPEN_METEO_REQUIRED if current.get(field) is None]
+    if missing:
+        raise WeatherServiceError(
+            f"⚠️ Open-Meteo response is missing {', '.join(missing)}."
+        )
+    return {
+        "coord": {"lat": data.get("latitude"), "lon": data.get("longitude")},
+        "weather": [wmo_condition(current.get("weather_code"), bool(current.get("is_day", 1)))],
+        "main": {
+            "temp": _temperature(current.get("temperature_2m"), units),
+            "feels_like": _temperature(current.get("apparent_temperature"), units),
+            "humidity": current.get("relative_humidity_2m"),
+            "pressure": current.get("pressure_msl"),
+        },
+        "wind": {"speed": current.get("wind_speed_10m")},
+        "dt": current.get("time", int(time.time())),
+        "timezone": data.get("utc_offset_seconds", 0),
+        "sys": {"country": country},
+        "name": name,
+        "cod": 200,
+    }
+
+
+def normalize_open_meteo_forecast(data: Dict, units: str, name: str, country: str,
+                                  slots: int = 40) -> Dict:
+    """
+    Convert an Open-Meteo `hourly` response into OpenWeatherMap 3-hour slots.
+
+    Each slot starts at a UTC hour divisible by 3, like OpenWeatherMap's;
+    its min/max come from the three hours it covers. Hours with a missing
+    reading are skipped.
+
+    Raises:
+        WeatherServiceError: If a series in OPEN_METEO_REQUIRED is missing
+    """
+    hourly = data.get("hourly") or {}
+    missing = [
+        field for field in OPEN_METEO_REQUIRED + ("weather_code", "is_day")
+        if not isinstance(hourly.get(field), list)
+    ]
+    if missing:
+        raise WeatherServiceError(
+            f"⚠️ Open-Meteo forecast is missing {', '.join(missing)}."
+        )
+    times = hourly.get("time", [])
+    temps = hourly["temperature_2m"]
+    now = time.time()
+    forecast_list = []
+    for i, ts in enumerate(times):
+        if ts < now - 3 * 3600 or (ts // 3600) % 3:
+            continue
+        if any(i >= len(hourly[field]) or hourly[field][i] is None
+               for field in OPEN_METEO_REQUIRED):
+            continue
+        window = [t for t in temps[i:i + 3] if t is not None]
+        when = datetime.fromtimestamp(ts, tz=timezone.utc)
+        forecast_list.append({
+            "dt": ts,
+            "dt_txt": when.strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {
+                "temp": _temperature(temps[i], units),
+                "feels_like": _temperature(hourly["apparent_temperature"][i], units),
+                "temp_min": _temperature(min(window), units) if window else None,
+                "temp_max": _temperature(max(window), units) if window else None,
+                "humidity": hourly["relative_humidity_2m"][i],
+                "pressure": hourly["pressure_msl"][i],
+            },
+            "weather": [wmo_condition(hourly["weather_code"][i], bool(hourly["is_day"][i]))],
+            "wind": {"speed": hourly["wind_speed_10m"][i]},
+        })
+        if len(forecast_list) >= slots:
+            break
+    return {
+        "cod": "200",
+        "cnt": len(forecast_list),
+        "list": forecast_list,
+        "city": {
+            "name": name,
+            "country": country,
+            "coord": {"lat": data.get("latitude"), "lon": data.get("longitude")},
+        },
+    }
+
+
+# Providers selectable by name in Config.SECONDARY_PROVIDER
+PROVIDERS = {
+    OpenWeatherProvider.name: OpenWeatherProvider,
+    OpenMeteoProvider.name: OpenMeteoProvider,
+}
+
+
+def create_provider(name: str) -> WeatherProvider:
+    """Instantiate a provider by name."""
+    try:
+        return PROVIDERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown weather provider: {name!r} (choose from {sorted(PROVIDERS)})")
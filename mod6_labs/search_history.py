@@ -0,0 +1,240 @@
+"""Frecency-ranked search history index with fast prefix lookup."""
+
+import bisect
+import heapq
+import math
+import time
+import unicodedata
+from typing import Dict, List, Optional
+
+
+# Frecency settings: a lookup's weight halves every HALF_LIFE seconds
+HALF_LIFE = 14 * 24 * 3600  # 14 days
+TOP_CACHE_SIZE = 50
+
+
+def canonical_city_key(city: str) -> str:
+    """
+    Build the dedupe key for a city name.
+
+    Case, accents and repeated whitespace are ignored, so "Mataoroc",
+    "mataoroc" and "  MATAOROC " all map to the same key.
+    """
+    text = unicodedata.normalize("NFKD", city or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.casefold().split())
+
+
+class HistoryEntry:
+    """A single city in the search history."""
+
+    __slots__ = ("key", "name", "count", "first_used", "last_used", "score", "rank")
+
+    def __init__(self, key: str, name: str, count: int = 0,
+                 first_used: float = 0.0, last_used: float = 0.0, score: float = 0.0):
+        self.key = key
+        self.name = name
+        self.count = count
+        self.first_used = first_used
+        self.last_used = last_used
+        self.score = score
+        self.rank = self._compute_rank()
+
+    def _compute_rank(self) -> float:
+        """
+        Time-independent ordering key for frecency.
+
+        frecency(now) = score * 2 ** (-(now - last_used) / HALF_LIFE), so
+        log2(frecency) + now / HALF_LIFE equals the value below for every
+        entry. Comparing ranks therefore compares current frecency without
+        re-scoring the whole history whenever the clock moves.
+        """
+        if self.score <= 0:
+            return float("-inf")
+        return math.log2(self.score) + self.last_used / HALF_LIFE
+
+    def frecency(self, now: Optional[float] = None) -> float:
+        """Current decayed frecency score."""
+        now = time.time() if now is None else now
+        return self.score * 2 ** (-(now - self.last_used) / HALF_LIFE)
+
+    def record(self, name: str, now: float):
+        """Register one more lookup of this city."""
+        if self.count == 0:
+            self.first_used = now
+        self.score = self.frecency(now) + 1.0
+        self.count += 1
+        self.last_used = now
+        self.name = name
+        self.rank = self._compute_rank()
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "count": self.count,
+            "first_used": self.first_used,
+            "last_used": self.last_used,
+            "score": self.score,
+        }
+
+
+class SearchHistory:
+    """
+    Unbounded search history deduped by canonical city key.
+
+    Entries live in a dict keyed by canonical name, a sorted list of keys
+    answers prefix queries with bisect, and a small cache of the globally
+    highest-ranked keys serves the dropdown and short prefixes without
+    scanning the whole history.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, HistoryEntry] = {}
+        self._sorted_keys: List[str] = []
+        self._top: List[HistoryEntry] = []  # highest rank first
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, city: str) -> bool:
+        return canonical_city_key(city) in self._entries
+
+    def get(self, city: str) -> Optional[HistoryEntry]:
+        """Return the entry for a city, if it has been searched before."""
+        return self._entries.get(canonical_city_key(city))
+
+    def record(self, city: str, now: Optional[float] = None) -> Optional[HistoryEntry]:
+        """
+        Record a lookup of a city.
+
+        Args:
+            city: City name as typed or returned by the API
+            now: Lookup timestamp (defaults to the current time)
+
+        Returns:
+            The updated history entry, or None for a blank name
+        """
+        name = " ".join((city or "").split())
+        key = canonical_city_key(name)
+        if not key:
+            return None
+
+        now = time.time() if now is None else now
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = HistoryEntry(key, name)
+            self._entries[key] = entry
+            bisect.insort(self._sorted_keys, key)
+        entry.record(name, now)
+        self._promote(entry)
+        return entry
+
+    def remove(self, city: str) -> bool:
+        """Forget a city. Returns True if it was in the history."""
+        key = canonical_city_key(city)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        i = bisect.bisect_left(self._sorted_keys, key)
+        del self._sorted_keys[i]
+        if entry in self._top:
+            self._rebuild_top()
+        return True
+
+    def top(self, limit: int = 10) -> List[HistoryEntry]:
+        """Most relevant cities by frecency."""
+        if limit <= len(self._top) or len(self._top) == len(self._entries):
+            return self._top[:limit]
+        return heapq.nlargest(limit, self._entries.values(), key=lambda e: e.rank)
+
+    def search(self, prefix: str, limit: int = 10) -> List[HistoryEntry]:
+        """
+        Cities whose canonical name starts with a prefix, best match first.
+
+        Args:
+            prefix: Partial city name (case and accents are ignored)
+            limit: Maximum number of results
+
+        Returns:
+            Matching entries ordered by frecency
+        """
+        key = canonical_city_key(prefix)
+        if not key:
+            return self.top(limit)
+
+        # The top cache holds the globally best entries, so if it already
+        # contains enough matches those are exactly the best matches.
+        cached = [e for e in self._top if e.key.startswith(key)]
+        if len(cached) >= limit:
+            return cached[:limit]
+
+        lo = bisect.bisect_left(self._sorted_keys, key)
+        hi = bisect.bisect_left(self._sorted_keys, key + "\uffff", lo)
+        matches = (self._entries[k] for k in self._sorted_keys[lo:hi])
+        return heapq.nlargest(limit, matches, key=lambda e: e.rank)
+
+    def _promote(self, entry: HistoryEntry):
+        """Keep the top cache exact after an entry's rank increased."""
+        if entry in self._top:
+            self._top.remove(entry)
+        elif len(self._top) >= TOP_CACHE_SIZE and entry.rank <= self._top[-1].rank:
+            return
+        # _top is ordered by descending rank; bisect on negated ranks
+        ranks = [-e.rank for e in self._top]
+        self._top.insert(bisect.bisect_right(ranks, -entry.rank), entry)
+        del self._top[TOP_CACHE_SIZE:]
+
+    def _rebuild_top(self):
+        self._top = heapq.nlargest(
+            TOP_CACHE_SIZE, self._entries.values(), key=lambda e: e.rank
+        )
+
+    def entries(self) -> List[HistoryEntry]:
+        """Snapshot of every entry, cheap enough to take on the event loop."""
+        return list(self._entries.values())
+
+    def to_list(self) -> List[Dict]:
+        """Serialize the history for JSON storage."""
+        return [entry.to_dict() for entry in self._entries.values()]
+
+    @classmethod
+    def from_list(cls, data) -> "SearchHistory":
+        """
+        Rebuild the history from its JSON form.
+
+        Also accepts the old format (a plain list of city names, most recent
+        first), which is migrated to entries with a single lookup each.
+        """
+        history = cls()
+        if not isinstance(data, list):
+            return history
+
+        if all(isinstance(item, str) for item in data):
+            # Legacy list: replay oldest first so recency order is preserved
+            now = time.time()
+            for position in range(len(data) - 1, -1, -1):
+                history.record(data[position], now=now - position)
+            return history
+
+        for item in data:
+            if not isinstance(item, dict) or not item.get("name"):
+                continue
+            key = canonical_city_key(item["name"])
+            if not key:
+                continue
+            entry = HistoryEntry(
+                key,
+                item["name"],
+                count=int(item.get("count", 1)),
+                first_used=float(item.get("first_used", 0.0)),
+                last_used=float(item.get("last_used", 0.0)),
+                score=float(item.get("score", item.get("count", 1))),
+            )
+            existing = history._entries.get(key)
+            if existing is not None and existing.rank >= entry.rank:
+                continue
+            history._entries[key] = entry
+
+        history._sorted_keys = sorted(history._entries)
+        history._rebuild_top()
+        return history
@@ -0,0 +1,105 @@
+"""Process-wide registry of services shared by all Flet sessions."""
+
+import threading
+from pathlib import Path
+from typing import Dict
+
+from cassette import RecordingTransport, ReplayTransport
+from config import Config
+from forecast_chart import ChartCache
+from observation_store import ObservationStore
+from shared_store import SqliteCache, SqliteRateLimiter, TieredCache
+from weather_cache import TTLCache
+from weather_service import WeatherService, connection_limits
+
+
+class ServiceRegistry:
+    """
+    Holds one instance of each shared service per process.
+
+    In web mode every browser tab gets its own page and WeatherApp, but
+    they all run in the same process; sharing the WeatherService means its
+    connection pool, cache and rate limiter serve every session, so a city
+    fetched by one user is a cache hit for the next. Session state (current
+    city, units, controls) stays on each WeatherApp.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._weather_service = None
+        self._chart_cache = None
+        self._observation_stores: Dict[Path, ObservationStore] = {}
+
+    def weather_service(self) -> WeatherService:
+        """The shared WeatherService, created on first use."""
+        with self._lock:
+            if self._weather_service is None:
+                self._weather_service = self._create_weather_service()
+            return self._weather_service
+
+    @staticmethod
+    def _create_transport():
+        if Config.REPLAY_CASSETTE:
+            return ReplayTransport.from_file(Config.REPLAY_CASSETTE, Config.REPLAY_SPEED)
+        if Config.RECORD_CASSETTE:
+            return RecordingTransport(Config.RECORD_CASSETTE, connection_limits())
+        return None
+
+    def _create_weather_service(self) -> WeatherService:
+        transport = self._create_transport()
+        if not Config.SHARED_CACHE_PATH:
+            if not Config.PAYLOAD_CACHE_PATH:
+                return WeatherService(transport=transport)
+            # Memory first, with every payload also persisted compressed
+            Path(Config.PAYLOAD_CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+            return WeatherService(
+                transport=transport,
+                cache=TieredCache(
+                    TTLCache(Config.CACHE_TTL, Config.CACHE_MAX_ENTRIES),
+                    SqliteCache(
+                        Config.PAYLOAD_CACHE_PATH, Config.CACHE_TTL, Config.CACHE_MAX_ENTRIES
+                    ),
+                ),
+            )
+        # Multi-worker mode: cache and API budget shared across processes
+        return WeatherService(
+            transport=transport,
+            cache=SqliteCache(
+                Config.SHARED_CACHE_PATH, Config.CACHE_TTL, Config.CACHE_MAX_ENTRIES
+            ),
+            rate_limiter=SqliteRateLimiter(
+                Config.SHARED_CACHE_PATH,
+                Config.RATE_LIMIT_PER_MINUTE / 60,
+                Config.RATE_LIMIT_BURST,
+            ),
+        )
+
+    def chart_cache(self) -> ChartCache:
+        """The shared forecast chart cache, created on first use."""
+        with self._lock:
+            if self._chart_cache is None:
+                self._chart_cache = ChartCache()
+            return self._chart_cache
+
+    def observation_store(self, path) -> ObservationStore:
+        """The shared ObservationStore for a database file."""
+        path = Path(path).resolve()
+        with self._lock:
+            store = self._observation_stores.get(path)
+            if store is None:
+                store = ObservationStore(path)
+                self._observation_stores[path] = store
+            return store
+
+    def reset(self):
+        """Drop all shared instances (e.g. after changing configuration)."""
+        with self._lock:
+            self._weather_service = None
+            self._chart_cache = None
+            for store in self._observation_stores.values():
+                store.close()
+            self._observation_stores.clear()
+
+
+# The registry used by the app
+registry = ServiceRegistry()
@@ -0,0 +1,312 @@
+"""Persistent weather cache and rate limiter backed by SQLite (WAL mode).
+
+Used when the web app runs with several worker processes: every worker
+opens the same database file, so a city fetched by one worker is a cache
+hit in all of them and they draw API calls from one shared token bucket.
+A single-process app keeps its in-memory cache in front of the same file
+(TieredCache), so payloads outlive a restart. Cached payloads are stored
+compressed (payload_codec.py).
+
+Writes can wait up to 30 s for another worker's write lock, so async
+callers use the *_async methods, which run them on a worker thread.
+Reads use a separate connection; in WAL mode they never wait for a
+writer, so get() is safe to call on the event loop.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+from payload_codec import decode_payload, encode_payload
+from weather_cache import TTLCache
+
+
+def _connect(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _key_text(key: Hashable) -> str:
+    return json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+
+
+class SqliteCache:
+    """
+    TTL cache shared by all processes using the same database file.
+
+    Same interface as weather_cache.TTLCache, plus claim()/release()
+    leases so only one worker fetches a missing key at a time, and
+    set_async()/claim_async() for use on the event loop.
+    """
+
+    # Expired rows are swept every this many writes
+    SWEEP_EVERY = 100
+
+    def __init__(self, path, ttl: float, max_entries: int = 10000):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = _connect(self.path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL,
+                origin TEXT,
+                value BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expires_at);
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL
+            );
+            """
+        )
+        self._read_lock = threading.Lock()
+        self._reader = _connect(self.path)
+
+    def __len__(self) -> int:
+        with self._read_lock:
+            return self._reader.execute(
+                "SELECT COUNT(*) FROM cache WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()[0]
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Optional[str]]]:
+        """
+        Look up a fresh entry.
+
+        Returns:
+            (value, origin session) or None if missing or expired
+        """
+        entry = self.lookup(key)
+        return None if entry is None else entry[:2]
+
+    def lookup(self, key: Hashable) -> Optional[Tuple[Any, Optional[str], float]]:
+        """Like get(), plus the entry's expiry time (Unix seconds)."""
+        with self._read_lock:
+            row = self._reader.execute(
+                "SELECT value, origin, expires_at FROM cache WHERE key = ? AND expires_at >= ?",
+                (_key_text(key), time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        return decode_payload(row[0]), row[1], row[2]
+
+    def set(self, key: Hashable, value: Any, origin: Optional[str] = None,
+            ttl: Optional[float] = None):
+        """Store a value for all processes."""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        payload = encode_payload(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, origin, value) VALUES (?, ?, ?, ?)",
+                (_key_text(key), expires_at, origin, payload),
+            )
+            self._writes += 1
+            if self._writes % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+
+    async def set_async(self, key: Hashable, value: Any, origin: Optional[str] = None,
+                        ttl: Optional[float] = None):
+        """set() on a worker thread, so waiting for the write lock never blocks the loop."""
+        await asyncio.to_thread(self.set, key, value, origin, ttl)
+
+    def _sweep(self, now: float):
+        """Delete expired rows and trim to max_entries (oldest expiry first)."""
+        self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        self._conn.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.execute("DELETE FROM leases")
+
+    def claim(self, key: Hashable, lease_seconds: float) -> bool:
+        """
+        Try to become the one process fetching a key.
+
+        Returns:
+            True if this caller holds the lease, False if another
+            process is already fetching it
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM leases WHERE key = ? AND expires_at < ?", (_key_text(key), now)
+                )
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO leases (key, expires_at) VALUES (?, ?)",
+                    (_key_text(key), now + lease_seconds),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    async def claim_async(self, key: Hashable, lease_seconds: float) -> bool:
+        """claim() on a worker thread."""
+        return await asyncio.to_thread(self.claim, key, lease_seconds)
+
+    def release(self, key: Hashable):
+        """Give up a lease taken with claim()."""
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE key = ?", (_key_text(key),))
+
+    def release_soon(self, key: Hashable):
+        """release() on a worker thread, without waiting for it (safe in finally blocks)."""
+        asyncio.get_running_loop().run_in_executor(None, self.release, key)
+
+
+class TieredCache:
+    """
+    In-memory TTLCache in front of a SqliteCache file (single-process mode).
+
+    Hits are served from memory. Every entry is also written to disk,
+    compressed, on a worker thread; a memory miss falls back to the file,
+    so a restarted app starts warm and forecasts evicted from memory are
+    still served without an API call. Same interface as TTLCache, plus
+    set_async(). It has no leases: one process single-flights in memory.
+    """
+
+    def __init__(self, memory: TTLCache, disk: SqliteCache):
+        self.memory = memory
+        self.disk = disk
+
+    def __len__(self) -> int:
+        return len(self.disk)
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Optional[str]]]:
+        """
+        Look up a fresh entry in memory, then on disk.
+
+        Returns:
+            (value, origin session) or None if missing or expired
+        """
+        cached = self.memory.get(key)
+        if cached is not None:
+            return cached
+        entry = self.disk.lookup(key)
+        if entry is None:
+            return None
+        value, origin, expires_at = entry
+        self.memory.set(key, value, origin, ttl=expires_at - time.time())
+        return value, origin
+
+    def set(self, key: Hashable, value: Any, origin: Optional[str] = None,
+            ttl: Optional[float] = None):
+        """Store a value in memory and on disk."""
+        self.memory.set(key, value, origin, ttl)
+        self.disk.set(key, value, origin, ttl)
+
+    async def set_async(self, key: Hashable, value: Any, origin: Optional[str] = None,
+                        ttl: Optional[float] = None):
+        """set() with the disk write on a worker thread."""
+        self.memory.set(key, value, origin, ttl)
+        await self.disk.set_async(key, value, origin, ttl)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+
+class SqliteRateLimiter:
+    """
+    Token bucket stored in SQLite so all processes share one API budget.
+
+    Same interface as weather_cache.RateLimiter, plus try_acquire_async().
+    Refill uses wall-clock time because monotonic clocks are not comparable
+    across processes.
+    """
+
+    def __init__(self, path, rate: float, capacity: float, name: str = "openweather"):
+        self.path = Path(path)
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self._lock = threading.Lock()
+        self._conn = _connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO rate_limits (name, tokens, updated) VALUES (?, ?, ?)",
+            (name, capacity, time.time()),
+        )
+        self._read_lock = threading.Lock()
+        self._reader = _connect(self.path)
+
+    def _take(self, reserve: float = 0) -> float:
+        """
+        Atomically refill and take one token if possible.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is free
+            (or -1 if the request would eat into the reserve)
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, updated = self._conn.execute(
+                    "SELECT tokens, updated FROM rate_limits WHERE name = ?", (self.name,)
+                ).fetchone()
+                now = time.time()
+                tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+                if tokens - 1 >= reserve:
+                    tokens -= 1
+                    wait = 0.0
+                elif reserve > 0:
+                    wait = -1.0
+                else:
+                    wait = (1 - tokens) / self.rate
+                self._conn.execute(
+                    "UPDATE rate_limits SET tokens = ?, updated = ? WHERE name = ?",
+                    (tokens, now, self.name),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the shared bucket."""
+        with self._read_lock:
+            tokens, updated = self._reader.execute(
+                "SELECT tokens, updated FROM rate_limits WHERE name = ?", (self.name,)
+            ).fetchone()
+        return min(self.capacity, tokens + max(0.0, time.time() - updated) * self.rate)
+
+    def try_acquire(self, reserve: float = 0) -> bool:
+        """Take a token only if one is free right now (keeping `reserve`)."""
+        return self._take(reserve) == 0
+
+    async def try_acquire_async(self, reserve: float = 0) -> bool:
+        """try_acquire() on a worker thread."""
+        return await asyncio.to_thread(self._take, reserve) == 0
+
+    async def acquire(self):
+        """Wait until a shared token is available, then take it."""
+        while True:
+            wait = await asyncio.to_thread(self._take)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
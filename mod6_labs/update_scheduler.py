@@ -0,0 +1,102 @@
+"""Frame-coalescing page update scheduler for Flet apps."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import flet as ft
+
+from metrics import Metrics
+
+
+class UpdateScheduler:
+    """
+    Collects dirty controls and flushes them with at most one
+    page.update() per frame.
+
+    Handlers call request_update() as often as they like; the first request
+    in a frame schedules a flush on the page's event loop and later requests
+    only add controls to the dirty set. Requests without controls mark the
+    whole page dirty (needed for page-level properties such as theme_mode).
+    """
+
+    FRAME_SECONDS = 1 / 60
+
+    def __init__(self, page: ft.Page, metrics: Optional[Metrics] = None,
+                 frame_seconds: float = FRAME_SECONDS):
+        self.page = page
+        self.metrics = metrics or Metrics()
+        self.frame_seconds = frame_seconds
+        self._lock = threading.Lock()
+        self._dirty = {}  # id(control) -> control, keeps request order
+        self._full_update = False
+        self._scheduled = False
+        self._last_flush = 0.0
+        self._interaction = None
+        self._interaction_updates = 0
+        # Called with the name of every interaction as it starts
+        self.on_interaction: Optional[Callable[[str], None]] = None
+
+    def request_update(self, *controls: ft.Control):
+        """
+        Mark controls (or the whole page) dirty and schedule a flush.
+
+        Safe to call from event handlers running on worker threads.
+        """
+        with self._lock:
+            if controls:
+                for control in controls:
+                    self._dirty[id(control)] = control
+            else:
+                self._full_update = True
+            self.metrics.incr("update_requests")
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay = max(0.0, self._last_flush + self.frame_seconds - time.monotonic())
+
+        loop = self.page.loop
+        loop.call_soon_threadsafe(loop.call_later, delay, self.flush)
+
+    def flush(self):
+        """Send all pending changes to the client now."""
+        with self._lock:
+            self._scheduled = False
+            full_update = self._full_update
+            controls = list(self._dirty.values())
+            self._full_update = False
+            self._dirty.clear()
+            if not full_update and not controls:
+                return
+            self._last_flush = time.monotonic()
+            self._interaction_updates += 1
+
+        if full_update:
+            self.page.update()
+        else:
+            self.page.update(*controls)
+        self.metrics.incr("page_updates")
+
+    def begin_interaction(self, name: str):
+        """
+        Start counting flushes for a new user interaction.
+
+        The previous interaction's total is recorded as an
+        "updates_per_interaction" sample, and on_interaction (if set) is
+        told that a new one started.
+        """
+        with self._lock:
+            previous, count = self._interaction, self._interaction_updates
+            self._interaction = name
+            self._interaction_updates = 0
+        if previous is not None:
+            self.metrics.observe("updates_per_interaction", count)
+            self.metrics.observe(f"updates_per_interaction.{previous}", count)
+        self.metrics.incr("interactions")
+        if self.on_interaction is not None:
+            self.on_interaction(name)
+
+    @property
+    def current_interaction_updates(self) -> int:
+        """Flushes sent since the current interaction started."""
+        return self._interaction_updates
@@ -0,0 +1,105 @@
+"""Latest-wins task tracking for the app's views."""
+
+import asyncio
+import contextvars
+import threading
+from typing import Dict, Optional
+
+import flet as ft
+
+from metrics import Metrics
+
+# (ViewTasks, view, generation) of the handler running in this task
+_running: contextvars.ContextVar = contextvars.ContextVar("view_task", default=None)
+
+
+class ViewTasks:
+    """
+    Keeps at most one in-flight handler per view ("current", "forecast",
+    "watchlist").
+
+    start() cancels the view's previous handler before running the new
+    one, so a slow older search cannot finish after a newer one. A handler
+    that was cancelled too late (it already got its data) checks
+    superseded() before rendering and drops its result.
+    """
+
+    def __init__(self, page: ft.Page, metrics: Optional[Metrics] = None):
+        self.page = page
+        self.metrics = metrics or Metrics()
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, object] = {}
+
+    def start(self, view: str, handler, *args):
+        """
+        Run an async handler as the view's only in-flight task.
+
+        Safe to call from event handlers running on worker threads.
+
+        Returns:
+            The future returned by page.run_task()
+        """
+        with self._lock:
+            generation = self._generations.get(view, 0) + 1
+            self._generations[view] = generation
+            self._cancel_locked(view)
+            future = self.page.run_task(self._run, view, generation, handler, *args)
+            self._futures[view] = future
+        self.metrics.incr("view_tasks_started")
+        return future
+
+    def running(self, view: str) -> bool:
+        """True while the view has a handler in flight."""
+        with self._lock:
+            future = self._futures.get(view)
+            return future is not None and not future.done()
+
+    def cancel(self, view: str):
+        """Cancel the view's in-flight handler, if any."""
+        with self._lock:
+            self._generations[view] = self._generations.get(view, 0) + 1
+            self._cancel_locked(view)
+
+    def cancel_all(self):
+        """Cancel every view's in-flight handler (the session has ended)."""
+        with self._lock:
+            for view in list(self._generations):
+                self._generations[view] += 1
+                self._cancel_locked(view)
+
+    def _cancel_locked(self, view: str):
+        previous = self._futures.pop(view, None)
+        if previous is not None and not previous.done():
+            previous.cancel()
+            self.metrics.incr("view_tasks_superseded")
+            self.metrics.incr(f"view_tasks_superseded.{view}")
+
+    async def _run(self, view: str, generation: int, handler, *args):
+        _running.set((self, view, generation))
+        cancelled = False
+        try:
+            return await handler(*args)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            with self._lock:
+                latest = self._generations.get(view) == generation
+                if latest:
+                    self._futures.pop(view, None)
+            if not latest and not cancelled:
+                # Finished after being superseded; its render was skipped
+                self.metrics.incr("stale_results_dropped")
+
+    def superseded(self) -> bool:
+        """
+        True inside a handler whose view has since started a newer task.
+
+        Handlers called directly (not through start()) are never superseded.
+        """
+        running = _running.get()
+        if running is None or running[0] is not self:
+            return False
+        _, view, generation = running
+        return self._generations.get(view) != generation
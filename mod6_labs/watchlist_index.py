@@ -0,0 +1,200 @@
+"""In-memory index of watchlist weather snapshots (Feature 7).
+
+The watchlist view only fetches the cities it shows, so sorting and
+filtering run over whatever has been fetched so far: cities without a
+snapshot yet sort last and are fetched once they scroll into view.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from search_history import canonical_city_key
+
+
+class WatchlistSnapshot:
+    """Weather values of one watchlist city at the time it was fetched."""
+
+    __slots__ = (
+        "city", "temp", "temp_c", "feels_like", "condition", "description",
+        "humidity", "wind_speed", "units", "fetched_at", "error", "stale",
+    )
+
+    def __init__(self, city: str, temp: Optional[float] = None, condition: str = "",
+                 description: str = "", humidity: Optional[float] = None,
+                 wind_speed: Optional[float] = None, units: str = "metric",
+                 fetched_at: Optional[float] = None, error: Optional[str] = None,
+                 feels_like: Optional[float] = None):
+        self.city = city
+        self.temp = temp
+        # Celsius copy so sorting works across unit changes
+        if temp is None or units == "metric":
+            self.temp_c = temp
+        elif units == "imperial":
+            self.temp_c = (temp - 32) * 5 / 9
+        else:
+            self.temp_c = temp - 273.15
+        self.feels_like = feels_like
+        self.condition = condition
+        self.description = description
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.units = units
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.error = error
+        self.stale = False  # a later refresh failed; these are older values
+
+    @classmethod
+    def from_payload(cls, city: str, data: Dict, units: str) -> "WatchlistSnapshot":
+        """Snapshot of an OpenWeatherMap-shaped weather payload."""
+        weather = data.get("weather", [{}])[0]
+        return cls(
+            city,
+            temp=data.get("main", {}).get("temp", 0),
+            feels_like=data.get("main", {}).get("feels_like"),
+            condition=weather.get("main", "Clear"),
+            description=weather.get("description", "").title(),
+            humidity=data.get("main", {}).get("humidity", 0),
+            wind_speed=data.get("wind", {}).get("speed", 0),
+            units=units,
+        )
+
+    @classmethod
+    def failed(cls, city: str, error: str, units: str) -> "WatchlistSnapshot":
+        """Snapshot recording that the last fetch failed."""
+        return cls(city, units=units, error=error)
+
+    def as_stale(self) -> "WatchlistSnapshot":
+        """Copy kept in place of a failed refresh, marked stale."""
+        snapshot = WatchlistSnapshot(
+            self.city, self.temp, self.condition, self.description, self.humidity,
+            self.wind_speed, self.units, self.fetched_at, feels_like=self.feels_like,
+        )
+        snapshot.stale = True
+        return snapshot
+
+    def fingerprint(self) -> Tuple:
+        """Everything a watchlist card shows of this snapshot (not when it was fetched)."""
+        if self.error is not None:
+            return (self.units, "error")
+        return (self.units, self.temp, self.condition, self.description,
+                self.humidity, self.wind_speed, self.stale)
+
+    def is_fresh(self, ttl: float, units: str, now: Optional[float] = None) -> bool:
+        """True if the snapshot is recent enough and in the wanted units."""
+        now = time.time() if now is None else now
+        return (self.error is None and not self.stale and self.units == units
+                and now - self.fetched_at < ttl)
+
+
+def _missing_last(value) -> Tuple[bool, float]:
+    return (value is None, value or 0)
+
+
+class WatchlistIndex:
+    """
+    Watchlist cities in their saved order plus the latest snapshot of each.
+
+    view() returns the filtered and sorted city list; the result is cached
+    until the cities or snapshots change, so paging through a large
+    watchlist does not re-sort it on every page.
+    """
+
+    # Sort choices shown in the watchlist view
+    SORTS = {
+        "added": "Order added",
+        "name": "Name",
+        "temp_desc": "Warmest first",
+        "temp_asc": "Coldest first",
+        "humidity": "Most humid",
+        "wind": "Windiest",
+    }
+
+    def __init__(self, cities: Iterable[str] = ()):
+        self._cities: List[str] = []
+        self._snapshots: Dict[str, WatchlistSnapshot] = {}
+        self._version = 0
+        self._view_cache: Optional[Tuple[Tuple[str, str, int], List[str]]] = None
+        self.set_cities(cities)
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+    def set_cities(self, cities: Iterable[str]):
+        """Follow the saved watchlist, keeping snapshots of remaining cities."""
+        self._cities = list(cities)
+        keep = {canonical_city_key(city) for city in self._cities}
+        self._snapshots = {key: snap for key, snap in self._snapshots.items() if key in keep}
+        self._version += 1
+
+    def update(self, snapshot: WatchlistSnapshot):
+        """Store the latest snapshot of a city."""
+        self._snapshots[canonical_city_key(snapshot.city)] = snapshot
+        self._version += 1
+
+    def get(self, city: str) -> Optional[WatchlistSnapshot]:
+        """Latest snapshot of a city, or None if it was never fetched."""
+        return self._snapshots.get(canonical_city_key(city))
+
+    def needs_fetch(self, cities: Iterable[str], ttl: float, units: str) -> List[str]:
+        """Cities among `cities` without a fresh snapshot in `units`."""
+        now = time.time()
+        result = []
+        for city in cities:
+            snapshot = self.get(city)
+            if snapshot is None or not snapshot.is_fresh(ttl, units, now):
+                result.append(city)
+        return result
+
+    def view(self, sort: str = "added", query: str = "") -> List[str]:
+        """
+        Cities matching `query`, in `sort` order.
+
+        Args:
+            sort: One of SORTS
+            query: Case- and accent-insensitive text matched against the
+                city name and the snapshot's condition and description
+
+        Returns:
+            City names as saved in the watchlist
+        """
+        query_key = canonical_city_key(query) if query else ""
+        cache_key = (sort, query_key, self._version)
+        if self._view_cache is not None and self._view_cache[0] == cache_key:
+            return self._view_cache[1]
+
+        cities = self._cities
+        if query_key:
+            cities = [city for city in cities if self._matches(city, query_key)]
+        if sort == "name":
+            cities = sorted(cities, key=canonical_city_key)
+        elif sort != "added":
+            cities = sorted(cities, key=self._sort_key(sort))
+
+        self._view_cache = (cache_key, cities)
+        return cities
+
+    def _matches(self, city: str, query_key: str) -> bool:
+        if query_key in canonical_city_key(city):
+            return True
+        snapshot = self.get(city)
+        return snapshot is not None and (
+            query_key in snapshot.condition.casefold()
+            or query_key in snapshot.description.casefold()
+        )
+
+    def _sort_key(self, sort: str):
+        field, descending = {
+            "temp_desc": ("temp_c", True),
+            "temp_asc": ("temp_c", False),
+            "humidity": ("humidity", True),
+            "wind": ("wind_speed", True),
+        }[sort]
+        sign = -1 if descending else 1
+
+        def key(city: str):
+            snapshot = self.get(city)
+            value = getattr(snapshot, field) if snapshot is not None else None
+            # Cities not fetched yet (or failed) go last in either direction
+            return _missing_last(None if value is None else sign * value)
+
+        return key
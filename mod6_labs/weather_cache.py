@@ -0,0 +1,120 @@
+"""In-process cache and rate limiter used by WeatherService."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry expiry.
+
+    Entries remember which session stored them so the service can tell
+    same-session hits from hits on data another session fetched. The least
+    recently used entry is evicted once max_entries is reached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Optional[str]]]:
+        """
+        Look up a fresh entry.
+
+        Returns:
+            (value, origin session) or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, origin = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value, origin
+
+    def set(self, key: Hashable, value: Any, origin: Optional[str] = None,
+            ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (expires_at, value, origin)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove an entry and return its value (None if missing or expired)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RateLimiter:
+    """
+    Token bucket limiting upstream API calls.
+
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens
+    per second; acquire() waits for a token, try_acquire() never waits.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the bucket."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, reserve: float = 0) -> bool:
+        """
+        Take a token only if one is free right now.
+
+        Args:
+            reserve: Tokens that must remain afterwards (keeps budget for
+                     user-initiated requests when called for background work)
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens - 1 < reserve:
+                return False
+            self._tokens -= 1
+            return True
+
+    async def acquire(self):
+        """Wait until a token is available, then take it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
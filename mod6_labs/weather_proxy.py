@@ -0,0 +1,188 @@
+"""Weather proxy: WeatherService over HTTP for other tools.
+
+Every tool that asks this proxy instead of OpenWeatherMap shares one
+cache, one single-flight table and one API budget, so a hundred clients
+asking for London cost one upstream call per cache TTL.
+
+Endpoints (GET, JSON responses):
+    /weather?city=London[&units=metric]
+    /forecast?city=London[&units=metric]
+    /batch?city=London&city=Paris[&units=metric]   (up to Config.PROXY_BATCH_MAX)
+    /stats     proxy and WeatherService metrics
+    /health
+
+Clients may send an X-Client-Id header; it is used as the session id, so
+`cross_session_hit_rate` in /stats shows how much one tool's fetches
+saved the others.
+
+Usage:
+    python weather_proxy.py [--host 127.0.0.1] [--port 8600]
+    uvicorn weather_proxy:app --port 8600
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from config import Config
+from deadline import DeadlineExceeded, deadline
+from errors import WeatherServiceError
+from metrics import Metrics
+from service_registry import registry
+from weather_service import WeatherService
+
+
+def error_status(error: WeatherServiceError) -> int:
+    """HTTP status for a WeatherService error (matched on its message, like the app does)."""
+    if isinstance(error, DeadlineExceeded):
+        return 504
+    message = str(error).lower()
+    if "not found" in message:
+        return 404
+    if "cannot be empty" in message:
+        return 400
+    if "rate limit" in message:
+        return 429
+    return 502
+
+
+class WeatherProxy:
+    """
+    ASGI application exposing WeatherService.
+
+    Runs on any ASGI server; `python weather_proxy.py` uses uvicorn, which
+    the web mode already depends on.
+    """
+
+    def __init__(self, service: Optional[WeatherService] = None):
+        self._service = service
+        self.metrics = Metrics()
+        self.routes = {
+            "/weather": self.weather,
+            "/forecast": self.forecast,
+            "/batch": self.batch,
+            "/stats": self.stats,
+            "/health": self.health,
+        }
+
+    @property
+    def service(self) -> WeatherService:
+        # The process-wide service, created on first use (after Config is set)
+        if self._service is None:
+            self._service = registry.weather_service()
+        return self._service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        route = self.routes.get(scope["path"])
+        if scope["method"] != "GET":
+            status, body = 405, {"error": "Only GET is supported"}
+        elif route is None:
+            status, body = 404, {"error": f"Unknown endpoint {scope['path']}"}
+        else:
+            query = parse_qs(scope["query_string"].decode("latin-1"))
+            headers = dict(scope["headers"])
+            client = headers.get(b"x-client-id", b"").decode("latin-1")
+            if not client and scope.get("client"):
+                client = scope["client"][0]
+            status, body = await route(query, client or None)
+        self.metrics.incr("proxy_requests")
+        self.metrics.incr(f"proxy_requests.{scope['path'].strip('/') if route else 'unknown'}")
+        if status >= 400:
+            self.metrics.incr(f"proxy_errors.{status}")
+
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._service is not None:
+                    await self._service.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    def _units(query: Dict[str, List[str]]) -> str:
+        units = query.get("units", [Config.UNITS])[0]
+        return units if units in ("metric", "imperial", "standard") else Config.UNITS
+
+    async def _call(self, method: str, city: str, units: str,
+                    client: Optional[str]) -> Tuple[int, Dict]:
+        try:
+            async with deadline(Config.ACTION_DEADLINE):
+                data = await getattr(self.service, method)(city, units=units, session_id=client)
+            return 200, data
+        except WeatherServiceError as e:
+            return error_status(e), {"error": str(e)}
+
+    async def weather(self, query, client) -> Tuple[int, Dict]:
+        """Current weather for one city."""
+        city = query.get("city", [""])[0].strip()
+        return await self._call("get_weather", city, self._units(query), client)
+
+    async def forecast(self, query, client) -> Tuple[int, Dict]:
+        """5-day forecast for one city."""
+        city = query.get("city", [""])[0].strip()
+        return await self._call("get_forecast", city, self._units(query), client)
+
+    async def batch(self, query, client) -> Tuple[int, Dict]:
+        """
+        Current weather for several cities at once.
+
+        Cities are fetched concurrently; each has its own entry in
+        "results", either the weather or {"error": ..., "status": ...}.
+        """
+        cities = list(dict.fromkeys(c.strip() for c in query.get("city", []) if c.strip()))
+        if not cities:
+            return 400, {"error": "Pass one or more city parameters"}
+        if len(cities) > Config.PROXY_BATCH_MAX:
+            return 400, {"error": f"At most {Config.PROXY_BATCH_MAX} cities per batch"}
+        units = self._units(query)
+        answers = await asyncio.gather(
+            *(self._call("get_weather", city, units, client) for city in cities)
+        )
+        results = {}
+        for city, (status, body) in zip(cities, answers):
+            results[city] = body if status == 200 else dict(body, status=status)
+        return 200, {"results": results}
+
+    async def stats(self, query, client) -> Tuple[int, Dict]:
+        """Proxy request counts and the WeatherService metrics."""
+        return 200, {"proxy": self.metrics.snapshot(), "service": self.service.stats()}
+
+    async def health(self, query, client) -> Tuple[int, Dict]:
+        return 200, {"status": "ok"}
+
+
+# The proxy served by `uvicorn weather_proxy:app`
+app = WeatherProxy()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Weather proxy for other tools")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=Config.PROXY_PORT)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -1,31 +1,352 @@
 """Weather API service layer with forecast support and enhanced error handling."""
 
+import asyncio
+import time
 import httpx
-from typing import Dict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from adaptive_timeouts import AdaptiveTimeouts
+from city_index import City, CityIndex, shared_index
 from config import Config
+from metrics import LatencyTracker, Metrics
+from deadline import detach, time_left
+from errors import ClientRequestError, WeatherServiceError
+from providers import OpenWeatherProvider, WeatherProvider, create_provider, status_error
+from search_history import canonical_city_key
+from weather_cache import RateLimiter, TTLCache
 
+__all__ = ["WeatherService", "WeatherServiceError"]
 
-class WeatherServiceError(Exception):
-    """Custom exception for weather service errors."""
-    pass
+
+def connection_limits() -> httpx.Limits:
+    """Pool size for the HTTP client shared by all sessions."""
+    return httpx.Limits(
+        max_connections=Config.MAX_CONNECTIONS,
+        max_keepalive_connections=Config.MAX_CONNECTIONS,
+    )
 
 
 class WeatherService:
-    """Service for fetching weather data from OpenWeatherMap API."""
+    """
+    Service for fetching weather data from OpenWeatherMap API.
+    
+    One instance can be shared by every session in the process: it keeps a
+    pooled HTTP client, a TTL cache, a rate limiter for the API budget, and
+    collapses identical concurrent requests into one upstream call.
     
-    def __init__(self):
+    Data comes from a list of providers (providers.py), all returning the
+    OpenWeatherMap payload shape. With a secondary provider, requests are
+    hedged: if the primary has not answered within its recent p90 latency,
+    the secondary is asked too, the first answer wins and the other request
+    is cancelled. Extra providers only serve optional data (UV) and never
+    take part in hedging.
+    """
+    
+    def __init__(self, cache: Optional[TTLCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 metrics: Optional[Metrics] = None,
+                 providers: Optional[List[WeatherProvider]] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 places: Optional[CityIndex] = None,
+                 extra_providers: Optional[List[WeatherProvider]] = None):
         self.api_key = Config.API_KEY
         self.base_url = Config.BASE_URL
-        self.forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
+        self.forecast_url = Config.FORECAST_URL
         self.timeout = Config.TIMEOUT
+        # Compare with None: an empty cache is falsy (it has __len__)
+        if cache is None:
+            cache = TTLCache(Config.CACHE_TTL, Config.CACHE_MAX_ENTRIES)
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(Config.RATE_LIMIT_PER_MINUTE / 60, Config.RATE_LIMIT_BURST)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics if metrics is not None else Metrics()
+        if providers is None:
+            providers = [OpenWeatherProvider(self.api_key, self.base_url, self.forecast_url)]
+            if Config.SECONDARY_PROVIDER:
+                providers.append(create_provider(Config.SECONDARY_PROVIDER))
+            if extra_providers is None and Config.UV_PROVIDER:
+                extra_providers = [create_provider(Config.UV_PROVIDER)]
+        self.providers = providers
+        self.extra_providers = extra_providers or []
+        self.latency = {provider.name: LatencyTracker() for provider in providers}
+        # Connect/read timeouts per endpoint, from its recent latencies
+        self.timeouts = AdaptiveTimeouts()
+        # Custom httpx transport, e.g. cassette record/replay (cassette.py)
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+        self._inflight: Dict[Hashable, Tuple[asyncio.Future, Optional[str]]] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        # Keys fetched speculatively and not yet used by a real request
+        self._prefetched = TTLCache(Config.CACHE_TTL, Config.CACHE_MAX_ENTRIES)
+        # City -> (lat, lon) from weather responses, for air quality and UV
+        self._coordinates = TTLCache(Config.COORDINATES_CACHE_TTL, Config.CACHE_MAX_ENTRIES)
+        # Known cities for snapping coordinates; the bundled set is loaded on first use
+        self._places = places
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, recreated if the event loop changed."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=connection_limits(),
+                event_hooks={"request": [self.timeouts.on_request]},
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _cached(self, key: Hashable, session_id: Optional[str],
+                      fetch: Callable[[], Awaitable[Dict]],
+                      ttl: Optional[float] = None, rate_limited: bool = True) -> Dict:
+        """
+        Serve a request from the cache, an identical in-flight request,
+        or a new rate-limited upstream call, in that order.
+        
+        `rate_limited=False` is for calls that do not spend the
+        OpenWeatherMap budget (other providers).
+        """
+        self.metrics.incr("requests")
+        cached = self.cache.get(key)
+        if cached is not None:
+            data, origin = cached
+            self.metrics.incr("cache_hits")
+            if origin != session_id:
+                self.metrics.incr("cross_session_hits")
+            self._count_prefetch_hit(key)
+            return data
+        
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # Another caller is already fetching this; share its result
+            future, origin = pending
+            self.metrics.incr("singleflight_joins")
+            if origin != session_id:
+                self.metrics.incr("cross_session_hits")
+            self._count_prefetch_hit(key)
+            return await self._join(key, future)
+        
+        self.metrics.incr("cache_misses")
+        return await self._join(
+            key, self._start_fill(key, session_id, fetch, ttl, rate_limited)
+        )
+    
+    def _start_fill(self, key: Hashable, session_id: Optional[str],
+                    fetch: Callable[[], Awaitable[Dict]], ttl: Optional[float],
+                    rate_limited: bool = True) -> asyncio.Future:
+        """Start fetching a missing key and register it as in flight."""
+        # The fetch runs as its own task so a caller whose deadline expires
+        # stops waiting without cancelling it for the callers that joined
+        task = asyncio.ensure_future(self._fill(key, session_id, fetch, ttl, rate_limited))
+        self._inflight[key] = (task, session_id)
+        task.add_done_callback(lambda done: self._fill_done(key, done))
+        return task
+    
+    def _count_prefetch_hit(self, key: Hashable):
+        """Count the first real request served by a speculative prefetch."""
+        if self._prefetched.pop(key) is not None:
+            self.metrics.incr("prefetch_hits")
+    
+    async def _join(self, key: Hashable, task: asyncio.Future) -> Dict:
+        """
+        Wait for an in-flight fetch.
+        
+        If the last caller waiting for it is cancelled (its search was
+        superseded or ran out of time), the fetch is cancelled too so it
+        does not keep holding a connection.
+        """
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                task.cancel()
+                self.metrics.incr("abandoned_fetches")
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
     
-    async def get_weather(self, city: str, units: str = None) -> Dict:
+    async def _fill(self, key: Hashable, session_id: Optional[str],
+                    fetch: Callable[[], Awaitable[Dict]], ttl: Optional[float],
+                    rate_limited: bool = True) -> Dict:
+        """Fetch a missing key (once across processes) and cache it."""
+        # Shared by every caller that joins, so not bound to this caller's deadline
+        detach()
+        holds_lease = False
+        try:
+            data, holds_lease = await self._claim_or_wait(key)
+            if data is None:
+                if rate_limited:
+                    await self.rate_limiter.acquire()
+                self.metrics.incr("upstream_calls")
+                data = await fetch()
+                set_async = getattr(self.cache, "set_async", None)
+                if set_async is not None:
+                    await set_async(key, data, origin=session_id, ttl=ttl)
+                else:
+                    self.cache.set(key, data, origin=session_id, ttl=ttl)
+            return data
+        finally:
+            if holds_lease:
+                # Not awaited: this may run while the task is being cancelled
+                self.cache.release_soon(key)
+    
+    def _fill_done(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody waited for is not logged as unhandled
+            task.exception()
+    
+    async def _claim_or_wait(self, key: Hashable) -> Tuple[Optional[Dict], bool]:
+        """
+        Cross-process single-flight for shared caches.
+        
+        With a cache that supports leases (shared_store.SqliteCache), only
+        the worker holding the lease fetches; the others poll the cache
+        until its result appears or the lease times out.
+        
+        Returns:
+            (cached data or None, whether this worker now holds the lease)
+        """
+        claim = getattr(self.cache, "claim_async", None)
+        if claim is None:
+            return None, False
+        
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + time_left(self.timeout)
+        while not await claim(key, self.timeout):
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.metrics.incr("peer_fetch_joins")
+                return cached[0], False
+            if loop.time() >= give_up_at:
+                return None, False
+            await asyncio.sleep(0.05)
+        
+        # The previous lease holder may have finished just before we claimed
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.metrics.incr("peer_fetch_joins")
+            return cached[0], True
+        return None, True
+    
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary provider before hedging."""
+        tracker = self.latency[self.providers[0].name]
+        if len(tracker) < Config.HEDGE_MIN_SAMPLES:
+            return Config.HEDGE_INITIAL_DELAY
+        delay = tracker.percentile(Config.HEDGE_PERCENTILE)
+        return min(max(delay, Config.HEDGE_MIN_DELAY), self.timeout)
+    
+    async def _call_provider(self, provider: WeatherProvider, method: str, *args) -> Dict:
+        """Call one provider and record its latency."""
+        self.metrics.incr(f"provider_calls.{provider.name}")
+        endpoint = f"{provider.name}.{method}"
+        started = time.perf_counter()
+        try:
+            with self.timeouts.endpoint(endpoint):
+                data = await getattr(provider, method)(self._get_client(), *args)
+        except asyncio.CancelledError:
+            # A cancelled call took at least this long; dropping it would bias
+            # the percentile (and so the hedge delay) towards fast answers
+            self.latency[provider.name].record(time.perf_counter() - started)
+            self.timeouts.record(endpoint, time.perf_counter() - started)
+            raise
+        except Exception:
+            # Timed out calls count at the time they took, so a slow but
+            # answering endpoint raises its own timeout
+            self.timeouts.record(endpoint, time.perf_counter() - started)
+            raise
+        elapsed = time.perf_counter() - started
+        self.timeouts.record(endpoint, elapsed)
+        self.latency[provider.name].record(elapsed)
+        self.metrics.observe(f"provider_ms.{provider.name}", elapsed * 1000)
+        return data
+    
+    async def _hedged(self, method: str, *args) -> Dict:
+        """
+        Call the primary provider, hedging with the secondary when it is slow.
+        
+        The secondary is started when the primary has not answered within
+        hedge_delay() or has failed transiently (timeout, network error,
+        429, 5xx). The first successful answer is returned and the other
+        call is cancelled; if both fail the primary's error is raised.
+        
+        A ClientRequestError from the primary (unknown city, invalid API
+        key) is raised at once: the secondary would only mask it.
+        """
+        primary = self.providers[0]
+        if len(self.providers) == 1:
+            return await self._call_provider(primary, method, *args)
+        
+        self.metrics.incr("hedge_eligible")
+        calls = {asyncio.ensure_future(self._call_provider(primary, method, *args)): primary}
+        errors: Dict[str, BaseException] = {}
+        hedged = False
+        try:
+            while calls:
+                done, _ = await asyncio.wait(
+                    calls, timeout=None if hedged else self.hedge_delay(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for call in done:
+                    provider = calls.pop(call)
+                    if call.exception() is not None:
+                        if provider is primary and isinstance(call.exception(), ClientRequestError):
+                            self.metrics.incr("hedge_client_errors")
+                            raise call.exception()
+                        errors[provider.name] = call.exception()
+                        continue
+                    if provider is not primary:
+                        self.metrics.incr("hedge_wins")
+                    return call.result()
+                if not hedged:
+                    hedged = True
+                    secondary = self.providers[1]
+                    self.metrics.incr("hedged_requests")
+                    calls[asyncio.ensure_future(
+                        self._call_provider(secondary, method, *args)
+                    )] = secondary
+            raise errors.get(primary.name) or next(iter(errors.values()))
+        finally:
+            for call in calls:
+                call.cancel()
+                self.metrics.incr("hedge_cancelled")
+            if calls:
+                await asyncio.gather(*calls, return_exceptions=True)
+    
+    def stats(self) -> Dict:
+        """Metrics snapshot with derived cache and hedging rates and current timeouts."""
+        snapshot = self.metrics.snapshot()
+        snapshot["cache_hit_rate"] = self.metrics.ratio("cache_hits", "requests")
+        snapshot["cross_session_hit_rate"] = self.metrics.ratio("cross_session_hits", "requests")
+        snapshot["cache_entries"] = len(self.cache)
+        snapshot["hedge_rate"] = self.metrics.ratio("hedged_requests", "hedge_eligible")
+        snapshot["hedge_win_rate"] = self.metrics.ratio("hedge_wins", "hedged_requests")
+        snapshot["hedge_delay_ms"] = self.hedge_delay() * 1000
+        snapshot["prefetch_hit_rate"] = self.metrics.ratio("prefetch_hits", "prefetch_upstream_calls")
+        snapshot["timeouts"] = self.timeouts.snapshot()
+        return snapshot
+    
+    async def get_weather(self, city: str, units: str = None,
+                          session_id: Optional[str] = None) -> Dict:
         """
         Fetch weather data for a given city.
         
         Args:
             city: Name of the city
             units: Temperature units (metric, imperial, or standard)
+            session_id: Calling session, used for cache metrics
             
         Returns:
             Dictionary containing weather data
@@ -43,73 +364,158 @@ class WeatherService:
             )
         
         # Build request parameters
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": units or Config.UNITS,
-        }
+        units = units or Config.UNITS
+        key = ("weather", canonical_city_key(city), units)
+        data = await self._cached(key, session_id, lambda: self._hedged("current", city, units))
+        coord = data.get("coord") or {}
+        if coord.get("lat") is not None and coord.get("lon") is not None:
+            self._coordinates.set(canonical_city_key(city), (coord["lat"], coord["lon"]))
+        return data
+    
+    async def prefetch_weather(self, city: str, units: str = None,
+                               session_id: Optional[str] = None,
+                               reserve: Optional[int] = None) -> bool:
+        """
+        Speculatively fetch a city's weather into the cache.
         
-        print(f"🌐 Making API request for: {city}")  # Debug info
+        Used while the user is still typing or the app is idle. A prefetch
+        only runs if the rate limiter can spare a token without dipping
+        into the reserve kept for real searches, and cancelling it cancels
+        the upstream request unless a real search has joined it. Counted
+        under prefetch_* metrics, separately from real requests.
         
+        Args:
+            city: Name of the city
+            units: Temperature units (metric, imperial, or standard)
+            session_id: Calling session
+            reserve: Tokens to leave for real searches
+                (default Config.PREFETCH_RESERVE_TOKENS)
+            
+        Returns:
+            True if the weather was fetched, False if it was already cached
+            or in flight, the budget was short, or the fetch failed
+        """
+        units = units or Config.UNITS
+        return await self._prefetch(
+            ("weather", canonical_city_key(city), units), session_id,
+            lambda: self._hedged("current", city, units), None, reserve,
+        )
+    
+    async def prefetch_forecast(self, city: str, units: str = None,
+                                session_id: Optional[str] = None,
+                                reserve: Optional[int] = None) -> bool:
+        """Speculatively fetch a city's forecast into the cache, like prefetch_weather()."""
+        units = units or Config.UNITS
+        return await self._prefetch(
+            ("forecast", canonical_city_key(city), units), session_id,
+            lambda: self._hedged("forecast", city, units), Config.FORECAST_CACHE_TTL, reserve,
+        )
+    
+    async def _prefetch(self, key: Hashable, session_id: Optional[str],
+                        fetch: Callable[[], Awaitable[Dict]], ttl: Optional[float],
+                        reserve: Optional[int]) -> bool:
+        if not key[1] or not self.api_key or self.api_key == "your_api_key_here":
+            return False
+        self.metrics.incr("prefetch_requests")
+        if key in self._inflight or self.cache.get(key) is not None:
+            self.metrics.incr("prefetch_skipped")
+            return False
+        if reserve is None:
+            reserve = Config.PREFETCH_RESERVE_TOKENS
+        try_acquire = getattr(self.rate_limiter, "try_acquire_async", None)
+        if try_acquire is not None:
+            acquired = await try_acquire(reserve=reserve)
+        else:
+            acquired = self.rate_limiter.try_acquire(reserve=reserve)
+        if not acquired:
+            self.metrics.incr("prefetch_denied")
+            return False
+        if try_acquire is not None and (key in self._inflight or self.cache.get(key) is not None):
+            # A search or another prefetch started this key while the token
+            # was being taken; a second fill would call upstream twice
+            self.metrics.incr("prefetch_skipped")
+            return False
+
+        self.metrics.incr("prefetch_upstream_calls")
+        self._prefetched.set(key, True)
+        task = self._start_fill(key, session_id, fetch, ttl, rate_limited=False)
         try:
-            # Make async HTTP request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                print(f"📡 API Response Status: {response.status_code}")  # Debug info
-                
-                # Check for HTTP errors
-                if response.status_code == 404:
-                    raise WeatherServiceError(
-                        f"🏙️ City '{city}' not found. Please check the spelling and try again."
-                    )
-                elif response.status_code == 401:
-                    raise WeatherServiceError(
-                        "🔑 Invalid API key. Please check your .env file and verify your OpenWeatherMap API key is correct."
-                    )
-                elif response.status_code == 429:
-                    raise WeatherServiceError(
-                        "⏱️ API rate limit exceeded. Please wait a moment and try again."
-                    )
-                elif response.status_code >= 500:
-                    raise WeatherServiceError(
-                        "🌐 Weather service is currently unavailable. Please try again later."
-                    )
-                elif response.status_code != 200:
-                    raise WeatherServiceError(
-                        f"⚠️ Error fetching weather data (Status: {response.status_code}). Please try again."
-                    )
-                
-                # Parse JSON response
-                data = response.json()
-                print(f"✅ Successfully fetched weather for {city}")  # Debug info
-                return data
-                
-        except httpx.TimeoutException:
-            raise WeatherServiceError(
-                "⏱️ Request timed out. Please check your internet connection and try again."
-            )
-        except httpx.NetworkError as e:
+            await self._join(key, task)
+        except WeatherServiceError:
+            self.metrics.incr("prefetch_failed")
+            self._prefetched.pop(key)
+            return False
+        except asyncio.CancelledError:
+            # The user moved on; the fetch is cancelled unless a search joined it
+            self.metrics.incr("prefetch_cancelled")
+            raise
+        return True
+    
+    def is_cached(self, kind: str, city: str, units: str = None) -> bool:
+        """True if get_weather ("weather") or get_forecast ("forecast") would hit the cache."""
+        return self.cache.get((kind, canonical_city_key(city), units or Config.UNITS)) is not None
+    
+    async def get_location(self) -> Tuple[float, float, str]:
+        """
+        Approximate location of this machine from its IP address.
+        
+        Returns:
+            (latitude, longitude, city name)
+            
+        Raises:
+            WeatherServiceError: If the location cannot be determined
+        """
+        started = time.perf_counter()
+        try:
+            with self.timeouts.endpoint("geolocation"):
+                response = await self._get_client().get(
+                    Config.GEOLOCATION_URL, timeout=time_left(self.timeout)
+                )
+            self.timeouts.record("geolocation", time.perf_counter() - started)
+            if response.status_code != 200:
+                print(f"❌ Location lookup failed: HTTP {response.status_code}")  # Debug info
+                raise status_error(response.status_code)(
+                    "📍 Could not get your location. Please enter city manually."
+                )
+            data = response.json()
+            return data["latitude"], data["longitude"], data.get("city") or "Your Location"
+        except WeatherServiceError:
+            raise
+        except Exception as e:
+            self.timeouts.record("geolocation", time.perf_counter() - started)
+            print(f"❌ Location lookup failed: {str(e)}")  # Debug info
             raise WeatherServiceError(
-                f"🌐 Network error: {str(e)}. Please check your internet connection."
+                "📍 Could not get your location. Please enter city manually."
             )
-        except httpx.HTTPError as e:
-            raise WeatherServiceError(f"🌐 HTTP error occurred: {str(e)}")
-        except Exception as e:
-            print(f"❌ Unexpected error: {str(e)}")  # Debug info
-            raise WeatherServiceError(f"❌ Unexpected error: {str(e)}. Please try again.")
+    
+    def nearest_city(self, lat: float, lon: float) -> Optional[City]:
+        """
+        Known city at some coordinates, from the bundled dataset (no network).
+        
+        Returns:
+            The nearest city within Config.NEAREST_CITY_MAX_KM, or None
+        """
+        if self._places is None:
+            self._places = shared_index(Config.CITY_DATASET)
+        found = self._places.nearest(lat, lon, Config.NEAREST_CITY_MAX_KM)
+        return found.city if found is not None else None
     
     async def get_weather_by_coordinates(
         self, 
         lat: float, 
-        lon: float
+        lon: float,
+        session_id: Optional[str] = None
     ) -> Dict:
         """
         Fetch weather data by coordinates.
         
+        Coordinates near a known city are snapped to it, so every lookup
+        around one place shares a cache entry.
+        
         Args:
             lat: Latitude
             lon: Longitude
+            session_id: Calling session, used for cache metrics
             
         Returns:
             Dictionary containing weather data
@@ -123,46 +529,27 @@ class WeatherService:
                 "🔑 API key not configured. Please check your .env file and add a valid OpenWeatherMap API key."
             )
         
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "appid": self.api_key,
-            "units": Config.UNITS,
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                if response.status_code == 401:
-                    raise WeatherServiceError(
-                        "🔑 Invalid API key. Please check your .env file and verify your OpenWeatherMap API key is correct."
-                    )
-                elif response.status_code != 200:
-                    raise WeatherServiceError(
-                        f"⚠️ Error fetching weather data: {response.status_code}"
-                    )
-                
-                return response.json()
-                
-        except httpx.TimeoutException:
-            raise WeatherServiceError(
-                "⏱️ Request timed out. Please check your internet connection."
-            )
-        except httpx.NetworkError:
-            raise WeatherServiceError(
-                "🌐 Network error. Please check your internet connection."
-            )
-        except Exception as e:
-            raise WeatherServiceError(f"❌ Error fetching weather data: {str(e)}")
+        units = Config.UNITS
+        city = self.nearest_city(lat, lon)
+        if city is not None:
+            self.metrics.incr("coordinates_snapped")
+            lat, lon = city.lat, city.lon
+            key = ("coords", city.key, units)
+        else:
+            key = ("coords", round(lat, 2), round(lon, 2), units)
+        return await self._cached(
+            key, session_id, lambda: self._hedged("current_by_coordinates", lat, lon, units)
+        )
     
-    async def get_forecast(self, city: str, units: str = None) -> Dict:
+    async def get_forecast(self, city: str, units: str = None,
+                           session_id: Optional[str] = None) -> Dict:
         """
         Get 5-day weather forecast for a given city.
         
         Args:
             city: Name of the city
             units: Temperature units (metric, imperial, or standard)
+            session_id: Calling session, used for cache metrics
             
         Returns:
             Dictionary containing forecast data
@@ -179,45 +566,128 @@ class WeatherService:
                 "🔑 API key not configured. Please check your .env file and add a valid OpenWeatherMap API key."
             )
         
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": units or Config.UNITS,
+        units = units or Config.UNITS
+        key = ("forecast", canonical_city_key(city), units)
+        return await self._cached(
+            key, session_id, lambda: self._hedged("forecast", city, units),
+            ttl=Config.FORECAST_CACHE_TTL,
+        )
+    
+    def _provider_for(self, method: str) -> Optional[WeatherProvider]:
+        """First provider implementing an optional method (air_quality, uv_index)."""
+        for provider in self.providers + self.extra_providers:
+            if getattr(type(provider), method) is not getattr(WeatherProvider, method):
+                return provider
+        return None
+    
+    async def _optional(self, method: str, lat: float, lon: float,
+                        session_id: Optional[str]) -> Dict:
+        provider = self._provider_for(method)
+        if provider is None:
+            raise WeatherServiceError(f"No configured provider offers {method.replace('_', ' ')}")
+        key = (method, round(lat, 2), round(lon, 2))
+        return await self._cached(
+            key, session_id,
+            lambda: getattr(provider, method)(self._get_client(), lat, lon),
+            ttl=Config.AIR_QUALITY_CACHE_TTL,
+            # The rate limiter guards the primary (OpenWeatherMap) budget
+            rate_limited=provider is self.providers[0],
+        )
+    
+    async def get_air_quality(self, lat: float, lon: float,
+                              session_id: Optional[str] = None) -> Dict:
+        """
+        Current air pollution for coordinates.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            session_id: Calling session, used for cache metrics
+            
+        Returns:
+            OpenWeatherMap /air_pollution response (`list[0].main.aqi`, 1-5,
+            and `list[0].components` in µg/m³)
+            
+        Raises:
+            WeatherServiceError: If the request fails
+        """
+        return await self._optional("air_quality", lat, lon, session_id)
+    
+    async def get_uv_index(self, lat: float, lon: float,
+                           session_id: Optional[str] = None) -> Dict:
+        """
+        Current UV index for coordinates.
+        
+        Returns:
+            {"uvi": current index, "uvi_max": today's maximum}
+            
+        Raises:
+            WeatherServiceError: If the request fails or no provider has UV data
+        """
+        return await self._optional("uv_index", lat, lon, session_id)
+    
+    def dashboard_parts(self) -> List[str]:
+        """Parts dashboard() will yield with the configured providers."""
+        parts = ["weather", "forecast"]
+        parts += [part for part, method in (("air", "air_quality"), ("uv", "uv_index"))
+                  if self._provider_for(method) is not None]
+        return parts
+    
+    async def dashboard(self, city: str, units: str = None,
+                        session_id: Optional[str] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Fetch everything the current-city view shows, concurrently.
+        
+        Weather, forecast, air quality and UV are requested at once and
+        yielded as each one completes, so the view can render each panel
+        as soon as its data is in. Air quality and UV need coordinates: for
+        a city seen before they come from an earlier weather response,
+        otherwise they start as soon as this weather response arrives.
+        Closing the iterator (or cancelling the caller) cancels whatever is
+        still outstanding.
+        
+        Args:
+            city: Name of the city
+            units: Temperature units (metric, imperial, or standard)
+            session_id: Calling session, used for cache metrics
+            
+        Yields:
+            (part, result) where part is one of dashboard_parts() and result
+            is the data, or the WeatherServiceError that part failed with
+        """
+        parts = self.dashboard_parts()
+        tasks: Dict[asyncio.Future, str] = {
+            asyncio.ensure_future(self.get_weather(city, units, session_id)): "weather",
+            asyncio.ensure_future(self.get_forecast(city, units, session_id)): "forecast",
         }
         
+        def start_located(lat: float, lon: float):
+            if "air" in parts:
+                tasks[asyncio.ensure_future(self.get_air_quality(lat, lon, session_id))] = "air"
+            if "uv" in parts:
+                tasks[asyncio.ensure_future(self.get_uv_index(lat, lon, session_id))] = "uv"
+        
+        known = self._coordinates.get(canonical_city_key(city))
+        if known is not None:
+            start_located(*known[0])
+        self.metrics.incr("dashboards")
+        if known is None:
+            self.metrics.incr("dashboard_sequential_lookups")
+        
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.forecast_url, params=params)
-                
-                # Check for HTTP errors
-                if response.status_code == 404:
-                    raise WeatherServiceError(
-                        f"🏙️ City '{city}' not found. Please check the spelling."
-                    )
-                elif response.status_code == 401:
-                    raise WeatherServiceError(
-                        "🔑 Invalid API key. Please check your configuration."
-                    )
-                elif response.status_code >= 500:
-                    raise WeatherServiceError(
-                        "🌐 Weather service is currently unavailable. Please try again later."
-                    )
-                elif response.status_code != 200:
-                    raise WeatherServiceError(
-                        f"⚠️ Error fetching forecast data: {response.status_code}"
-                    )
-                
-                return response.json()
-                
-        except httpx.TimeoutException:
-            raise WeatherServiceError(
-                "⏱️ Request timed out. Please check your internet connection."
-            )
-        except httpx.NetworkError:
-            raise WeatherServiceError(
-                "🌐 Network error. Please check your internet connection."
-            )
-        except httpx.HTTPError as e:
-            raise WeatherServiceError(f"🌐 HTTP error occurred: {str(e)}")
-        except Exception as e:
-            raise WeatherServiceError(f"❌ An unexpected error occurred: {str(e)}")
\ No newline at end of file
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    part = tasks.pop(task)
+                    try:
+                        result = task.result()
+                    except WeatherServiceError as e:
+                        result = e
+                    if part == "weather" and known is None and isinstance(result, dict):
+                        coord = result.get("coord") or {}
+                        if coord.get("lat") is not None and coord.get("lon") is not None:
+                            start_located(coord["lat"], coord["lon"])
+                    yield part, result
+        finally:
+            for task in tasks:
+                task.cancel()
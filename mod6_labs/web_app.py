@@ -0,0 +1,15 @@
+"""ASGI entry point for serving the Weather App with several worker processes.
+
+Run through main.py (which also sets up the shared cache):
+    python main.py --web --workers 4
+
+or directly with uvicorn:
+    WEATHER_SHARED_CACHE=weather_app_data/shared_cache.db uvicorn web_app:app --workers 4
+"""
+
+import flet.fastapi as flet_fastapi
+
+from config import Config
+from main import main
+
+app = flet_fastapi.app(main, app_name=Config.APP_TITLE)
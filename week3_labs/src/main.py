@@ -1,6 +1,8 @@
+import os
 import flet as ft
 import mysql.connector
 from db_connection import connect_db
+from loop_watchdog import LoopWatchdog
 
 def main(page: ft.Page):
     # Configure the page
@@ -13,6 +15,22 @@ def main(page: ft.Page):
     page.window.width = 400
     page.bgcolor = ft.Colors.AMBER_ACCENT
     
+    # Optional: report handlers that block the event loop (set LOOP_WATCHDOG=1)
+    if os.getenv("LOOP_WATCHDOG") == "1":
+        watchdog = LoopWatchdog(threshold=0.1)
+        watchdog_task = page.run_task(watchdog.run)
+        
+        def stop_watchdog(e):
+            # The task and its thread would otherwise outlive the session
+            if watchdog_task.done():
+                return
+            watchdog_task.cancel()
+            watchdog.stop()
+            print(f"Loop stalls this session: {watchdog.snapshot()}")
+        
+        page.on_disconnect = stop_watchdog
+        page.on_close = stop_watchdog
+    
     # Create UI controls
     login_title = ft.Text(
         "User Login",